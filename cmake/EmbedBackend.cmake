@@ -0,0 +1,85 @@
+# Decide how the embed_*.py scripts pass binary data to the compiler.
+#   Array:  hex literals inside the generated headers. Works with any compiler,
+#           but compile time and memory grow with the number of embedded bytes.
+#   Embed:  C23 #embed in a generated <header>_data.c file.
+#   Incbin: assembler .incbin in a generated <header>_data.c file.
+# Auto picks the first of Embed, Incbin and Array that the toolchain accepts.
+# Sets EMBED_SCRIPT_BACKEND to the --backend argument for the scripts.
+macro( resolve_embed_backend )
+	if( EMBED_BACKEND STREQUAL "Auto" )
+		set( _probe_dir ${CMAKE_CURRENT_BINARY_DIR}/CMakeFiles/EmbedProbe )
+		file( WRITE ${_probe_dir}/probe.bin "RL" )
+		set( EMBED_PROBE_FILE ${_probe_dir}/probe.bin )
+		configure_file( ${CMAKE_SOURCE_DIR}/cmake/EmbedProbeEmbed.c.in ${_probe_dir}/embed.c @ONLY )
+		configure_file( ${CMAKE_SOURCE_DIR}/cmake/EmbedProbeIncbin.c.in ${_probe_dir}/incbin.c @ONLY )
+		try_compile( EMBED_HAS_C_EMBED ${_probe_dir}/embed ${_probe_dir}/embed.c )
+		try_compile( EMBED_HAS_INCBIN ${_probe_dir}/incbin ${_probe_dir}/incbin.c )
+
+		if( EMBED_HAS_C_EMBED )
+			set( EMBED_SCRIPT_BACKEND "embed" )
+		elseif( EMBED_HAS_INCBIN )
+			set( EMBED_SCRIPT_BACKEND "incbin" )
+		else()
+			set( EMBED_SCRIPT_BACKEND "array" )
+		endif()
+	else()
+		string( TOLOWER "${EMBED_BACKEND}" EMBED_SCRIPT_BACKEND )
+	endif()
+	message( STATUS "Embed backend: ${EMBED_SCRIPT_BACKEND}" )
+endmacro()
+
+# Sets var to the companion data source of a generated header, or to an empty
+# string when the array backend keeps the data inside the header.
+macro( embed_data_source var header )
+	if( EMBED_SCRIPT_BACKEND STREQUAL "array" )
+		set( ${var} "" )
+	else()
+		get_filename_component( _embed_dir ${header} DIRECTORY )
+		get_filename_component( _embed_name ${header} NAME_WE )
+		set( ${var} ${_embed_dir}/${_embed_name}_data.c )
+	endif()
+endmacro()
+
+# Sets var to EMBED_BUDGET_ARGS plus, unless EMBED_REPORT is Off, the --report
+# option for a generated header: embedded_assets.h -> embedded_assets_report.json
+macro( embed_report_args var header )
+	set( ${var} ${EMBED_BUDGET_ARGS} )
+	if( NOT EMBED_REPORT STREQUAL "Off" )
+		string( TOLOWER "${EMBED_REPORT}" _report_ext )
+		get_filename_component( _embed_dir ${header} DIRECTORY )
+		get_filename_component( _embed_name ${header} NAME_WE )
+		list( APPEND ${var} --report ${_embed_dir}/${_embed_name}_report.${_report_ext} )
+	endif()
+endmacro()
+
+# Sets EMBED_LUA_FILES and EMBED_ASSET_FILES to the Lua files and game assets
+# under the build directory, as scripts/embed_all.py finds them with
+# EMBED_SCAN_ARGS. Build system files and the embed scripts' outputs are left out.
+macro( embed_scan )
+	execute_process(
+		COMMAND ${PYTHON_EXECUTABLE} ${CMAKE_SOURCE_DIR}/scripts/embed_all.py --list ${EMBED_SCAN_ARGS} ${CMAKE_CURRENT_BINARY_DIR}
+		OUTPUT_VARIABLE _embed_scan
+		OUTPUT_STRIP_TRAILING_WHITESPACE
+	)
+	set( EMBED_LUA_FILES "" )
+	set( EMBED_ASSET_FILES "" )
+	if( _embed_scan )
+		string( REPLACE "\n" ";" _embed_scan "${_embed_scan}" )
+		foreach( _embed_line ${_embed_scan} )
+			if( _embed_line MATCHES "^lua (.*)$" )
+				list( APPEND EMBED_LUA_FILES "${CMAKE_MATCH_1}" )
+			elseif( _embed_line MATCHES "^asset (.*)$" )
+				list( APPEND EMBED_ASSET_FILES "${CMAKE_MATCH_1}" )
+			endif()
+		endforeach()
+	endif()
+endmacro()
+
+# Sets var to the DEPFILE option for the embed_all.py command where the
+# generator supports it, Ninja or CMake 3.20 and later
+macro( embed_depfile_args var depfile )
+	set( ${var} "" )
+	if( CMAKE_GENERATOR MATCHES "Ninja" OR NOT CMAKE_VERSION VERSION_LESS 3.20 )
+		set( ${var} DEPFILE ${depfile} )
+	endif()
+endmacro()
@@ -0,0 +1,50 @@
+# Find the luac embed_lua.py uses for EMBED_LUA_BYTECODE.
+#   EMBED_LUAC set:  that luac is used as is.
+#   Otherwise:       luac is built for the host from deps/lua-5.4.7.tar.gz, so
+#                    the bytecode matches the Lua version ReiLua is made for.
+# Sets EMBED_LUAC_ARGS to the --luac argument for embed_lua.py and
+# EMBED_LUAC_DEPENDS to the target building luac. Both are left empty, and the
+# Lua source is embedded, when no luac can be had.
+macro( resolve_lua_compiler )
+	set( EMBED_LUAC_ARGS "" )
+	set( EMBED_LUAC_DEPENDS "" )
+
+	if( LUAJIT )
+		message( WARNING "EMBED_LUA_BYTECODE does not support LuaJIT, embedding Lua source" )
+	elseif( EMBED_LUAC )
+		set( EMBED_LUAC_ARGS --luac ${EMBED_LUAC} )
+	elseif( CMAKE_CROSSCOMPILING OR PLATFORM STREQUAL "Web" )
+		message( WARNING "EMBED_LUA_BYTECODE needs EMBED_LUAC when cross compiling, embedding Lua source" )
+	else()
+		set( _lua_dir ${CMAKE_CURRENT_BINARY_DIR}/CMakeFiles/LuaHost )
+		set( _lua_src ${_lua_dir}/lua-5.4.7/src )
+
+		if( NOT EXISTS ${_lua_src}/luac.c )
+			file( MAKE_DIRECTORY ${_lua_dir} )
+			# Not file( ARCHIVE_EXTRACT ), a broken tarball should not stop the configure
+			execute_process(
+				COMMAND ${CMAKE_COMMAND} -E tar xzf ${CMAKE_SOURCE_DIR}/deps/lua-5.4.7.tar.gz
+				WORKING_DIRECTORY ${_lua_dir}
+				OUTPUT_QUIET ERROR_QUIET
+			)
+		endif()
+
+		if( EXISTS ${_lua_src}/luac.c )
+			file( GLOB _lua_core_sources ${_lua_src}/*.c )
+			list( REMOVE_ITEM _lua_core_sources ${_lua_src}/lua.c )
+			add_executable( luac_host ${_lua_core_sources} )
+			target_include_directories( luac_host BEFORE PRIVATE ${_lua_src} )
+			if( UNIX )
+				target_link_libraries( luac_host m )
+			endif()
+			set( EMBED_LUAC_ARGS --luac $<TARGET_FILE:luac_host> )
+			set( EMBED_LUAC_DEPENDS luac_host )
+		else()
+			message( WARNING "Could not extract deps/lua-5.4.7.tar.gz, embedding Lua source" )
+		endif()
+	endif()
+
+	if( EMBED_LUAC_ARGS )
+		message( STATUS "Embedding Lua files as bytecode" )
+	endif()
+endmacro()
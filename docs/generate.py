@@ -1,174 +1,751 @@
 #!/usr/bin/env python3
-"""ReiLua Documentation Generator"""
-import os, re
+"""ReiLua Documentation Generator
+
+Renders README.md and docs_md/*.md into index.html, manual.html and
+reference.html next to this script. The reference is split into a page per
+API.md section in reference/, with reference/search.json, a prebuilt inverted
+index over item names, definitions and descriptions that search.js queries
+from the search box on every reference page.
+Usage: python generate.py [--jobs N] [--no-cache]
+
+Runs are incremental: the parsed API model and the HTML of every manual page
+and reference section are cached in .generate_cache/, only what changed is
+rendered again (in a process pool when a lot changed) and a page is
+only rewritten when its bytes differ.
+
+md2html is a single pass renderer: every line is classified once by a
+precompiled block pattern, and the text of headings, paragraphs and list items
+goes through one precompiled inline pattern. Fenced code is copied verbatim
+(HTML escaped) and never touched by inline formatting; lists may be ordered,
+nested by indentation, and hold indented continuation lines and code blocks.
+"""
+import argparse
+import concurrent.futures
+import hashlib
+import json
+import os
+import re
+import struct
+import time
 from pathlib import Path
 
+DOCS_DIR = Path(__file__).resolve().parent
+ROOT_DIR = DOCS_DIR.parent
+
 HTML_TEMPLATE = '''<!DOCTYPE HTML><html><head><title>{title}</title>
-<link rel="stylesheet" href="style.css"><meta charset="utf-8"></head><body>
+<link rel="stylesheet" href="{root}style.css"><meta charset="utf-8"></head><body>
 <div class="container"><div class="navigation">
-<a href="index.html">home</a> &middot; <a href="manual.html">manual</a> &middot; <a href="reference.html">reference</a>
+<a href="{root}index.html">home</a> &middot; <a href="{root}manual.html">manual</a> &middot; <a href="{root}reference.html">reference</a>
 </div>{content}<div class="footer"><p>ReiLua Enhanced &middot; <a href="https://indrajith.dev">indrajith.dev</a></p></div></div></body></html>'''
 
-def fix_links(t):
-    t=re.sub(r'\(([^)]+)\.md\)',r'(manual.html)',t)
-    t=re.sub(r'\(docs/[^)]+\.md\)',r'(manual.html)',t)
-    t=re.sub(r'\(\.\.\/docs\/[^)]+\.md\)',r'(manual.html)',t)
-    return t
+# One line: an opening or closing code fence, a heading (unindented, up to ####), a list item or anything else
+_BLOCK_RE = re.compile(r'(?P<indent>[ \t]*)(?:(?P<fence>`{3,}|~{3,})(?P<info>[^`]*)'
+                       r'|(?<![ \t])(?P<hashes>#{1,4}) (?P<title>.+)'
+                       r'|(?P<marker>[-*+]|\d{1,9}[.)]) +(?P<item>.*)'
+                       r'|(?P<text>.*))$')
+# Inline code, links, **strong**, *emphasis* and (links to.md) in one alternation, leftmost match wins
+_INLINE_RE = re.compile(r'`(?P<code>[^`]+)`|\[(?P<label>[^\]]+)\]\((?P<href>[^)]+)\)'
+                        r'|\*\*(?P<strong>[^*]+)\*\*|\*(?P<em>[^*\n]+)\*|\((?P<md>[^)]+)\.md\)')
+_IMAGE_RE = re.compile(r'!\[.*?\]\(.*?\)')
+_ESCAPES = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+
+def _inline_token(m):
+    kind = m.lastgroup
+    if kind == 'code':
+        return f'<code>{m.group("code").translate(_ESCAPES)}</code>'
+    if kind == 'href':
+        # Markdown pages are all rendered into the manual
+        href = 'manual.html' if m.group('href').endswith('.md') else m.group('href')
+        return f'<a href="{href}">{inline(m.group("label"))}</a>'
+    if kind == 'strong':
+        return f'<strong>{inline(m.group("strong"))}</strong>'
+    if kind == 'em':
+        return f'<em>{inline(m.group("em"))}</em>'
+    return '(manual.html)'
+
+def inline(text):
+    """Render inline Markdown. HTML in the text is passed through."""
+    return _INLINE_RE.sub(_inline_token, text)
+
+class _Renderer:
+    """Builds the HTML lines of one document from classified lines"""
+
+    def __init__(self):
+        self.out = []
+        self.para = []
+        self.lists = []  # open lists, innermost last: [indent, tag, out index of the open <li> line or None]
+        self.item = None  # text lines of the list item being read
+
+    def flush_para(self):
+        if not self.para:
+            return
+        buffered = []
+        # A paragraph line that renders to a tag, like "**Note:** ..." or raw HTML, stays a line of its own
+        for line in inline('\n'.join(self.para)).split('\n'):
+            if line.strip().startswith('<'):
+                if buffered:
+                    self.out.append('<p>' + ' '.join(buffered) + '</p>')
+                    buffered = []
+                self.out.append(line)
+            else:
+                buffered.append(line.strip())
+        if buffered:
+            self.out.append('<p>' + ' '.join(buffered) + '</p>')
+        self.para = []
+
+    def flush_item(self):
+        if self.item is None:
+            return
+        self.lists[-1][2] = len(self.out)
+        self.out.append('<li>' + inline(' '.join(self.item)))
+        self.item = None
+
+    def close_item(self):
+        self.flush_item()
+        index = self.lists[-1][2]
+        if index is None:
+            return
+        # A childless item closes on its own line, like <li>text</li>
+        if index == len(self.out) - 1:
+            self.out[index] += '</li>'
+        else:
+            self.out.append('</li>')
+        self.lists[-1][2] = None
+
+    def close_lists(self, indent=-1):
+        """Close every list indented deeper than indent"""
+        while self.lists and self.lists[-1][0] > indent:
+            self.close_item()
+            self.out.append(f'</{self.lists.pop()[1]}>')
+
+    def list_item(self, indent, marker, text):
+        tag = 'ul' if marker in '-*+' else 'ol'
+        self.flush_para()
+        self.close_lists(indent)
+        if self.lists and self.lists[-1][0] == indent and self.lists[-1][1] != tag:
+            self.close_lists(indent - 1)
+        if self.lists and self.lists[-1][0] == indent:
+            self.close_item()
+        else:
+            # A new list, nested in the open item when there is one
+            self.flush_item()
+            number = marker[:-1] if tag == 'ol' else '1'
+            self.out.append(f'<{tag}>' if int(number) == 1 else f'<ol start="{int(number)}">')
+            self.lists.append([indent, tag, None])
+        self.item = [text.strip()]
+
+    def in_item(self, indent):
+        """Whether a line with this indentation continues the open list item"""
+        return bool(self.lists) and indent > self.lists[-1][0]
+
+    def code(self, lines):
+        self.flush_para()
+        self.flush_item()
+        body = ''.join(line + '\n' for line in lines).translate(_ESCAPES)
+        self.out.append(f'<pre><code>{body}</code></pre>')
+
+    def finish(self):
+        self.flush_para()
+        self.close_lists()
+        return '\n'.join(self.out)
+
+def _indent_width(indent):
+    return len(indent.expandtabs(4)) if indent else 0
+
+def _continues_list(r, line):
+    """Whether a line after blank lines belongs to the open lists: indented into the item, or a sibling item"""
+    m = _BLOCK_RE.match(line)
+    indent = _indent_width(m.group('indent'))
+    if r.in_item(indent):
+        return True
+    return m.lastgroup == 'item' and any(level[0] == indent for level in r.lists)
 
 def md2html(md):
-    h=fix_links(md)
-    
-    # Protect code blocks by replacing them with placeholders
-    code_blocks = []
-    def save_code(m):
-        code_blocks.append(m.group(0))
-        return f'___CODE_BLOCK_{len(code_blocks)-1}___'
-    h=re.sub(r'```[^\n]*\n.*?```',save_code,h,flags=re.DOTALL)
-    
-    # Now process markdown (code is protected)
-    # Headers - MUST be before bold/italic to avoid conflicts
-    h=re.sub(r'^#### (.+)$',r'<h4>\1</h4>',h,flags=re.MULTILINE)
-    h=re.sub(r'^### (.+)$',r'<h3>\1</h3>',h,flags=re.MULTILINE)
-    h=re.sub(r'^## (.+)$',r'<h2>\1</h2>',h,flags=re.MULTILINE)
-    h=re.sub(r'^# (.+)$',r'<h1>\1</h1>',h,flags=re.MULTILINE)
-    
-    # Links
-    h=re.sub(r'\[([^\]]+)\]\(([^\)]+)\)',r'<a href="\2">\1</a>',h)
-    
-    # Bold/italic (after headers to avoid **text:** becoming headings)
-    h=re.sub(r'\*\*([^\*]+)\*\*',r'<strong>\1</strong>',h)
-    h=re.sub(r'\*([^\*\n]+)\*',r'<em>\1</em>',h)
-    
-    # Inline code
-    h=re.sub(r'`([^`]+)`',r'<code>\1</code>',h)
-    
-    # Restore code blocks
-    for i, block in enumerate(code_blocks):
-        content = re.search(r'```[^\n]*\n(.*?)```', block, re.DOTALL).group(1)
-        h = h.replace(f'___CODE_BLOCK_{i}___', f'<pre><code>{content}</code></pre>')
-    
-    # Process line by line for paragraphs and lists
-    lines=h.split('\n')
-    result=[]
-    in_ul=False
-    in_pre=False
-    para_buffer=[]
-    
-    def flush_para():
-        if para_buffer:
-            result.append('<p>' + ' '.join(para_buffer) + '</p>')
-            para_buffer.clear()
-    
-    for line in lines:
-        s=line.strip()
-        
-        # Track pre blocks
-        if '<pre>' in line:
-            flush_para()
-            in_pre=True
-            result.append(line)
-            continue
-        if '</pre>' in line:
-            in_pre=False
-            result.append(line)
-            continue
-        if in_pre:
-            result.append(line)
-            continue
-        
-        # Handle list items
-        if s.startswith(('- ','* ')):
-            flush_para()
-            if not in_ul:
-                result.append('<ul>')
-                in_ul=True
-            item=re.sub(r'^[\-\*]\s+','',s)
-            result.append(f'<li>{item}</li>')
-            continue
-        
-        # End list if needed
-        if in_ul and not s.startswith(('- ','* ')):
-            result.append('</ul>')
-            in_ul=False
-        
-        # Handle block elements
-        if s.startswith('<h') or s.startswith('<div') or s.startswith('<hr'):
-            flush_para()
-            result.append(line)
-            continue
-        
-        # Empty line = paragraph break
-        if not s:
-            flush_para()
-            continue
-        
-        # Accumulate paragraph text
-        if s and not s.startswith('<'):
-            para_buffer.append(s)
+    """Render a Markdown document to HTML"""
+    r = _Renderer()
+    lines = md.split('\n')
+    count = len(lines)
+    i = 0
+    while i < count:
+        line = lines[i]
+        i += 1
+        m = _BLOCK_RE.match(line)
+        kind = m.lastgroup
+        if kind == 'text':
+            if not line.strip():
+                r.flush_para()
+                # A blank line ends the lists, unless what follows continues them
+                if r.lists:
+                    j = i
+                    while j < count and not lines[j].strip():
+                        j += 1
+                    if j == count or not _continues_list(r, lines[j]):
+                        r.close_lists()
+            elif r.lists and r.in_item(_indent_width(m.group('indent'))):
+                if r.item is not None:
+                    r.item.append(line.strip())
+                else:
+                    # Text after a nested block in the item
+                    r.out.append(inline(line.strip()))
+            else:
+                r.close_lists()
+                r.para.append(line)
+        elif kind == 'item':
+            marker = m.group('marker')
+            r.list_item(_indent_width(m.group('indent')), marker, m.group('item'))
+        elif kind == 'title':
+            r.flush_para()
+            r.close_lists()
+            level = len(m.group('hashes'))
+            r.out.append(f'<h{level}>{inline(m.group("title"))}</h{level}>')
         else:
-            flush_para()
-            result.append(line)
-    
-    # Flush remaining
-    flush_para()
-    if in_ul:
-        result.append('</ul>')
-    
-    return '\n'.join(result)
+            # Runs to a closing fence of the same kind at least as long, or to the end of the document
+            fence = m.group('fence')
+            indent = m.group('indent')
+            start = i
+            while i < count:
+                close = lines[i].lstrip(' \t')
+                i += 1
+                if close.startswith(fence) and not close.strip(fence[0]).strip():
+                    end = i - 1
+                    break
+            else:
+                end = count
+            body = []
+            for code in lines[start:end]:
+                # Drop the fence's own indentation from every line
+                body.append(code[min(len(code) - len(code.lstrip(' \t')), len(indent)):])
+            if not r.in_item(_indent_width(indent)):
+                r.close_lists()
+            r.code(body)
+    return r.finish()
 
 def parse_api(f):
-    with open(f,'r',encoding='utf-8') as fp: c=fp.read()
-    secs=[]; cur=None; lines=c.split('\n'); i=0
+    with open(f,'r',encoding='utf-8') as fp: return parse_api_text(fp.read())
+
+def parse_api_text(c):
+    return build_sections(api_events(c))
+
+def api_events(c):
+    """('section', title) and ('item', definition, description) of API.md style text, in order"""
+    lines=c.split('\n'); i=0
     while i<len(lines):
         l=lines[i]; s=l.strip()
         if s.startswith('## ') and not s.startswith('###'):
-            if cur and cur.get('items'): secs.append(cur)
-            cur={'title':s.replace('##','').strip(),'items':[]}; i+=1; continue
+            yield ('section',s.replace('##','').strip()); i+=1; continue
         if s.startswith('>'):
-            if not cur: cur={'title':'Definitions','items':[]}
             d=s.replace('>','').strip(); desc=[]; i+=1
             while i<len(lines):
                 n=lines[i]; ns=n.strip()
                 if ns.startswith('>') or (ns.startswith('##') and not ns.startswith('###')): break
                 if ns=='---': i+=1; break
                 desc.append(n); i+=1
-            cur['items'].append({'definition':d,'description':'\n'.join(desc).strip()}); continue
+            yield ('item',d,'\n'.join(desc).strip()); continue
         i+=1
+
+def build_sections(events):
+    """Sections with their items from api_events, leaving out sections without items"""
+    secs=[]; cur=None
+    for e in events:
+        if e[0]=='section':
+            if cur and cur.get('items'): secs.append(cur)
+            cur={'title':e[1],'items':[]}
+        else:
+            if not cur: cur={'title':'Definitions','items':[]}
+            cur['items'].append({'definition':e[1],'description':e[2]})
     if cur and cur.get('items'): secs.append(cur)
     return secs
 
-out=Path(__file__).parent
-(out/'index.html').write_text(HTML_TEMPLATE.format(title='ReiLua',content='<h1>ReiLua Enhanced</h1><p>Lua binding for Raylib.</p><h2>Documentation</h2><ul><li><a href="manual.html">Manual</a></li><li><a href="reference.html">API Reference</a></li></ul><h2>Quick Start</h2><p>Create <code>main.lua</code>:</p><pre><code>function RL.init()\n  RL.SetWindowTitle("Hello")\nend\n\nfunction RL.update(dt)\nend\n\nfunction RL.draw()\n  RL.ClearBackground(RL.RAYWHITE)\n  RL.DrawText("Hello!",190,200,20,RL.BLACK)\nend</code></pre><p>Run: <code>ReiLua.exe</code></p>'),encoding='utf-8')
-print('✓ index.html')
-
-parts=['<h1>ReiLua Manual</h1>']
-readme=Path('../README.md')
-if readme.exists():
-    parts.append(md2html(re.sub(r'!\[.*?\]\(.*?\)','',readme.read_text(encoding='utf-8'))))
-    parts.append('<hr>')
-for fp,t in [('../docs/EMBEDDING.md','Embedding'),('../docs/ASSET_LOADING.md','Asset Loading'),('../docs/SPLASH_SCREENS.md','Splash Screens'),('../docs/BUILD_SCRIPTS.md','Build Scripts'),('../docs/CUSTOMIZATION.md','Customization'),('../docs/ZED_EDITOR_SETUP.md','Editor Setup')]:
-    p=Path(fp)
-    if p.exists():
-        a=t.lower().replace(' ','-')
-        parts.append(f'<h2 id="{a}">{t}</h2>')
-        parts.append(md2html(p.read_text(encoding='utf-8')))
-        parts.append('<hr>')
-(out/'manual.html').write_text(HTML_TEMPLATE.format(title='Manual',content='\n'.join(parts)),encoding='utf-8')
-print('✓ manual.html')
-
-secs=parse_api(Path('../docs/API.md'))
-parts=['<h1>ReiLua API Reference</h1><p>Complete function reference.</p><h2>Contents</h2><ul>']
-for s in secs:
-    a=s['title'].lower().replace(' ','-').replace('/','').replace('.','')
-    parts.append(f'<li><a href="#{a}">{s["title"]}</a> ({len(s["items"])} items)</li>')
-parts.append('</ul>')
-for s in secs:
-    a=s['title'].lower().replace(' ','-').replace('/','').replace('.','')
-    parts.append(f'<h2 id="{a}">{s["title"]}</h2>')
-    for i in s['items']:
-        parts.append(f'<div class="apii"><code>{i["definition"]}</code></div>')
+# Sources tools/docgen.lua builds API.md from, in its order
+DEFINE_SOURCES = ['src/lua_core.c','src/platforms/core_desktop_glfw.c']
+FUNCTION_SOURCES = ['src/'+n+'.c' for n in ('core','shapes','textures','text','models','audio','rmath','rgui','lights',
+                                             'rlgl','gl','easings','bitwiseOp','platforms/core_desktop_glfw')]
+# Headers the define values come from
+HEADER_DIRS = ['include','include/external','include/platforms','include/GLFW']
+
+def scan_functions(lines):
+    """api_events of the /* ... */ comment blocks of a C source, one block at a time"""
+    block=None
+    for line in lines:
+        line=line.rstrip('\r\n')
+        if line=='*/' and block is not None:
+            yield from api_events('\n'.join(block)); block=None
+        elif block is not None:
+            block.append(line)
+        elif line=='/*':
+            block=[]
+
+_CATEGORY_RE = re.compile(r'\t/\* (.+?) \*/$')
+_ASSIGN_RE = re.compile(r'\s*assignGlobal(Int|Float|Double|Color)\(\s*(.+?)\s*,\s*"([^"]+)"\s*\);\s*(?://\s*(.*))?$')
+
+def scan_defines(lines):
+    """Events of the assignGlobal calls between DOC_DEFINES_START and DOC_DEFINES_END.
+    Items are ('define', kind, expression, name, comment) until their values are known.
+    Defines under #ifdef only exist in some builds and are left out, as API.md lists them as nil."""
+    writing=False; conditional=0
+    for line in lines:
+        line=line.rstrip('\r\n')
+        if line=='/*DOC_DEFINES_END*/': break
+        if writing:
+            directive=line.strip()
+            if directive.startswith('#if'): conditional+=1; continue
+            if directive.startswith('#endif'): conditional-=1; continue
+            m=_CATEGORY_RE.match(line)
+            if m: yield ('section','Defines - '+m.group(1)); continue
+            m=_ASSIGN_RE.match(line)
+            # Comments are split on spaces by tools/docgen.lua, which leaves one between words
+            if m and not conditional: yield ('define',m.group(1),m.group(2),m.group(3),' '.join((m.group(4) or '').split()))
+        elif line=='/*DOC_DEFINES_START*/':
+            writing=True
+
+_DEFINE_RE = re.compile(r'#\s*define\s+([A-Za-z_]\w*)[ \t]+(.+?)\s*$')
+_ENUM_RE = re.compile(r'\benum\b[^{;]*\{([^}]*)\}',re.S)
+_COMMENT_RE = re.compile(r'/\*.*?\*/|//[^\n]*',re.S)
+
+def scan_constants(text):
+    """Object-like #defines and enum members of a header, as {name: C expression}"""
+    consts={}
+    for line in text.split('\n'):
+        if '#' in line:
+            m=_DEFINE_RE.match(_COMMENT_RE.sub('',line).strip())
+            if m: consts.setdefault(m.group(1),m.group(2))
+    for body in _ENUM_RE.findall(_COMMENT_RE.sub('',text)):
+        prev=None
+        for member in body.split(','):
+            name,_,value=member.partition('=')
+            name=name.strip()
+            if not re.fullmatch(r'[A-Za-z_]\w*',name): continue
+            expr=value.strip() if value.strip() else (f'({prev})+1' if prev else '0')
+            consts.setdefault(name,expr); prev=name
+    return consts
+
+def scan_header(f):
+    return scan_constants(f.read())
+
+_TOKEN_RE = re.compile(r'(?P<name>[A-Za-z_]\w*)|(?P<number>0[xX][0-9a-fA-F]+[uUlL]*|(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?[fFuUlL]*)')
+_CAST_RE = re.compile(r'\(\s*(?:unsigned\s+|signed\s+)?(?:int|long|short|char|double|GLenum|GLuint|GLint)\s*\)')
+_FLOAT_CAST_RE = re.compile(r'\(\s*float\s*\)\s*')
+_SAFE_RE = re.compile(r'[0-9.eE\s()|&<>+\-*/~^]*')
+
+def _to_float32(v):
+    return struct.unpack('f',struct.pack('f',v))[0]
+
+class Float32(float):
+    """A C float. Arithmetic with ints and other floats is rounded to single precision at
+    every step, with a double it is done in double precision, as in C"""
+    def __new__(cls, v):
+        return super().__new__(cls,_to_float32(v))
+    def _result(self, v, other):
+        return v if type(other) is float else Float32(v)
+    def __add__(self, o): return self._result(float(self)+o,o)
+    def __radd__(self, o): return self._result(o+float(self),o)
+    def __sub__(self, o): return self._result(float(self)-o,o)
+    def __rsub__(self, o): return self._result(o-float(self),o)
+    def __mul__(self, o): return self._result(float(self)*o,o)
+    def __rmul__(self, o): return self._result(o*float(self),o)
+    def __truediv__(self, o): return self._result(float(self)/o,o)
+    def __rtruediv__(self, o): return self._result(o/float(self),o)
+    def __neg__(self): return Float32(-float(self))
+    def __pos__(self): return self
+
+class ConstantResolver:
+    """Evaluates C constant expressions against the #defines and enums of the headers.
+    Operands with an f suffix, (float) casts and names of such values are Float32"""
+    def __init__(self, consts):
+        self.consts=consts; self.values={}
+
+    def value(self, expr, depth=0):
+        """Number or color tuple of a C expression, None when it cannot be worked out"""
+        expr=_CAST_RE.sub('',expr.strip())
+        m=re.fullmatch(r'(?:CLITERAL\(\s*Color\s*\)|\(\s*Color\s*\))?\s*\{([^}]*)\}',expr)
+        if m:
+            parts=[self.value(v,depth+1) for v in m.group(1).split(',')]
+            return tuple(int(v) for v in parts) if len(parts)==4 and None not in parts else None
+        if depth>20: return None
+        if re.fullmatch(r'[A-Za-z_]\w*',expr): return self.name_value(expr,depth+1)
+        # Operands are passed as variables, so Float32 values keep their type through eval
+        operands={}
+        def operand(v):
+            key=f'_{len(operands)}'; operands[key]=v
+            return key
+        def token(t):
+            n=t.group(0)
+            if t.group('name'):
+                if n=='float': return 'float'
+                v=self.name_value(n,depth+1)
+                if v is None or isinstance(v,tuple): raise LookupError(n)
+                return operand(v)
+            if n[:2] in ('0x','0X'): return str(int(n.rstrip('uUlL'),16))
+            if n[-1] in 'fF': return operand(Float32(float(n.rstrip('fF'))))
+            return n.rstrip('uUlL')
+        try:
+            text=_TOKEN_RE.sub(token,_FLOAT_CAST_RE.sub('(float)',expr))
+        except LookupError:
+            return None
+        # A (float) cast applies to the operand right after it
+        text=re.sub(r'\(float\)(_\d+|[\d.]+(?:[eE][-+]?\d+)?)',lambda c: operand(Float32(eval(c.group(1),{'__builtins__':{}},operands))),text)
+        if not text.strip() or not _SAFE_RE.fullmatch(re.sub(r'_\d+','',text)): return None
+        floating='.' in text or 'e' in text or 'E' in text or any(isinstance(v,float) for v in operands.values())
+        try:
+            v=eval(text if floating else text.replace('/','//'),{'__builtins__':{}},operands)
+        except Exception:
+            return None
+        return v if isinstance(v,(int,float)) else None
+
+    def name_value(self, name, depth=0):
+        if name not in self.values:
+            self.values[name]=None  # guards against self-reference
+            if name in self.consts: self.values[name]=self.value(self.consts[name],depth)
+        return self.values[name]
+
+def _lua_number(v, kind):
+    """A value as Lua's tostring prints the global assignGlobal* creates"""
+    if kind=='Int': return str(int(v))
+    if kind=='Float': v=_to_float32(v)
+    return f'{float(v):.14g}'
+
+def resolve_defines(events, resolver):
+    """Turn the define events of scan_defines into items"""
+    for e in events:
+        if e[0]!='define':
+            yield e; continue
+        _,kind,expr,name,comment=e
+        v=resolver.value(expr)
+        if v is None: text=expr
+        elif kind=='Color': text='{ '+', '.join(str(c) for c in v)+' }' if isinstance(v,tuple) else expr
+        else: text=_lua_number(v,kind)
+        yield ('item',f'{name} = {text}',comment)
+
+MANUAL_PAGES = [('EMBEDDING.md','Embedding'),('ASSET_LOADING.md','Asset Loading'),('SPLASH_SCREENS.md','Splash Screens'),('BUILD_SCRIPTS.md','Build Scripts'),('CUSTOMIZATION.md','Customization'),('ZED_EDITOR_SETUP.md','Editor Setup')]
+
+INDEX_CONTENT = '<h1>ReiLua Enhanced</h1><p>Lua binding for Raylib.</p><h2>Documentation</h2><ul><li><a href="manual.html">Manual</a></li><li><a href="reference.html">API Reference</a></li></ul><h2>Quick Start</h2><p>Create <code>main.lua</code>:</p><pre><code>function RL.init()\n  RL.SetWindowTitle("Hello")\nend\n\nfunction RL.update(dt)\nend\n\nfunction RL.draw()\n  RL.ClearBackground(RL.RAYWHITE)\n  RL.DrawText("Hello!",190,200,20,RL.BLACK)\nend</code></pre><p>Run: <code>ReiLua.exe</code></p>'
+
+CACHE_DIR = DOCS_DIR / '.generate_cache'
+CACHE_VERSION = 1
+# Starting worker processes costs about as much as rendering this many characters of Markdown
+PARALLEL_MIN_SOURCE = 512 * 1024
+
+REFERENCE_DIR = 'reference'
+SEARCH_INDEX = 'search.json'
+SEARCH_BOX = ('<div class="search"><input type="search" id="search" placeholder="Search the API, e.g. DrawText" '
+              'autocomplete="off" disabled><ol id="search-results"></ol></div>'
+              '<script src="{root}search.js" data-index="{root}' + REFERENCE_DIR + '/' + SEARCH_INDEX + '" '
+              'data-pages="{root}' + REFERENCE_DIR + '/"></script>')
+
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+_NAME_RE = re.compile(r'(?:function\s+)?([A-Za-z_][\w.:]*)')
+
+def section_slug(title):
+    """File name of a reference section page, without .html"""
+    return _SLUG_RE.sub('-',title.lower()).strip('-') or 'section'
+
+def item_name(definition):
+    """Name an API item is found by: RL.DrawText, RL.KEY_A, Color"""
+    m=_NAME_RE.match(definition)
+    return m.group(1) if m else definition
+
+def reference_pages(secs):
+    """Sections of the API model as pages: unique slugs, item anchors, neighbours"""
+    pages=[]; slugs=set()
+    for s in secs:
+        slug=section_slug(s['title']); base=slug; n=2
+        while slug in slugs: slug=f'{base}-{n}'; n+=1
+        slugs.add(slug)
+        ids=set(); items=[]
+        for i in s['items']:
+            a=item_name(i['definition']); base=a; n=2
+            while a in ids: a=f'{base}-{n}'; n+=1
+            ids.add(a)
+            items.append({**i,'id':a})
+        pages.append({'title':s['title'],'slug':slug,'items':items})
+    for n,page in enumerate(pages):
+        page['prev']=pages[n-1]['slug'] if n else None
+        page['next']=pages[n+1]['slug'] if n+1<len(pages) else None
+    return pages
+
+def render_manual_page(page):
+    """HTML of one manual page, from (title, markdown)"""
+    t,md=page
+    if t is None:
+        return md2html(_IMAGE_RE.sub('',md))
+    return f'<h2 id="{t.lower().replace(" ","-")}">{t}</h2>\n{md2html(md)}'
+
+def render_section(page):
+    """Standalone HTML page of one reference section"""
+    nav=[f'<a href="{page["prev"]}.html">&larr; previous</a>' if page['prev'] else '',
+         '<a href="../reference.html">contents</a>',
+         f'<a href="{page["next"]}.html">next &rarr;</a>' if page['next'] else '']
+    parts=[SEARCH_BOX.format(root='../'),f'<p class="pager">{" &middot; ".join(a for a in nav if a)}</p>',
+           f'<h1>{page["title"]}</h1>']
+    for i in page['items']:
+        parts.append(f'<div class="apii" id="{i["id"]}"><code>{i["definition"]}</code></div>')
         if i['description']:
             parts.append(f'<div class="apidesc">{md2html(i["description"])}</div>')
-(out/'reference.html').write_text(HTML_TEMPLATE.format(title='API Reference',content='\n'.join(parts)),encoding='utf-8')
-print(f'✓ reference.html ({sum(len(s["items"]) for s in secs)} items)')
-print('Complete!')
+    parts.append(parts[1])
+    return HTML_TEMPLATE.format(root='../',title=f'{page["title"]} - API Reference',content='\n'.join(parts))
+
+_WORD_RE = re.compile(r'[A-Za-z0-9_]+')
+_CAMEL_RE = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+')
+_STOP_WORDS = frozenset('a an and are as at be by for from if in into is it its of on or that the this to was will with'.split())
+
+def _terms(text, parts=True):
+    """Lowercase search terms of text: every word, and the pieces of CamelCase and snake_case words"""
+    terms=set()
+    for word in _WORD_RE.findall(text):
+        lower=word.lower()
+        if len(lower)>1 and lower not in _STOP_WORDS: terms.add(lower)
+        if parts:
+            for piece in _CAMEL_RE.findall(word):
+                if len(piece)>1: terms.add(piece.lower())
+    return terms
+
+def _summary(description, limit=80):
+    text=' '.join(description.split('\n\n',1)[0].split())
+    text=re.sub(r'[`*]','',text)
+    return text if len(text)<=limit else text[:limit-3].rstrip()+'...'
+
+def build_search_index(pages):
+    """Compact inverted index over item names, definitions and descriptions.
+
+    docs holds [name, page, definition, summary] for every item, with the
+    anchor appended when it is not the name, and pages the page slugs. terms is sorted so a prefix is found by binary
+    search; postings[n] lists doc * 4 + field for terms[n], where field 0 is
+    the name, 1 the definition and 2 the description, the best one kept.
+    """
+    docs=[]; postings={}
+    for p,page in enumerate(pages):
+        for i in page['items']:
+            d=len(docs)
+            name=item_name(i['definition'])
+            docs.append([name,p,i['definition'],_summary(i['description'])]+([i['id']] if i['id']!=name else []))
+            for field,terms in enumerate((_terms(name),_terms(i['definition']),
+                                          _terms(i['description'],parts=False))):
+                for t in terms:
+                    best=postings.setdefault(t,{})
+                    if best.get(d,3)>field: best[d]=field
+    terms=sorted(postings)
+    return {'version':1,'pages':[page['slug'] for page in pages],'docs':docs,'terms':terms,
+            'postings':[[d*4+f for d,f in sorted(postings[t].items())] for t in terms]}
+
+def _digest(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8') if isinstance(part, str) else part)
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+class DocsCache:
+    """Parsed API model and rendered HTML fragments from earlier runs.
+
+    Lives in docs/.generate_cache/cache.json. The API model is kept with the
+    SHA-256 of the API.md it was parsed from, and every manual page and
+    reference section is kept under a hash of its source and of this script,
+    so editing the renderer invalidates everything it rendered.
+    """
+    def __init__(self, enabled=True):
+        self.path = CACHE_DIR / 'cache.json'
+        self.previous = {}
+        self.fragments = {}
+        self.files = {}
+        self.scanned = 0
+        self.api = None
+        if enabled and self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding='utf-8'))
+                if data.get('version') == CACHE_VERSION:
+                    self.previous = data
+            except ValueError:
+                pass
+        self.renderer = _digest(Path(__file__).read_bytes())
+
+    def api_model(self, path):
+        """Sections of API.md, parsed again only when its content changed"""
+        raw = path.read_bytes()
+        digest = _digest(raw)
+        cached = self.previous.get('api')
+        if cached and cached['sha256'] == digest and cached.get('renderer') == self.renderer:
+            self.api = cached
+        else:
+            self._set_api(digest, parse_api_text(raw.decode('utf-8')))
+        return self.api['sections']
+
+    def scan(self, path, scan):
+        """scan(open file) of a source, reused from an earlier run while the file is unchanged"""
+        key = f'{path.relative_to(ROOT_DIR).as_posix()}:{scan.__name__}'
+        stat = path.stat()
+        entry = self.previous.get('files', {}).get(key)
+        if not entry or entry['size'] != stat.st_size or entry['mtime_ns'] != stat.st_mtime_ns:
+            digest = _digest(path.read_bytes())
+            if not entry or entry['sha256'] != digest:
+                with open(path, encoding='utf-8', errors='replace') as f:
+                    data = scan(f)
+                    data = data if isinstance(data, dict) else list(data)
+                self.scanned += 1
+            else:
+                data = entry['data']
+            entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest, 'data': data}
+        self.files[key] = entry
+        return entry
+
+    def source_model(self, api_path):
+        """Sections straight from the comment blocks and define lists of the C sources.
+
+        The hand-written sections at the top of API.md, up to the first
+        "Defines - " section, come first. Only changed files are scanned again.
+        """
+        headers = [path for d in HEADER_DIRS for path in sorted((ROOT_DIR/d).glob('*.h'))]
+        entries = [self.scan(path, scan_header) for path in headers]
+        entries += [self.scan(ROOT_DIR/path, scan_defines) for path in DEFINE_SOURCES]
+        entries += [self.scan(ROOT_DIR/path, scan_functions) for path in FUNCTION_SOURCES]
+        raw = api_path.read_bytes()
+        digest = _digest(raw, *(entry['sha256'] for entry in entries))
+        cached = self.previous.get('api')
+        if cached and cached['sha256'] == digest and cached.get('renderer') == self.renderer:
+            self.api = cached
+            return self.api['sections']
+        consts = {}
+        for entry in entries[:len(headers)]:
+            for name, expr in entry['data'].items():
+                consts.setdefault(name, expr)
+        resolver = ConstantResolver(consts)
+        text = raw.decode('utf-8')
+        end = re.search(r'^## Defines - ', text, re.M)
+        prelude = list(api_events(text[:end.start()] if end else text))
+        # Items the hand-written part documents are not repeated
+        documented = {e[1] for e in prelude if e[0] == 'item'}
+        events = prelude
+        for entry in entries[len(headers):]:
+            events += [e for e in resolve_defines(entry['data'], resolver) if e[0] == 'section' or e[1] not in documented]
+        self._set_api(digest, build_sections(events))
+        return self.api['sections']
+
+    def _set_api(self, digest, sections):
+        self.api = {'sha256': digest, 'renderer': self.renderer, 'sections': sections}
+        cached = self.previous.get('api')
+        # A change that leaves the model as it was, like an edit to C code, keeps the search index
+        if cached and cached.get('renderer') == self.renderer and cached['sections'] == sections and 'search' in cached:
+            self.api['search'] = cached['search']
+
+    def search_index(self, pages):
+        """JSON search index of the reference pages, built again only with the API model"""
+        if 'search' not in self.api:
+            self.api['search'] = json.dumps(build_search_index(pages), separators=(',', ':'))
+        return self.api['search']
+
+    def render(self, render, sources, jobs):
+        """render() every source not rendered before, in a process pool when there is enough of it"""
+        encoded = [json.dumps(source, sort_keys=True) for source in sources]
+        keys = [_digest(self.renderer, render.__name__, text) for text in encoded]
+        cached = self.previous.get('fragments', {})
+        missing = [(key, source, len(text)) for key, source, text in zip(keys, sources, encoded)
+                   if key not in cached and key not in self.fragments]
+        if jobs > 1 and len(missing) > 1 and sum(size for _, _, size in missing) >= PARALLEL_MIN_SOURCE:
+            with concurrent.futures.ProcessPoolExecutor(min(jobs, len(missing))) as pool:
+                rendered = list(pool.map(render, [source for _, source, _ in missing],
+                                         chunksize=-(-len(missing) // jobs)))
+        else:
+            rendered = [render(source) for _, source, _ in missing]
+        self.fragments.update(zip((key for key, _, _ in missing), rendered))
+        for key in keys:
+            if key not in self.fragments:
+                self.fragments[key] = cached[key]
+        return [self.fragments[key] for key in keys], len(missing)
+
+    def save(self):
+        """Write the cache, keeping only what this run used"""
+        data = {'version': CACHE_VERSION, 'api': self.api, 'fragments': self.fragments, 'files': self.files}
+        if data != self.previous:
+            CACHE_DIR.mkdir(exist_ok=True)
+            write_if_changed(self.path, json.dumps(data, sort_keys=True))
+
+def write_if_changed(path, text):
+    """Write text to path unless it already holds exactly that. Returns whether it wrote."""
+    data = text.encode('utf-8')
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    return True
+
+def api_json(pages, from_source):
+    """The API model for editor tooling: sections with their items, and where each is documented"""
+    return {
+        'version': 1,
+        'source': 'src' if from_source else 'docs_md/API.md',
+        'sections': [{
+            'title': page['title'],
+            'page': f'{REFERENCE_DIR}/{page["slug"]}.html',
+            'items': [{'name': item_name(i['definition']), 'anchor': i['id'], 'kind': 'function' if '(' in i['definition'] else 'value',
+                       'definition': i['definition'], 'description': i['description']} for i in page['items']],
+        } for page in pages],
+    }
+
+def _report(name, wrote, detail=''):
+    print(f'{"✓" if wrote else "="} {name}{detail}' + ('' if wrote else ' (unchanged)'))
+
+def main():
+    parser = argparse.ArgumentParser(description='Generates the HTML documentation from README.md and docs_md/.')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help='processes rendering changed pages and sections (default: CPU count)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f'ignore {CACHE_DIR.name}/ and render everything again')
+    parser.add_argument('--from-source', action='store_true',
+                        help='build the reference from the comment blocks in src/*.c instead of API.md')
+    parser.add_argument('--json', metavar='FILE',
+                        help='also write the API model as JSON, for editor tooling')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    cache = DocsCache(enabled=not args.no_cache)
+    out = DOCS_DIR
+    _report('index.html', write_if_changed(out/'index.html', HTML_TEMPLATE.format(root='',title='ReiLua',content=INDEX_CONTENT)))
+
+    pages=[]
+    readme=ROOT_DIR/'README.md'
+    if readme.exists():
+        pages.append((None,readme.read_text(encoding='utf-8')))
+    for fp,t in MANUAL_PAGES:
+        p=ROOT_DIR/'docs_md'/fp
+        if p.exists():
+            pages.append((t,p.read_text(encoding='utf-8')))
+    fragments,rendered=cache.render(render_manual_page,pages,args.jobs)
+    parts=['<h1>ReiLua Manual</h1>']
+    for fragment in fragments:
+        parts+=[fragment,'<hr>']
+    _report('manual.html', write_if_changed(out/'manual.html', HTML_TEMPLATE.format(root='',title='Manual',content='\n'.join(parts))),
+            f' ({rendered}/{len(pages)} pages rendered)')
+
+    api=ROOT_DIR/'docs_md'/'API.md'
+    secs=cache.source_model(api) if args.from_source else cache.api_model(api)
+    if args.from_source:
+        print(f'  scanned {cache.scanned} of {len(cache.files)} source files')
+    pages=reference_pages(secs)
+    if args.json:
+        _report(args.json, write_if_changed(Path(args.json), json.dumps(api_json(pages, args.from_source), indent=1)))
+    ref=out/REFERENCE_DIR
+    ref.mkdir(exist_ok=True)
+    index=cache.search_index(pages)
+    parts=['<h1>ReiLua API Reference</h1>',SEARCH_BOX.format(root=''),'<h2>Contents</h2><ul>']
+    for page in pages:
+        parts.append(f'<li><a href="{REFERENCE_DIR}/{page["slug"]}.html">{page["title"]}</a> ({len(page["items"])} items)</li>')
+    parts.append('</ul>')
+    _report('reference.html', write_if_changed(out/'reference.html', HTML_TEMPLATE.format(root='',title='API Reference',content='\n'.join(parts))),
+            f' ({sum(len(page["items"]) for page in pages)} items)')
+    fragments,rendered=cache.render(render_section,pages,args.jobs)
+    wrote=sum(write_if_changed(ref/f'{page["slug"]}.html',html) for page,html in zip(pages,fragments))
+    # Pages of sections that no longer exist
+    current={f'{page["slug"]}.html' for page in pages}|{SEARCH_INDEX}
+    for stale in ref.iterdir():
+        if stale.name not in current:
+            stale.unlink(); wrote+=1
+    _report(f'{REFERENCE_DIR}/', wrote>0, f' ({len(pages)} pages, {rendered} rendered, {wrote} written)')
+    _report(f'{REFERENCE_DIR}/{SEARCH_INDEX}', write_if_changed(ref/SEARCH_INDEX,index), f' ({len(index)} bytes)')
+    cache.save()
+    print(f'Complete in {(time.perf_counter() - start) * 1000:.0f} ms')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+/* ReiLua Documentation - API search over the index written by generate.py */
+(function () {
+    var script = document.currentScript;
+    var input = document.getElementById("search");
+    var list = document.getElementById("search-results");
+    var index = null;
+    var MAX_RESULTS = 50;
+    /* Score of a match in the name, the definition and the description */
+    var WEIGHTS = [8, 3, 1];
+    /* index.docs: [name, page, definition, summary, anchor when not the name] */
+
+    function tokens(text) {
+        return text.toLowerCase().split(/[^a-z0-9_]+/).filter(function (t) { return t.length > 0; });
+    }
+
+    /* First position in the sorted terms that is not below token */
+    function lowerBound(token) {
+        var lo = 0, hi = index.terms.length;
+        while (lo < hi) {
+            var mid = (lo + hi) >> 1;
+            if (index.terms[mid] < token) lo = mid + 1; else hi = mid;
+        }
+        return lo;
+    }
+
+    /* Best score of every doc with a term starting with token */
+    function match(token) {
+        var scores = {};
+        for (var i = lowerBound(token); i < index.terms.length && index.terms[i].lastIndexOf(token, 0) === 0; i++) {
+            var exact = index.terms[i] === token ? 2 : 1;
+            var postings = index.postings[i];
+            for (var j = 0; j < postings.length; j++) {
+                var doc = postings[j] >> 2;
+                var score = WEIGHTS[postings[j] & 3] * exact;
+                if (!(scores[doc] >= score)) scores[doc] = score;
+            }
+        }
+        return scores;
+    }
+
+    function search(query) {
+        var words = tokens(query);
+        if (words.length === 0) return [];
+        /* Every word has to match, scores add up */
+        var total = match(words[0]);
+        for (var w = 1; w < words.length; w++) {
+            var next = match(words[w]), merged = {};
+            for (var doc in total) {
+                if (doc in next) merged[doc] = total[doc] + next[doc];
+            }
+            total = merged;
+        }
+        var lower = query.trim().toLowerCase();
+        var results = Object.keys(total).map(function (doc) {
+            var name = index.docs[doc][0].toLowerCase();
+            var bonus = name === lower || name === "rl." + lower ? 100 : 0;
+            return { doc: index.docs[doc], score: total[doc] + bonus };
+        });
+        results.sort(function (a, b) { return b.score - a.score || (a.doc[0] < b.doc[0] ? -1 : 1); });
+        return results.slice(0, MAX_RESULTS);
+    }
+
+    function show(results) {
+        list.textContent = "";
+        results.forEach(function (result) {
+            var doc = result.doc;
+            var item = document.createElement("li");
+            var link = document.createElement("a");
+            link.href = script.dataset.pages + index.pages[doc[1]] + ".html#" + encodeURIComponent(doc[4] || doc[0]);
+            link.textContent = doc[2];
+            item.appendChild(link);
+            if (doc[3]) {
+                var summary = document.createElement("span");
+                summary.textContent = doc[3];
+                item.appendChild(summary);
+            }
+            list.appendChild(item);
+        });
+    }
+
+    function update() {
+        show(index && input.value.trim() ? search(input.value) : []);
+    }
+
+    input.addEventListener("input", update);
+    input.addEventListener("keydown", function (event) {
+        var first = list.querySelector("a");
+        if (event.key === "Enter" && first) window.location.href = first.href;
+        if (event.key === "Escape") { input.value = ""; update(); }
+    });
+    fetch(script.dataset.index)
+        .then(function (response) { return response.json(); })
+        .then(function (data) {
+            index = data;
+            input.disabled = false;
+            update();
+        })
+        .catch(function () {
+            input.placeholder = "Search needs the docs served over HTTP, e.g. python -m http.server";
+        });
+})();
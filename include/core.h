@@ -123,6 +123,7 @@ int lcoreSetGCUnload( lua_State* L );
 int lcoreGetPlatform( lua_State* L );
 /* Files management functions. */
 int lcoreLoadFileData( lua_State* L );
+int lcoreLoadFileDataView( lua_State* L );
 int lcoreSaveFileData( lua_State* L );
 int lcoreExportDataAsCode( lua_State* L );
 int lcoreLoadFileText( lua_State* L );
@@ -130,6 +131,7 @@ int lcoreSaveFileText( lua_State* L );
 /* Files system functions. */
 int lcoreGetBasePath( lua_State* L );
 int lcoreFileExists( lua_State* L );
+int lcoreMountPak( lua_State* L );
 int lcoreDirectoryExists( lua_State* L );
 int lcoreIsFileExtension( lua_State* L );
 int lcoreGetFileLength( lua_State* L );
@@ -143,6 +145,7 @@ int lcoreGetApplicationDirectory( lua_State* L );
 int lcoreBeginAssetLoading( lua_State* L );
 int lcoreUpdateAssetLoading( lua_State* L );
 int lcoreEndAssetLoading( lua_State* L );
+int lcoreGetAssetLoadPlan( lua_State* L );
 int lcoreMakeDirectory( lua_State* L );
 int lcoreChangeDirectory( lua_State* L );
 int lcoreIsPathFile( lua_State* L );
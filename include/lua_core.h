@@ -39,6 +39,7 @@ typedef struct {
 	int type;
 	size_t size;
 	void* data;
+	bool borrowed; /* Read only view of asset data, not freed on unload */
 } Buffer;
 
 /* Global assing functions. */
@@ -58,6 +59,18 @@ void luaCallExit();
 void luaCallLoad( const char* type, void* object );
 void luaCallUnload( const char* type, void* object );
 void luaRegister();
+/* Embedded assets and .pak files. */
+unsigned char* LoadFileData_Embedded( const char* fileName, int* dataSize );
+const unsigned char* BorrowFileData_Embedded( const char* fileName, int* dataSize );
+char* LoadFileText_Embedded( const char* fileName );
+bool FileExists_Embedded( const char* fileName );
+bool MountPak( const char* fileName );
+void UnmountPaks();
+void TrackAssetFileReads();
+/* Load plan of the embedded assets, see scripts/embed_assets.py. */
+int GetAssetPlanGroupCount();
+const char* GetAssetPlanGroup( int group, int* count, long long* bytes );
+const char* GetAssetPlanEntry( int group, int index, unsigned int* size );
 void platformDefineGlobals();
 void luaPlatformRegister();
 /* Lua get types. */
@@ -124,6 +137,7 @@ REILUAPI void uluaPushWave( lua_State* L, Wave wave );
 REILUAPI void uluaPushSound( lua_State* L, Sound sound );
 REILUAPI void uluaPushSoundAlias( lua_State* L, Sound alias );
 REILUAPI void uluaPushMusic( lua_State* L, Music music );
+void uluaPushMusicWithData( lua_State* L, Music music, unsigned char* data );
 REILUAPI void uluaPushAudioStream( lua_State* L, AudioStream stream );
 REILUAPI void uluaPushLight( lua_State* L, Light light );
 REILUAPI void uluaPushMaterial( lua_State* L, Material material );
@@ -0,0 +1,48 @@
+#pragma once
+
+#include <stdbool.h>
+#include <stddef.h>
+#include <stdint.h>
+
+/* .pak archive written by scripts/pack_assets.py. All numbers are little endian.
+   Header, then the data of every asset aligned to PakHeader.alignment, then the
+   NUL terminated names and last the entry index sorted by name. */
+
+#define PAK_MAGIC "RPAK"
+#define PAK_VERSION 1
+#define PAK_ENTRY_COMPRESSED 1 /* Raw DEFLATE, same as EMBEDDED_ASSET_COMPRESSED */
+#define PAK_ENTRY_BORROWABLE 2 /* Stored bytes are the loaded bytes, same as EMBEDDED_ASSET_BORROWABLE */
+
+typedef struct {
+	char magic[4];
+	uint32_t version;
+	uint32_t count;
+	uint32_t alignment;
+	uint64_t indexOffset;
+	uint64_t namesOffset;
+} PakHeader;
+
+typedef struct {
+	uint64_t offset; /* From the start of the file */
+	uint64_t dataSize; /* Bytes stored */
+	uint64_t size; /* Size once loaded */
+	uint32_t nameOffset; /* From PakHeader.namesOffset */
+	uint32_t nameLength;
+	uint32_t flags;
+	uint32_t crc32; /* Of the stored bytes */
+} PakEntry;
+
+typedef struct {
+	const unsigned char* base;
+	size_t size;
+	const PakEntry* entries;
+	const char* names;
+	uint32_t count;
+	void* mapping;
+} Pak;
+
+bool PakOpen( Pak* pak, const char* fileName );
+void PakClose( Pak* pak );
+const PakEntry* PakFind( const Pak* pak, const char* name );
+const char* PakEntryName( const Pak* pak, const PakEntry* entry );
+const unsigned char* PakEntryData( const Pak* pak, const PakEntry* entry );
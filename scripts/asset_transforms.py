@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Build-time transforms applied to assets before embed_assets.py embeds them.
+Usage: python asset_transforms.py [--plugin transforms.py]   (lists the transforms)
+
+A transform claims assets by name and turns them into other assets:
+  wav-pcm     WAV files rewritten as plain 16-bit PCM with only fmt and data chunks
+  json-minify JSON files without whitespace
+  text-trim   text and shader sources with LF line ends and no trailing whitespace
+  atlas       the PNG files inside a folder named <name>.atlas packed into one
+              <name>.png, with the rectangle of every image in <name>.json
+
+Results are cached in the embed cache by the hash of their inputs, so a
+transform only runs again when one of its inputs changes. Transforms that have
+work to do run in a process pool, and apply_transforms reports the time each
+transform took.
+
+More transforms can be added with --plugin: a Python file that defines
+TRANSFORMS, a list of Transform tuples. A transform that fails leaves its
+inputs unchanged.
+"""
+import argparse
+import array
+import collections
+import concurrent.futures
+import fnmatch
+import hashlib
+import importlib.util
+import json
+import math
+import os
+import shutil
+import struct
+import sys
+import time
+
+from png_codec import read_png, write_png
+
+# name:    used on the command line and in the cache
+# version: bump when the output for the same inputs changes
+# group:   group(asset name) -> key of the job the asset belongs to, None if not claimed
+# run:     run(key, [(name, path)], dest_dir) -> [(output name, file in dest_dir)]
+Transform = collections.namedtuple('Transform', 'name version description group run')
+
+def file_transform(name, version, description, patterns, convert):
+    """Transform that converts every asset matching a pattern on its own, keeping its name.
+
+    convert(src_path, dest_path) writes the new data.
+    """
+    def group(asset_name):
+        base = asset_name.rsplit('/', 1)[-1].lower()
+        return asset_name if any(fnmatch.fnmatchcase(base, pattern) for pattern in patterns) else None
+
+    def run(key, inputs, dest_dir):
+        (asset_name, path), = inputs
+        file_name = asset_name.rsplit('/', 1)[-1]
+        convert(path, os.path.join(dest_dir, file_name))
+        return [(asset_name, file_name)]
+
+    return Transform(name, version, description, group, run)
+
+# WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT and WAVE_FORMAT_EXTENSIBLE
+_WAVE_PCM = 1
+_WAVE_FLOAT = 3
+_WAVE_EXTENSIBLE = 0xfffe
+
+def read_wav(path):
+    """Parse a RIFF WAVE file. Returns (format tag, channels, rate, bits per sample, sample bytes)."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < 12 or data[:4] != b'RIFF' or data[8:12] != b'WAVE':
+        raise ValueError('not a RIFF WAVE file')
+    fmt = None
+    samples = None
+    pos = 12
+    while pos + 8 <= len(data):
+        kind, size = struct.unpack_from('<4sI', data, pos)
+        body = data[pos + 8:pos + 8 + size]
+        if kind == b'fmt ':
+            fmt = body
+        elif kind == b'data':
+            samples = body
+        pos += 8 + size + (size & 1)
+    if fmt is None or len(fmt) < 16 or samples is None:
+        raise ValueError('missing fmt or data chunk')
+    tag, channels, rate, _, block_align, bits = struct.unpack_from('<HHIIHH', fmt)
+    if tag == _WAVE_EXTENSIBLE and len(fmt) >= 26:
+        tag, = struct.unpack_from('<H', fmt, 24)
+    if channels == 0 or block_align == 0:
+        raise ValueError('invalid fmt chunk')
+    return tag, channels, rate, bits, samples[:len(samples) - len(samples) % block_align]
+
+def pcm16_samples(tag, bits, samples):
+    """Sample bytes of any PCM or float WAV as signed 16-bit little endian"""
+    if tag == _WAVE_PCM and bits == 8:
+        return bytes(b for value in samples for b in (0, value ^ 0x80))
+    if tag == _WAVE_PCM and bits in (16, 24, 32):
+        step = bits // 8
+        # Keep the two most significant bytes of every little endian sample
+        out = bytearray(len(samples) // step * 2)
+        out[0::2] = samples[step - 2::step]
+        out[1::2] = samples[step - 1::step]
+        return bytes(out)
+    if tag == _WAVE_FLOAT and bits in (32, 64):
+        values = array.array('f' if bits == 32 else 'd', samples)
+        if sys.byteorder == 'big':
+            values.byteswap()
+        out = array.array('h', (max(-32768, min(32767, round(value * 32767))) for value in values))
+        if sys.byteorder == 'big':
+            out.byteswap()
+        return out.tobytes()
+    raise ValueError(f'unsupported WAV format {tag} with {bits} bits per sample')
+
+def convert_wav(src_path, dest_path):
+    """Rewrite a WAV file as 16-bit PCM with a canonical 44 byte header"""
+    tag, channels, rate, bits, samples = read_wav(src_path)
+    pcm = pcm16_samples(tag, bits, samples)
+    with open(dest_path, 'wb') as out:
+        out.write(struct.pack('<4sI4s', b'RIFF', 36 + len(pcm), b'WAVE'))
+        out.write(struct.pack('<4sIHHIIHH', b'fmt ', 16, _WAVE_PCM, channels, rate,
+                              rate * channels * 2, channels * 2, 16))
+        out.write(struct.pack('<4sI', b'data', len(pcm)))
+        out.write(pcm)
+
+def minify_json(src_path, dest_path):
+    """Re-serialize JSON without whitespace, keeping key order"""
+    with open(src_path, 'r', encoding='utf-8-sig') as f:
+        value = json.load(f)
+    with open(dest_path, 'w', encoding='utf-8', newline='') as out:
+        json.dump(value, out, ensure_ascii=False, separators=(',', ':'))
+
+def trim_text(src_path, dest_path):
+    """LF line ends, no trailing whitespace and no trailing blank lines"""
+    with open(src_path, 'rb') as f:
+        lines = f.read().replace(b'\r\n', b'\n').split(b'\n')
+    text = b'\n'.join(line.rstrip(b' \t\r') for line in lines).rstrip(b'\n')
+    with open(dest_path, 'wb') as out:
+        out.write(text + b'\n' if text else b'')
+
+ATLAS_SUFFIX = '.atlas'
+ATLAS_PADDING = 1
+
+def atlas_group(asset_name):
+    """The <name>.atlas folder a PNG asset is in, or None"""
+    if not asset_name.lower().endswith('.png'):
+        return None
+    parts = asset_name.split('/')
+    for index, part in enumerate(parts[:-1]):
+        if part.endswith(ATLAS_SUFFIX):
+            return '/'.join(parts[:index + 1])
+    return None
+
+def pack_rects(sizes, padding):
+    """Shelf pack (width, height) sizes, tallest first. Returns (atlas width, height, [(x, y)])."""
+    if not sizes:
+        return 0, 0, []
+    area = sum((w + padding) * (h + padding) for w, h in sizes)
+    width = 1
+    while width < max(max(w for w, _ in sizes), math.isqrt(area)):
+        width *= 2
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0], i))
+    positions = [None] * len(sizes)
+    x = y = shelf_height = 0
+    for i in order:
+        w, h = sizes[i]
+        if x > 0 and x + w > width:
+            x = 0
+            y += shelf_height + padding
+            shelf_height = 0
+        positions[i] = (x, y)
+        x += w + padding
+        shelf_height = max(shelf_height, h)
+    return width, y + shelf_height, positions
+
+def run_atlas(key, inputs, dest_dir):
+    """Pack the images of one .atlas folder into a PNG and a JSON rectangle table"""
+    images = [(name[len(key) + 1:], read_png(path)) for name, path in sorted(inputs)]
+    width, height, positions = pack_rects([(w, h) for _, (w, h, _) in images], ATLAS_PADDING)
+    pixels = bytearray(width * height * 4)
+    rects = {}
+    for (name, (w, h, rgba)), (x, y) in zip(images, positions):
+        for row in range(h):
+            start = ((y + row) * width + x) * 4
+            pixels[start:start + w * 4] = rgba[row * w * 4:(row + 1) * w * 4]
+        rects[name] = [x, y, w, h]
+
+    base = key[:-len(ATLAS_SUFFIX)]
+    stem = base.rsplit('/', 1)[-1]
+    write_png(os.path.join(dest_dir, stem + '.png'), width, height, pixels)
+    with open(os.path.join(dest_dir, stem + '.json'), 'w', encoding='utf-8', newline='') as out:
+        json.dump({'image': stem + '.png', 'width': width, 'height': height, 'padding': ATLAS_PADDING,
+                   'rects': rects}, out, separators=(',', ':'))
+    return [(base + '.png', stem + '.png'), (base + '.json', stem + '.json')]
+
+BUILTIN_TRANSFORMS = [
+    file_transform('wav-pcm', 1, 'WAV files as plain 16-bit PCM', ['*.wav'], convert_wav),
+    file_transform('json-minify', 1, 'JSON files without whitespace', ['*.json'], minify_json),
+    file_transform('text-trim', 1, 'text and shaders with LF line ends and no trailing whitespace',
+                   ['*.txt', '*.csv', '*.fs', '*.vs', '*.glsl'], trim_text),
+    Transform('atlas', 1, 'PNG files in a <name>.atlas folder packed into <name>.png and <name>.json',
+              atlas_group, run_atlas),
+]
+
+_loaded = {}
+
+def load_transforms(plugins=()):
+    """Built-in transforms and those of the plugin files, by name"""
+    plugins = tuple(plugins)
+    if plugins not in _loaded:
+        transforms = {transform.name: transform for transform in BUILTIN_TRANSFORMS}
+        for index, plugin in enumerate(plugins):
+            spec = importlib.util.spec_from_file_location(f'embed_transform_plugin_{index}', plugin)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            for transform in getattr(module, 'TRANSFORMS', []):
+                transforms[transform.name] = transform
+        _loaded[plugins] = transforms
+    return _loaded[plugins]
+
+def _run_job(plugins, transform_name, key, inputs, dest_dir):
+    """Worker side of a job. Returns (outputs, seconds)."""
+    transform = load_transforms(plugins)[transform_name]
+    start = time.perf_counter()
+    outputs = transform.run(key, inputs, dest_dir)
+    return outputs, time.perf_counter() - start
+
+def job_digest(transform, key, inputs, cache):
+    """Cache key of a job: the transform, its version and every input name and content"""
+    digest = hashlib.sha256(f'{transform.name}\0{transform.version}\0{key}'.encode('utf-8'))
+    for name, path in sorted(inputs):
+        digest.update(f'\0{name}\0{cache.digest(path)}'.encode('utf-8'))
+    return digest.hexdigest()
+
+class TransformStats:
+    """Work done by one transform in a run"""
+    def __init__(self, name):
+        self.name = name
+        self.jobs = 0
+        self.cached = 0
+        self.failed = 0
+        self.seconds = 0.0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+def apply_transforms(assets, names, cache, plugins=(), jobs=None):
+    """Run the named transforms over (name, path) assets.
+
+    Every asset is claimed by the first transform, in the order given, that
+    wants it. Returns (assets with transformed ones replaced, [TransformStats],
+    wall seconds). Output files live in the cache until no run asks for them.
+    """
+    transforms = load_transforms(plugins)
+    unknown = [name for name in names if name not in transforms]
+    if unknown:
+        raise ValueError(f'unknown transform(s): {", ".join(unknown)}, available: {", ".join(sorted(transforms))}')
+
+    start = time.perf_counter()
+    claimed = set()
+    pending = []
+    results = {}
+    stats = [TransformStats(name) for name in names]
+    for transform, stat in zip((transforms[name] for name in names), stats):
+        groups = {}
+        for name, path in assets:
+            key = None if name in claimed else transform.group(name)
+            if key is not None:
+                groups.setdefault(key, []).append((name, path))
+        for key, inputs in sorted(groups.items()):
+            claimed.update(name for name, _ in inputs)
+            dest_dir = cache.derived_path(f'{transform.name}-{job_digest(transform, key, inputs, cache)[:32]}')
+            job = (transform.name, key, tuple(inputs), dest_dir, stat)
+            stat.jobs += 1
+            stat.bytes_in += sum(os.path.getsize(path) for _, path in inputs)
+            outputs_path = os.path.join(dest_dir, 'outputs.json')
+            if os.path.exists(outputs_path):
+                with open(outputs_path) as f:
+                    results[job] = [tuple(output) for output in json.load(f)]
+                stat.cached += 1
+            else:
+                shutil.rmtree(dest_dir, ignore_errors=True)
+                os.makedirs(dest_dir)
+                pending.append(job)
+
+    def finish(job, outputs, seconds):
+        _, _, _, dest_dir, stat = job
+        stat.seconds += seconds
+        with open(os.path.join(dest_dir, 'outputs.json'), 'w') as f:
+            json.dump(outputs, f)
+        results[job] = outputs
+
+    def fail(job, error):
+        transform_name, key, _, dest_dir, stat = job
+        print(f'Warning: transform {transform_name} failed on {key}: {error}, embedding it unchanged')
+        shutil.rmtree(dest_dir, ignore_errors=True)
+        stat.failed += 1
+
+    if len(pending) > 1 and jobs != 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {pool.submit(_run_job, tuple(plugins), job[0], job[1], list(job[2]), job[3]): job
+                       for job in pending}
+            for future in concurrent.futures.as_completed(futures):
+                try:
+                    finish(futures[future], *future.result())
+                except Exception as e:
+                    fail(futures[future], e)
+    else:
+        for job in pending:
+            try:
+                finish(job, *_run_job(tuple(plugins), job[0], job[1], list(job[2]), job[3]))
+            except Exception as e:
+                fail(job, e)
+
+    transformed = []
+    removed = set()
+    for (_, _, inputs, dest_dir, stat), outputs in results.items():
+        removed.update(name for name, _ in inputs)
+        for name, file_name in outputs:
+            path = os.path.join(dest_dir, file_name)
+            stat.bytes_out += os.path.getsize(path)
+            transformed.append((name, path))
+    kept = [(name, path) for name, path in assets if name not in removed]
+    seen = {name for name, _ in kept}
+    for name, _ in transformed:
+        if name in seen:
+            raise ValueError(f'transform output {name} has the same name as another asset')
+        seen.add(name)
+    return kept + transformed, stats, time.perf_counter() - start
+
+def print_report(stats, seconds):
+    """Print the per-transform timing report"""
+    ran = sum(stat.jobs - stat.cached for stat in stats)
+    cached = sum(stat.cached for stat in stats)
+    print(f'Transforms: {ran} run, {cached} cached in {seconds:.2f} s')
+    for stat in stats:
+        failed = f', {stat.failed} failed' if stat.failed else ''
+        print(f'  - {stat.name}: {stat.jobs} job(s), {stat.cached} cached{failed}, '
+              f'{stat.bytes_in} -> {stat.bytes_out} bytes, {stat.seconds:.2f} s')
+
+def add_transform_arguments(parser):
+    """Add the --transform, --transform-plugin and --jobs options"""
+    parser.add_argument('--transform', action='append', default=[], metavar='NAME',
+                        help='apply a build-time transform, in the order given (repeatable, see asset_transforms.py)')
+    parser.add_argument('--transform-plugin', action='append', default=[], metavar='FILE',
+                        help='Python file defining more TRANSFORMS (repeatable)')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='processes running transforms (default: one per CPU)')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Lists the build-time asset transforms embed_assets.py can apply.')
+    parser.add_argument('--plugin', action='append', default=[], metavar='FILE',
+                        help='Python file defining more TRANSFORMS (repeatable)')
+    args = parser.parse_args()
+
+    for transform in load_transforms(args.plugin).values():
+        print(f'{transform.name}: {transform.description}')
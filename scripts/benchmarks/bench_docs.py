@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Benchmark the single pass Markdown renderer of docs/generate.py against the
+regex chain it replaced.
+Usage: python bench_docs.py [--repeat N] [--diff N]
+
+Renders every API reference description from docs_md/API.md and every manual
+page with both renderers, prints the best time of each and counts the outputs
+that differ. --diff shows the first N differences; expected ones are code
+blocks and spans that are now HTML escaped, nested or ordered lists and
+formatting characters inside code that are no longer rewritten.
+"""
+import argparse
+import difflib
+import importlib.util
+import os
+import re
+import time
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+
+def load_generator():
+    """docs/generate.py as a module, without running it"""
+    spec = importlib.util.spec_from_file_location('generate', os.path.join(ROOT_DIR, 'docs', 'generate.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def legacy_fix_links(t):
+    t=re.sub(r'\(([^)]+)\.md\)',r'(manual.html)',t)
+    t=re.sub(r'\(docs/[^)]+\.md\)',r'(manual.html)',t)
+    t=re.sub(r'\(\.\.\/docs\/[^)]+\.md\)',r'(manual.html)',t)
+    return t
+
+def legacy_md2html(md):
+    """Regex-chain renderer used by docs/generate.py before the single pass tokenizer"""
+    h=legacy_fix_links(md)
+    
+    # Protect code blocks by replacing them with placeholders
+    code_blocks = []
+    def save_code(m):
+        code_blocks.append(m.group(0))
+        return f'___CODE_BLOCK_{len(code_blocks)-1}___'
+    h=re.sub(r'```[^\n]*\n.*?```',save_code,h,flags=re.DOTALL)
+    
+    # Now process markdown (code is protected)
+    # Headers - MUST be before bold/italic to avoid conflicts
+    h=re.sub(r'^#### (.+)$',r'<h4>\1</h4>',h,flags=re.MULTILINE)
+    h=re.sub(r'^### (.+)$',r'<h3>\1</h3>',h,flags=re.MULTILINE)
+    h=re.sub(r'^## (.+)$',r'<h2>\1</h2>',h,flags=re.MULTILINE)
+    h=re.sub(r'^# (.+)$',r'<h1>\1</h1>',h,flags=re.MULTILINE)
+    
+    # Links
+    h=re.sub(r'\[([^\]]+)\]\(([^\)]+)\)',r'<a href="\2">\1</a>',h)
+    
+    # Bold/italic (after headers to avoid **text:** becoming headings)
+    h=re.sub(r'\*\*([^\*]+)\*\*',r'<strong>\1</strong>',h)
+    h=re.sub(r'\*([^\*\n]+)\*',r'<em>\1</em>',h)
+    
+    # Inline code
+    h=re.sub(r'`([^`]+)`',r'<code>\1</code>',h)
+    
+    # Restore code blocks
+    for i, block in enumerate(code_blocks):
+        content = re.search(r'```[^\n]*\n(.*?)```', block, re.DOTALL).group(1)
+        h = h.replace(f'___CODE_BLOCK_{i}___', f'<pre><code>{content}</code></pre>')
+    
+    # Process line by line for paragraphs and lists
+    lines=h.split('\n')
+    result=[]
+    in_ul=False
+    in_pre=False
+    para_buffer=[]
+    
+    def flush_para():
+        if para_buffer:
+            result.append('<p>' + ' '.join(para_buffer) + '</p>')
+            para_buffer.clear()
+    
+    for line in lines:
+        s=line.strip()
+        
+        # Track pre blocks
+        if '<pre>' in line:
+            flush_para()
+            in_pre=True
+            result.append(line)
+            continue
+        if '</pre>' in line:
+            in_pre=False
+            result.append(line)
+            continue
+        if in_pre:
+            result.append(line)
+            continue
+        
+        # Handle list items
+        if s.startswith(('- ','* ')):
+            flush_para()
+            if not in_ul:
+                result.append('<ul>')
+                in_ul=True
+            item=re.sub(r'^[\-\*]\s+','',s)
+            result.append(f'<li>{item}</li>')
+            continue
+        
+        # End list if needed
+        if in_ul and not s.startswith(('- ','* ')):
+            result.append('</ul>')
+            in_ul=False
+        
+        # Handle block elements
+        if s.startswith('<h') or s.startswith('<div') or s.startswith('<hr'):
+            flush_para()
+            result.append(line)
+            continue
+        
+        # Empty line = paragraph break
+        if not s:
+            flush_para()
+            continue
+        
+        # Accumulate paragraph text
+        if s and not s.startswith('<'):
+            para_buffer.append(s)
+        else:
+            flush_para()
+            result.append(line)
+    
+    # Flush remaining
+    flush_para()
+    if in_ul:
+        result.append('</ul>')
+    
+    return '\n'.join(result)
+
+def measure(render, documents, repeat):
+    """Best wall time of repeat runs over all documents, and the outputs of the last run"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        outputs = [render(document) for document in documents]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, outputs
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the docs/generate.py Markdown renderer')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per renderer, best is reported (default: 5)')
+    parser.add_argument('--diff', type=int, default=0, metavar='N', help='show the first N differing outputs')
+    args = parser.parse_args()
+
+    generate = load_generator()
+    sections = generate.parse_api(os.path.join(ROOT_DIR, 'docs_md', 'API.md'))
+    api = [item['description'] for section in sections for item in section['items'] if item['description']]
+    manual = []
+    for name, _ in generate.MANUAL_PAGES:
+        path = os.path.join(ROOT_DIR, 'docs_md', name)
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                manual.append(f.read())
+
+    shown = 0
+    for label, documents in [('API descriptions', api), ('manual pages', manual)]:
+        size = sum(len(document) for document in documents)
+        legacy_time, legacy_out = measure(legacy_md2html, documents, args.repeat)
+        new_time, new_out = measure(generate.md2html, documents, args.repeat)
+        differing = [(old, new) for old, new in zip(legacy_out, new_out) if old != new]
+        print(f'{label}: {len(documents)} documents, {size} characters, best of {args.repeat}')
+        print(f'  {"legacy regex chain":<22} {legacy_time * 1000:8.2f} ms')
+        print(f'  {"single pass":<22} {new_time * 1000:8.2f} ms')
+        print(f'  speedup: {legacy_time / new_time:.1f}x, {len(differing)} outputs differ')
+        for old, new in differing:
+            if shown >= args.diff:
+                break
+            shown += 1
+            print('\n'.join(difflib.unified_diff(old.split('\n'), new.split('\n'), 'legacy', 'single pass', lineterm='')))
+
+if __name__ == '__main__':
+    main()
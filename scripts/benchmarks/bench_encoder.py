@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark the streaming byte-array encoder against the old per-byte loop.
+Usage: python bench_encoder.py [--size MB] [--repeat N]
+
+Writes a random input of the given size to a temp directory, encodes it with
+both implementations and prints throughput in MB/s of input.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from embed_common import write_byte_array
+
+def legacy_write_byte_array(f, var_name, file_path):
+    """Per-byte loop used by embed_assets.py before embed_common existed"""
+    with open(file_path, 'rb') as inf:
+        data = inf.read()
+    f.write(f'static const unsigned char {var_name}[] = {{\n')
+    for i, byte in enumerate(data):
+        if i % 12 == 0:
+            f.write('    ')
+        f.write(f'0x{byte:02x}')
+        if i < len(data) - 1:
+            f.write(',')
+            if (i + 1) % 12 == 0:
+                f.write('\n')
+            else:
+                f.write(' ')
+    f.write('\n};\n')
+    f.write(f'static const unsigned int {var_name}_len = {len(data)};\n\n')
+
+def measure(encoder, input_file, output_file, repeat):
+    """Best wall time of repeat runs"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with open(output_file, 'w') as f:
+            encoder(f, 'bench_data', input_file)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark embed_common.write_byte_array')
+    parser.add_argument('--size', type=float, default=8, help='input size in MB (default: 8)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per encoder, best is reported (default: 3)')
+    args = parser.parse_args()
+
+    size = int(args.size * 1024 * 1024)
+    with tempfile.TemporaryDirectory() as tmp:
+        input_file = os.path.join(tmp, 'input.bin')
+        with open(input_file, 'wb') as f:
+            f.write(os.urandom(size))
+
+        results = []
+        for label, encoder in [('legacy per-byte loop', legacy_write_byte_array), ('embed_common streaming', write_byte_array)]:
+            output_file = os.path.join(tmp, 'output.h')
+            elapsed = measure(encoder, input_file, output_file, args.repeat)
+            results.append((label, elapsed, os.path.getsize(output_file)))
+
+    print(f'Input: {size} bytes, best of {args.repeat}')
+    for label, elapsed, out_size in results:
+        print(f'  {label:<24} {elapsed:8.3f} s  {size / elapsed / 1e6:8.2f} MB/s  ({out_size} bytes out)')
+    print(f'  speedup: {results[0][1] / results[1][1]:.1f}x')
+
+if __name__ == '__main__':
+    main()
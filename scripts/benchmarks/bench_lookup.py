@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Benchmark embedded asset lookups against a generated embedded_assets.h.
+Usage: python bench_lookup.py [--count N] [--rounds N] [--cc COMPILER]
+
+Generates N small asset files, embeds them with embed_assets.py, then builds
+and runs lookup_harness.c, which compares a linear strcmp scan, binary search
+over the sorted table and the hash index used by find_embedded_asset.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.dirname(BENCH_DIR)
+
+def make_assets(root, count):
+    """Create count tiny asset files spread over nested folders"""
+    paths = []
+    for i in range(count):
+        folder = os.path.join(root, 'build', 'assets', f'level_{i % 50:02d}', f'pack_{i % 7}')
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f'sprite_{i:05d}.png')
+        with open(path, 'wb') as f:
+            f.write(i.to_bytes(4, 'little'))
+        paths.append(path)
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark find_embedded_asset lookups')
+    parser.add_argument('--count', type=int, default=10000, help='number of assets (default: 10000)')
+    parser.add_argument('--rounds', type=int, default=3, help='lookup rounds over all names (default: 3)')
+    parser.add_argument('--cc', default=os.environ.get('CC', 'cc'), help='C compiler (default: $CC or cc)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_assets(tmp, args.count)
+        header = os.path.join(tmp, 'embedded_assets.h')
+        subprocess.run([sys.executable, os.path.join(SCRIPTS_DIR, 'embed_assets.py'), header] + paths,
+                       check=True, stdout=subprocess.DEVNULL)
+        harness = os.path.join(tmp, 'lookup_harness')
+        subprocess.run([args.cc, '-O2', '-std=c11', f'-I{tmp}', os.path.join(BENCH_DIR, 'lookup_harness.c'),
+                        '-o', harness], check=True)
+        subprocess.run([harness, str(args.rounds)], check=True)
+
+if __name__ == '__main__':
+    main()
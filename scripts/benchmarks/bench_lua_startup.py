@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Compare loading embedded Lua source against luac bytecode for the examples.
+Usage: python bench_lua_startup.py [--lua-src DIR] [--rounds N] [--cc COMPILER] [examples dir]
+
+Builds luac and lua_load_harness.c from deps/lua-5.4.7.tar.gz (or --lua-src,
+a Lua src/ directory), compiles every example's .lua files with luac -s the
+way embed_lua.py --luac does, and times luaL_loadbuffer over all files of an
+example for both forms. This is the part of startup EMBED_LUA_BYTECODE saves.
+"""
+import argparse
+import glob
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(os.path.dirname(BENCH_DIR))
+LUA_TARBALL = os.path.join(ROOT_DIR, 'deps', 'lua-5.4.7.tar.gz')
+
+def extract_lua(tmp):
+    """Unpack the vendored Lua sources. Returns the src/ directory."""
+    try:
+        with tarfile.open(LUA_TARBALL) as tar:
+            tar.extractall(tmp)
+    except (OSError, tarfile.TarError) as e:
+        print(f'Error: cannot extract {LUA_TARBALL}: {e}')
+        print('Pass a Lua 5.4 src/ directory with --lua-src')
+        sys.exit(1)
+    return os.path.join(tmp, 'lua-5.4.7', 'src')
+
+def build_tools(cc, lua_src, tmp):
+    """Build luac and the load harness. Returns their paths."""
+    core = [path for path in glob.glob(os.path.join(lua_src, '*.c'))
+            if os.path.basename(path) not in ('lua.c', 'luac.c')]
+    luac = os.path.join(tmp, 'luac')
+    harness = os.path.join(tmp, 'lua_load_harness')
+    subprocess.run([cc, '-O2', f'-I{lua_src}', os.path.join(lua_src, 'luac.c')] + core + ['-o', luac, '-lm'],
+                   check=True)
+    subprocess.run([cc, '-O2', f'-I{lua_src}', os.path.join(BENCH_DIR, 'lua_load_harness.c')] + core
+                   + ['-o', harness, '-lm'], check=True)
+    return luac, harness
+
+def time_load(harness, rounds, files):
+    """Mean milliseconds to load all files"""
+    result = subprocess.run([harness, str(rounds)] + files, check=True, capture_output=True, text=True)
+    return float(result.stdout) / 1000
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Lua source against bytecode loading')
+    parser.add_argument('examples', nargs='?', default=os.path.join(ROOT_DIR, 'examples'),
+                        help='folder of projects with a main.lua each (default: examples/)')
+    parser.add_argument('--lua-src', help='Lua src/ directory instead of deps/lua-5.4.7.tar.gz')
+    parser.add_argument('--rounds', type=int, default=20, help='loads of every project (default: 20)')
+    parser.add_argument('--cc', default=os.environ.get('CC', 'cc'), help='C compiler (default: $CC or cc)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        lua_src = args.lua_src or extract_lua(tmp)
+        luac, harness = build_tools(args.cc, lua_src, tmp)
+
+        print(f'{"project":<28} {"files":>5} {"source KB":>10} {"chunk KB":>9} {"source ms":>10} {"chunk ms":>9} {"speedup":>8}')
+        totals = [0, 0, 0, 0.0, 0.0]
+        for main_lua in sorted(glob.glob(os.path.join(args.examples, '*', 'main.lua'))):
+            project = os.path.dirname(main_lua)
+            sources = sorted(glob.glob(os.path.join(project, '**', '*.lua'), recursive=True))
+            chunks = []
+            for i, source in enumerate(sources):
+                chunk = os.path.join(tmp, f'chunk_{i}.luac')
+                compiled = subprocess.run([luac, '-s', '-o', chunk, source], capture_output=True, text=True)
+                if compiled.returncode != 0:
+                    print(f'Skipping {source}: {compiled.stderr.strip()}')
+                    break
+                chunks.append(chunk)
+            if len(chunks) != len(sources):
+                continue
+
+            source_kb = sum(os.path.getsize(path) for path in sources) / 1024
+            chunk_kb = sum(os.path.getsize(path) for path in chunks) / 1024
+            source_ms = time_load(harness, args.rounds, sources)
+            chunk_ms = time_load(harness, args.rounds, chunks)
+            print(f'{os.path.basename(project):<28} {len(sources):>5} {source_kb:>10.1f} {chunk_kb:>9.1f} '
+                  f'{source_ms:>10.3f} {chunk_ms:>9.3f} {source_ms / chunk_ms:>7.1f}x')
+            for idx, value in enumerate((len(sources), source_kb, chunk_kb, source_ms, chunk_ms)):
+                totals[idx] += value
+
+        if totals[4]:
+            print(f'{"total":<28} {totals[0]:>5} {totals[1]:>10.1f} {totals[2]:>9.1f} '
+                  f'{totals[3]:>10.3f} {totals[4]:>9.3f} {totals[3] / totals[4]:>7.1f}x')
+
+if __name__ == '__main__':
+    main()
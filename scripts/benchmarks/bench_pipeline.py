@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Benchmark the embedding pipeline end to end on synthetic build trees.
+Usage: python bench_pipeline.py [--files 10 1000 10000] [--sizes 1M 64M 1G] [--backend array|incbin|embed]
+                                [--compress] [--skip-compile] [--output results.json] [--baseline old.json]
+
+For every combination of file count and total size a build tree is generated
+from a fixed seed, so runs are reproducible: assets of mixed sizes and kinds
+(random data that does not compress next to JSON and text that does) plus one
+Lua module per asset, required from main.lua. For each tree it measures
+
+  - embed_assets.py and embed_lua.py wall time and peak RSS, cold (empty
+    cache) and warm (everything cached, nothing to rewrite)
+  - the same for embed_all.py writing both headers from one scan of the
+    tree, with the peak RSS of the driver process
+  - bytes of generated headers and data sources
+  - compile time and peak compiler RSS of every generated translation unit
+  - find_embedded_asset and embedded_lua_loader lookup latency, measured by
+    lookup_harness.c and lua_module_harness.c built against the generated
+    headers
+
+and writes the results as JSON, to compare runs over time with --baseline.
+Peak RSS comes from wait4() and is left out where that is not available.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, SCRIPTS_DIR)
+from embed_report import format_size, parse_size
+
+RESULTS_VERSION = 1
+CHUNK_SIZE = 1024 * 1024
+
+# Extension and whether its synthetic contents compress
+ASSET_KINDS = (('.png', False), ('.ogg', False), ('.bin', False), ('.json', True), ('.txt', True))
+
+def measure(cmd, cwd=None):
+    """Run cmd. Returns (seconds, peak RSS in bytes or None, stdout)."""
+    with tempfile.TemporaryFile() as out:
+        start = time.perf_counter()
+        process = subprocess.Popen(cmd, cwd=cwd, stdout=out, stderr=subprocess.STDOUT)
+        if hasattr(os, 'wait4'):
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+            peak = usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+        else:
+            process.wait()
+            peak = None
+        seconds = time.perf_counter() - start
+        out.seek(0)
+        output = out.read().decode('utf-8', errors='replace')
+    if process.returncode != 0:
+        raise RuntimeError(f'{os.path.basename(cmd[0])} failed:\n{output[-2000:]}')
+    return seconds, peak, output
+
+def split_sizes(rng, count, total):
+    """count file sizes adding up to total, a few large files and many small ones"""
+    weights = [rng.paretovariate(1.2) for _ in range(count)]
+    scale = total / sum(weights)
+    sizes = [max(1, int(weight * scale)) for weight in weights]
+    sizes[0] += total - sum(sizes)
+    if sizes[0] < 1:
+        sizes = [max(1, total // count)] * count
+    return sizes
+
+def write_synthetic(path, size, compressible, rng):
+    """Write size bytes of random or of repetitive, text-like data"""
+    with open(path, 'wb') as f:
+        left = size
+        while left > 0:
+            n = min(left, CHUNK_SIZE)
+            if compressible:
+                words = b' '.join(b'"key_%d": %d,' % (rng.randrange(64), rng.randrange(1000)) for _ in range(64))
+                f.write((words * (n // len(words) + 1))[:n])
+            else:
+                f.write(rng.randbytes(n))
+            left -= n
+
+def make_tree(root, count, total, seed):
+    """Generate a build tree. Returns (asset paths, Lua paths with main.lua first)."""
+    rng = random.Random(f'{seed}-{count}-{total}')
+    assets = []
+    for i, size in enumerate(split_sizes(rng, count, total)):
+        ext, compressible = ASSET_KINDS[i % len(ASSET_KINDS)]
+        folder = os.path.join(root, 'assets', f'group_{i % 32:02d}', f'set_{i % 5}')
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f'asset_{i:05d}{ext}')
+        write_synthetic(path, size, compressible, rng)
+        assets.append(path)
+
+    lua = [os.path.join(root, 'main.lua')]
+    for i in range(count):
+        folder = os.path.join(root, 'lib', f'group_{i % 32:02d}')
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f'module_{i:05d}.lua')
+        with open(path, 'w') as f:
+            f.write(f'local M = {{}}\n\nfunction M.update( dt )\n\treturn dt * {i}\nend\n\n')
+            f.write(''.join(f'M.value_{n} = {rng.randrange(10000)}\n' for n in range(20)))
+            f.write('\nreturn M\n')
+        lua.append(path)
+    with open(lua[0], 'w') as f:
+        f.write(''.join(f'local m{i} = require( "lib.group_{i % 32:02d}.module_{i:05d}" )\n'
+                        for i in range(min(count, 100))))
+        f.write('\nfunction RL.init()\nend\n')
+    return assets, lua
+
+def generated_files(header, backend):
+    """Generated header and data sources of one embed script run"""
+    base = os.path.splitext(header)[0]
+    files = [header]
+    if backend != 'array' and os.path.exists(base + '_data.c'):
+        files.append(base + '_data.c')
+    return files
+
+def run_embed(script, header, inputs, root, backend, extra):
+    """Embed cold and then warm. Returns the measurements and the generated files."""
+    cmd = [sys.executable, os.path.join(SCRIPTS_DIR, script), '--backend', backend] + extra + [header]
+    # Input lists of big trees can pass the command line limit, so they go relative to the tree
+    cmd += [os.path.relpath(path, root) for path in inputs]
+    cold, cold_rss, _ = measure(cmd, cwd=root)
+    warm, warm_rss, _ = measure(cmd, cwd=root)
+    files = generated_files(header, backend)
+    return {
+        'cold_seconds': round(cold, 4),
+        'warm_seconds': round(warm, 4),
+        'cold_peak_rss': cold_rss,
+        'warm_peak_rss': warm_rss,
+        'generated_bytes': sum(os.path.getsize(path) for path in files),
+    }, files
+
+def run_embed_all(root, backend, extra):
+    """embed_all.py writing the Lua and asset headers in one run, cold and then warm. Returns the measurements."""
+    lua_header = os.path.join(root, 'embedded_all_main.h')
+    asset_header = os.path.join(root, 'embedded_all_assets.h')
+    cmd = [sys.executable, os.path.join(SCRIPTS_DIR, 'embed_all.py'), '--exclude', 'obj', root,
+           'lua:', '--backend', backend, lua_header, 'assets:', '--backend', backend] + extra + [asset_header]
+    cold, cold_rss, _ = measure(cmd, cwd=root)
+    warm, warm_rss, _ = measure(cmd, cwd=root)
+    files = generated_files(lua_header, backend) + generated_files(asset_header, backend)
+    return {
+        'cold_seconds': round(cold, 4),
+        'warm_seconds': round(warm, 4),
+        'cold_peak_rss': cold_rss,
+        'warm_peak_rss': warm_rss,
+        'generated_bytes': sum(os.path.getsize(path) for path in files),
+    }
+
+def compile_units(cc, cflags, units, include_dir, tmp):
+    """Compile every translation unit to an object. Returns (measurements, object paths)."""
+    total = 0.0
+    peak = None
+    objects = []
+    for unit in units:
+        obj = os.path.join(tmp, os.path.basename(unit) + '.o')
+        seconds, rss, _ = measure([cc] + cflags + ['-std=c11', f'-I{include_dir}', '-c', unit, '-o', obj])
+        total += seconds
+        if rss is not None:
+            peak = max(peak or 0, rss)
+        objects.append(obj)
+    return {'seconds': round(total, 4), 'peak_rss': peak, 'units': len(units)}, objects
+
+def run_harness(cc, cflags, harness, objects, args, tmp):
+    """Link a harness and run it. Returns {label: ns per lookup}."""
+    exe = os.path.join(tmp, os.path.splitext(os.path.basename(harness))[0])
+    subprocess.run([cc] + cflags + objects + ['-o', exe], check=True)
+    _, _, output = measure([exe] + args)
+    return {label: float(ns) for label, ns in re.findall(r'^(\w+)\s+([\d.]+) ns/lookup', output, re.M)}
+
+def bench_tree(args, count, total, tmp):
+    """All measurements for one generated tree"""
+    root = os.path.join(tmp, f'tree_{count}_{total}')
+    started = time.perf_counter()
+    assets, lua = make_tree(root, count, total, args.seed)
+    result = {
+        'files': count,
+        'total_bytes': total,
+        'backend': args.backend,
+        'compress': args.compress,
+        'generate_seconds': round(time.perf_counter() - started, 4),
+    }
+
+    asset_header = os.path.join(root, 'embedded_assets.h')
+    lua_header = os.path.join(root, 'embedded_main.h')
+    extra = ['--compress'] if args.compress else []
+    result['embed_assets'], asset_files = run_embed('embed_assets.py', asset_header, assets, root, args.backend, extra)
+    result['embed_lua'], lua_files = run_embed('embed_lua.py', lua_header, lua, root, args.backend, [])
+    result['embed_all'] = run_embed_all(root, args.backend, extra)
+    if args.skip_compile:
+        return result
+
+    # The harness includes the header, so compiling it compiles what the header generates
+    cflags = args.cflags.split()
+    objs = os.path.join(root, 'obj')
+    os.makedirs(objs, exist_ok=True)
+    asset_units = [os.path.join(BENCH_DIR, 'lookup_harness.c')] + asset_files[1:]
+    lua_units = [os.path.join(BENCH_DIR, 'lua_module_harness.c')] + lua_files[1:]
+    result['compile_assets'], asset_objects = compile_units(args.cc, cflags, asset_units, root, objs)
+    result['compile_lua'], lua_objects = compile_units(args.cc, cflags, lua_units, root, objs)
+    result['asset_lookup_ns'] = run_harness(args.cc, cflags, 'lookup_harness.c', asset_objects,
+                                            [str(args.rounds), 'sorted', 'hashed'], objs)
+    result['lua_lookup_ns'] = run_harness(args.cc, cflags, 'lua_module_harness.c', lua_objects,
+                                          [str(args.rounds)], objs)
+    return result
+
+def compiler_version(cc):
+    """First line of cc --version, or None"""
+    try:
+        output = subprocess.run([cc, '--version'], capture_output=True, text=True).stdout
+    except OSError:
+        return None
+    return output.splitlines()[0] if output else None
+
+def print_result(result):
+    """One summary line per tree"""
+    assets = result['embed_assets']
+    line = (f'{result["files"]:>6} files {format_size(result["total_bytes"]):>10}: '
+            f'embed_assets {assets["cold_seconds"]:.2f}/{assets["warm_seconds"]:.2f} s, '
+            f'embed_lua {result["embed_lua"]["cold_seconds"]:.2f} s, '
+            f'embed_all {result["embed_all"]["cold_seconds"]:.2f}/{result["embed_all"]["warm_seconds"]:.2f} s, '
+            f'generated {format_size(assets["generated_bytes"])}')
+    if assets['cold_peak_rss']:
+        line += f', peak RSS {format_size(assets["cold_peak_rss"])}'
+    if 'compile_assets' in result:
+        line += (f', compile {result["compile_assets"]["seconds"] + result["compile_lua"]["seconds"]:.2f} s'
+                 f', lookup {result["asset_lookup_ns"].get("hashed", 0):.0f} ns'
+                 f' / require {result["lua_lookup_ns"].get("hit", 0):.0f} ns')
+    print(line)
+
+def compare(results, baseline):
+    """Print how the wall times changed against an earlier results file"""
+    def key(run):
+        return run['files'], run['total_bytes'], run['backend'], run['compress']
+
+    before = {key(run): run for run in baseline['runs']}
+    matched = [run for run in results['runs'] if key(run) in before]
+    if not matched:
+        print('No run matches the baseline in file count, size, backend and compression')
+    for run in matched:
+        old = before[key(run)]
+        changes = []
+        for section, field in (('embed_assets', 'cold_seconds'), ('embed_assets', 'warm_seconds'),
+                               ('embed_lua', 'cold_seconds'), ('embed_all', 'cold_seconds'),
+                               ('embed_all', 'warm_seconds'), ('compile_assets', 'seconds')):
+            if section in run and section in old and old[section][field]:
+                changes.append(f'{section}.{field} {run[section][field] / old[section][field]:.2f}x')
+        print(f'{run["files"]:>6} files {format_size(run["total_bytes"]):>10}: ' + ', '.join(changes))
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the embed scripts and embedded lookups on synthetic trees')
+    parser.add_argument('--files', type=int, nargs='+', default=[10, 1000, 10000],
+                        help='asset (and Lua module) counts to generate (default: 10 1000 10000)')
+    parser.add_argument('--sizes', type=parse_size, nargs='+', default=[parse_size('1M'), parse_size('64M')],
+                        help='total asset sizes, e.g. 1M 64M 1G (default: 1M 64M)')
+    parser.add_argument('--backend', choices=('array', 'incbin', 'embed'), default='array',
+                        help='embed backend to measure (default: array)')
+    parser.add_argument('--compress', action='store_true', help='embed assets with --compress')
+    parser.add_argument('--skip-compile', action='store_true', help='only measure the embed scripts')
+    parser.add_argument('--cc', default=os.environ.get('CC', 'cc'), help='C compiler (default: $CC or cc)')
+    parser.add_argument('--cflags', default='-O2', help='flags for compiling generated sources (default: -O2)')
+    parser.add_argument('--rounds', type=int, default=3, help='lookup rounds over all names (default: 3)')
+    parser.add_argument('--seed', type=int, default=1, help='seed of the generated trees (default: 1)')
+    parser.add_argument('--output', default='bench_pipeline.json', help='results file (default: bench_pipeline.json)')
+    parser.add_argument('--baseline', help='earlier results file to compare against')
+    parser.add_argument('--tmp', help='folder for the generated trees (default: a temporary folder)')
+    args = parser.parse_args()
+
+    results = {
+        'version': RESULTS_VERSION,
+        'created': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'cc': None if args.skip_compile else compiler_version(args.cc),
+        'settings': {'backend': args.backend, 'compress': args.compress, 'cflags': args.cflags,
+                     'rounds': args.rounds, 'seed': args.seed},
+        'runs': [],
+    }
+    with tempfile.TemporaryDirectory(dir=args.tmp) as tmp:
+        for count in args.files:
+            for total in args.sizes:
+                try:
+                    result = bench_tree(args, count, total, tmp)
+                except (RuntimeError, subprocess.CalledProcessError) as e:
+                    print(f'Error: {count} files, {format_size(total)}: {e}')
+                    sys.exit(1)
+                finally:
+                    # Trees of a gigabyte add up, keep only one on disk at a time
+                    shutil.rmtree(os.path.join(tmp, f'tree_{count}_{total}'), ignore_errors=True)
+                print_result(result)
+                results['runs'].append(result)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+        f.write('\n')
+    print(f'Wrote {args.output}')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(results, json.load(f))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+/*
+Lookup microbenchmark for a generated embedded_assets.h.
+Build: cc -O2 -I<dir with embedded_assets.h> lookup_harness.c -o lookup_harness
+Run:   lookup_harness [rounds] [linear|sorted|hashed ...]   (all three by default)
+
+find_hashed mirrors find_embedded_asset in src/lua_core.c.
+*/
+#include <stdbool.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+
+#include "embedded_assets.h"
+
+static unsigned int embedded_name_hash( const char* name ) {
+	unsigned int hash = 2166136261u;
+
+	for ( const unsigned char* p = (const unsigned char*)name; *p; p++ ) {
+		hash ^= *p;
+		hash *= 16777619u;
+	}
+	return hash;
+}
+
+static const EmbeddedAsset* find_linear( const char* name ) {
+	for ( int i = 0; i < embedded_asset_count; i++ ) {
+		if ( strcmp( embedded_assets[i].name, name ) == 0 ) {
+			return &embedded_assets[i];
+		}
+	}
+	return NULL;
+}
+
+static const EmbeddedAsset* find_sorted( const char* name ) {
+	int low = 0;
+	int high = embedded_asset_count - 1;
+
+	while ( low <= high ) {
+		int mid = low + ( high - low ) / 2;
+		int cmp = strcmp( embedded_assets[ mid ].name, name );
+
+		if ( cmp == 0 ) {
+			return &embedded_assets[ mid ];
+		}
+		else if ( cmp < 0 ) {
+			low = mid + 1;
+		}
+		else {
+			high = mid - 1;
+		}
+	}
+	return NULL;
+}
+
+static const EmbeddedAsset* find_hashed( const char* name ) {
+	unsigned int hash = embedded_name_hash( name );
+	unsigned int mask = EMBEDDED_ASSET_SLOT_COUNT - 1;
+
+	for ( unsigned int slot = hash & mask; embedded_asset_slots[ slot ] != -1; slot = ( slot + 1 ) & mask ) {
+		int i = embedded_asset_slots[ slot ];
+
+		if ( embedded_asset_hashes[i] == hash && strcmp( embedded_assets[i].name, name ) == 0 ) {
+			return &embedded_assets[i];
+		}
+	}
+	return NULL;
+}
+
+static double now_seconds( void ) {
+	struct timespec ts;
+	timespec_get( &ts, TIME_UTC );
+	return ts.tv_sec + ts.tv_nsec * 1e-9;
+}
+
+/* Looks up every name (hits) plus the same names with a suffix (misses). Returns ns per lookup. */
+static double bench( const char* label, const EmbeddedAsset* ( *find )( const char* ), char** misses, int rounds ) {
+	int found = 0;
+	double start = now_seconds();
+
+	for ( int r = 0; r < rounds; r++ ) {
+		for ( int i = 0; i < embedded_asset_count; i++ ) {
+			found += find( embedded_assets[i].name ) != NULL;
+			found += find( misses[i] ) != NULL;
+		}
+	}
+	double elapsed = now_seconds() - start;
+	double ns = elapsed * 1e9 / ( (double)rounds * embedded_asset_count * 2 );
+
+	if ( found != rounds * embedded_asset_count ) {
+		printf( "%s: wrong result count %d\n", label, found );
+		exit( 1 );
+	}
+	printf( "%-8s %10.1f ns/lookup\n", label, ns );
+	return ns;
+}
+
+int main( int argc, char** argv ) {
+	int rounds = 1 < argc ? atoi( argv[1] ) : 3;
+	char** misses = malloc( sizeof( char* ) * ( embedded_asset_count + 1 ) );
+
+	for ( int i = 0; i < embedded_asset_count; i++ ) {
+		size_t len = strlen( embedded_assets[i].name );
+		misses[i] = malloc( len + 2 );
+		memcpy( misses[i], embedded_assets[i].name, len );
+		misses[i][ len ] = '~';
+		misses[i][ len + 1 ] = '\0';
+	}
+	printf( "%d assets, %d rounds, hits and misses\n", embedded_asset_count, rounds );
+
+	/* The linear scan is quadratic over all names, large tables may only want the hash index */
+	const char* methods[] = { "linear", "sorted", "hashed" };
+	const EmbeddedAsset* ( *finds[] )( const char* ) = { find_linear, find_sorted, find_hashed };
+
+	for ( int m = 0; m < 3; m++ ) {
+		bool selected = argc <= 2;
+
+		for ( int a = 2; a < argc; a++ ) {
+			selected = selected || strcmp( argv[a], methods[m] ) == 0;
+		}
+		if ( selected ) {
+			bench( methods[m], finds[m], misses, rounds );
+		}
+	}
+
+	return 0;
+}
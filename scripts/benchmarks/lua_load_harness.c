@@ -0,0 +1,85 @@
+/*
+Lua chunk load benchmark, used by bench_lua_startup.py.
+Build: cc -O2 -I<lua src> lua_load_harness.c <lua core sources> -o lua_load_harness -lm
+Run:   lua_load_harness rounds file1 [file2 ...]
+
+Loads every file with luaL_loadbuffer, the call embedded_lua_loader makes, in
+a fresh lua_State per round. Prints the mean microseconds to load all files.
+Source and bytecode chunks are both accepted.
+*/
+#include <stdio.h>
+#include <stdlib.h>
+#include <time.h>
+
+#include "lua.h"
+#include "lauxlib.h"
+
+typedef struct {
+	const char* name;
+	char* data;
+	size_t size;
+} Chunk;
+
+static double now_seconds( void ) {
+	struct timespec ts;
+	timespec_get( &ts, TIME_UTC );
+	return ts.tv_sec + ts.tv_nsec * 1e-9;
+}
+
+static char* read_file( const char* path, size_t* size ) {
+	FILE* file = fopen( path, "rb" );
+
+	if ( file == NULL ) {
+		return NULL;
+	}
+	fseek( file, 0, SEEK_END );
+	*size = ftell( file );
+	fseek( file, 0, SEEK_SET );
+	char* data = malloc( *size + 1 );
+
+	if ( fread( data, 1, *size, file ) != *size ) {
+		free( data );
+		data = NULL;
+	}
+	fclose( file );
+	return data;
+}
+
+int main( int argc, char** argv ) {
+	if ( argc < 3 ) {
+		fprintf( stderr, "Usage: %s rounds file1 [file2 ...]\n", argv[0] );
+		return 1;
+	}
+	int rounds = atoi( argv[1] );
+	int count = argc - 2;
+	Chunk* chunks = malloc( sizeof( Chunk ) * count );
+
+	for ( int i = 0; i < count; i++ ) {
+		chunks[i].name = argv[ i + 2 ];
+		chunks[i].data = read_file( chunks[i].name, &chunks[i].size );
+
+		if ( chunks[i].data == NULL ) {
+			fprintf( stderr, "Cannot read %s\n", chunks[i].name );
+			return 1;
+		}
+	}
+	double start = now_seconds();
+
+	for ( int r = 0; r < rounds; r++ ) {
+		lua_State* L = luaL_newstate();
+
+		for ( int i = 0; i < count; i++ ) {
+			if ( luaL_loadbuffer( L, chunks[i].data, chunks[i].size, chunks[i].name ) != 0 ) {
+				fprintf( stderr, "%s\n", lua_tostring( L, -1 ) );
+				return 1;
+			}
+			lua_pop( L, 1 );
+		}
+		lua_close( L );
+	}
+	double elapsed = now_seconds() - start;
+
+	printf( "%.3f\n", elapsed * 1e6 / rounds );
+
+	return 0;
+}
@@ -0,0 +1,118 @@
+/*
+require() lookup microbenchmark for a generated embedded_main.h, used by bench_pipeline.py.
+Build: cc -O2 -I<dir with embedded_main.h> lua_module_harness.c [embedded_main_data.c] -o lua_module_harness
+Run:   lua_module_harness [rounds]
+
+find_module and find_converted mirror find_embedded_lua_module and the name
+handling of embedded_lua_loader in src/lua_core.c. Only the lookup is timed,
+not luaL_loadbuffer.
+*/
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+
+#include "embedded_main.h"
+
+#define MODULE_COUNT (int)( sizeof( embedded_lua_modules ) / sizeof( embedded_lua_modules[0] ) )
+
+static unsigned int embedded_name_hash( const char* name ) {
+	unsigned int hash = 2166136261u;
+
+	for ( const unsigned char* p = (const unsigned char*)name; *p; p++ ) {
+		hash ^= *p;
+		hash *= 16777619u;
+	}
+	return hash;
+}
+
+static int find_module( const char* name ) {
+	unsigned int hash = embedded_name_hash( name );
+	unsigned int mask = EMBEDDED_LUA_MODULE_SLOT_COUNT - 1;
+
+	for ( unsigned int slot = hash & mask; embedded_lua_module_slots[ slot ] != -1; slot = ( slot + 1 ) & mask ) {
+		int i = embedded_lua_module_slots[ slot ];
+
+		if ( embedded_lua_module_hashes[i] == hash && strcmp( embedded_lua_modules[i].name, name ) == 0 ) {
+			return embedded_lua_modules[i].file;
+		}
+	}
+	return -1;
+}
+
+/* Names mixing dots and slashes miss the index and are retried with dots converted, like the loader does. */
+static int find_converted( const char* name ) {
+	int index = find_module( name );
+
+	if ( index == -1 && strchr( name, '.' ) != NULL ) {
+		char converted_name[512];
+		strncpy( converted_name, name, sizeof(converted_name) - 1 );
+		converted_name[sizeof(converted_name) - 1] = '\0';
+		for ( char* p = converted_name; *p; p++ ) {
+			if ( *p == '.' ) *p = '/';
+		}
+		index = find_module( converted_name );
+	}
+	return index;
+}
+
+static double now_seconds( void ) {
+	struct timespec ts;
+	timespec_get( &ts, TIME_UTC );
+	return ts.tv_sec + ts.tv_nsec * 1e-9;
+}
+
+/* Looks up every name in names. Prints and returns ns per lookup. */
+static double bench( const char* label, int ( *find )( const char* ), char** names, int count, int expected, int rounds ) {
+	int found = 0;
+	double start = now_seconds();
+
+	for ( int r = 0; r < rounds; r++ ) {
+		for ( int i = 0; i < count; i++ ) {
+			found += find( names[i] ) != -1;
+		}
+	}
+	double elapsed = now_seconds() - start;
+	double ns = elapsed * 1e9 / ( (double)rounds * count );
+
+	if ( found != rounds * expected ) {
+		printf( "%s: wrong result count %d\n", label, found );
+		exit( 1 );
+	}
+	printf( "%-8s %10.1f ns/lookup\n", label, ns );
+	return ns;
+}
+
+int main( int argc, char** argv ) {
+	int rounds = 1 < argc ? atoi( argv[1] ) : 3;
+	char** hits = malloc( sizeof( char* ) * ( MODULE_COUNT + 1 ) );
+	char** misses = malloc( sizeof( char* ) * ( MODULE_COUNT + 1 ) );
+	int mixed_count = 0;
+	char** mixed = malloc( sizeof( char* ) * ( MODULE_COUNT + 1 ) );
+
+	for ( int i = 0; i < MODULE_COUNT; i++ ) {
+		const char* name = embedded_lua_modules[i].name;
+		size_t len = strlen( name );
+		hits[i] = (char*)name;
+		misses[i] = malloc( len + 2 );
+		memcpy( misses[i], name, len );
+		misses[i][ len ] = '~';
+		misses[i][ len + 1 ] = '\0';
+
+		/* "lib/sub/mod" becomes "lib/sub.mod", a name only the converted retry finds */
+		char* last = strrchr( name, '/' );
+		if ( last != NULL && strchr( name, '.' ) == NULL ) {
+			mixed[ mixed_count ] = malloc( len + 1 );
+			memcpy( mixed[ mixed_count ], name, len + 1 );
+			mixed[ mixed_count ][ last - name ] = '.';
+			mixed_count++;
+		}
+	}
+	printf( "%d module names, %d lua files, %d rounds\n", MODULE_COUNT, embedded_lua_file_count, rounds );
+	bench( "hit", find_converted, hits, MODULE_COUNT, MODULE_COUNT, rounds );
+	bench( "miss", find_converted, misses, MODULE_COUNT, 0, rounds );
+	if ( 0 < mixed_count ) {
+		bench( "mixed", find_converted, mixed, mixed_count, mixed_count, rounds );
+	}
+	return 0;
+}
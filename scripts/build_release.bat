@@ -33,7 +33,7 @@ echo.
 
 REM Clean old embedded files
 echo Ready for fresh build...
-del /Q embedded_main.h embedded_assets.h 2>nul
+del /Q embedded_main.h embedded_assets.h embedded_*_data.c 2>nul
 
 REM Auto-copy from game folder if it exists
 echo.
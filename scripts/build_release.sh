@@ -76,7 +76,7 @@ echo ""
 
 # Clean old embedded files
 echo "Ready for fresh build..."
-rm -f embedded_main.h embedded_assets.h 2>/dev/null
+rm -f embedded_main.h embedded_assets.h embedded_*_data.c 2>/dev/null
 
 # Auto-copy from game folder if it exists
 echo ""
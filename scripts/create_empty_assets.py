@@ -3,22 +3,31 @@
 Create an empty embedded_assets.h file for compatibility.
 Usage: python create_empty_assets.py <output.h>
 """
-import sys
+import argparse
 
-if __name__ == '__main__':
-    if len(sys.argv) < 2:
-        print('Usage: python create_empty_assets.py <output.h>')
-        sys.exit(1)
-    
-    output_file = sys.argv[1]
+from embed_common import EMBEDDED_ASSET_STRUCT, open_output, write_hash_index, write_load_plan
+
+def build_parser():
+    """Command line options of the script, also read by embed_all.py"""
+    parser = argparse.ArgumentParser(description='Creates an embedded_assets.h without assets.')
+    parser.add_argument('output', help='generated header (.h)')
+    return parser
+
+def main(argv=None):
+    output_file = build_parser().parse_args(argv).output
     
-    with open(output_file, 'w') as f:
+    with open_output(output_file) as f:
         f.write('#ifndef EMBEDDED_ASSETS_H\n')
         f.write('#define EMBEDDED_ASSETS_H\n')
         f.write('/* No assets to embed */\n')
-        f.write('typedef struct { const char* name; const unsigned char* data; unsigned int size; } EmbeddedAsset;\n')
+        f.write(EMBEDDED_ASSET_STRUCT)
         f.write('static const EmbeddedAsset embedded_assets[] = {};\n')
         f.write('static const int embedded_asset_count = 0;\n')
+        write_hash_index(f, 'embedded_asset', [])
+        write_load_plan(f, [])
         f.write('#endif\n')
     
     print(f'Created empty {output_file}')
+
+if __name__ == '__main__':
+    main()
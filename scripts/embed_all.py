@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Write every generated embed header in one run: splash logos, default font, Lua files and assets.
+Usage: python embed_all.py [--include PATTERN] [--exclude PATTERN] [--jobs N]
+                           [--stamp FILE] [--depfile FILE [--depfile-outputs]] <root>
+                           [logo: <embed_logo.py arguments>] [font: <embed_font.py arguments>]
+                           [lua: <embed_lua.py arguments>] [assets: <embed_assets.py arguments>]
+                           [empty-assets: <create_empty_assets.py arguments>]
+       python embed_all.py --list [--include PATTERN] [--exclude PATTERN] <root>
+
+<root>, the build directory, is walked once. Files matching an --include
+pattern (default: all of them) and no --exclude pattern are sorted into Lua
+files (*.lua) and assets (everything else). Patterns are fnmatch patterns,
+matched against the file or folder name when they have no '/' in them and
+against the path below <root> otherwise, and excluded folders are not
+entered. Build system files and the outputs of the embed scripts are always
+left out, see DEFAULT_EXCLUDES.
+
+Each section takes the arguments of its script. The Lua files found are added
+to the lua: section and the assets to the assets: section, and an assets:
+section with --shake also gets the Lua files as --lua. Both sections get
+<root> as --root unless they give one, so files are named the way the game
+loads them whatever the build directory is called. An assets: section with no
+assets to embed writes an empty header instead.
+
+Inputs the script caches have not seen yet are hashed, and encoded or
+compressed the way the scripts will ask for them, by a pool of --jobs
+processes. Then the sections run side by side in the same pool and find that
+work done. Their output is printed section by section once all are finished.
+
+The headers keep their timestamp when their content does not change, so a
+build system should track the run by --stamp, a file touched after every
+successful run. --depfile writes a Makefile style dependency file for it (or
+for the first header without --stamp) listing every input, the scripts and
+the scanned folders, so the build runs the driver again when an input changes
+or a file is added. --depfile-outputs lists the generated files as well, for
+make to run the driver again when one is deleted; Ninja does that by itself.
+--list only prints what the scan finds, a "lua <path>" or "asset <path>" line
+per file, for CMake to decide at configure time which headers to generate.
+"""
+import argparse
+import concurrent.futures
+import contextlib
+import fnmatch
+import glob
+import importlib
+import io
+import os
+import re
+import sys
+import time
+
+from embed_common import EmbedCache, blob_dir_path, data_source_path, file_digest
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Build system files and embed script outputs, never embedded
+DEFAULT_EXCLUDES = (
+    'CMakeFiles', 'CMakeCache*', '*.cmake', 'Makefile', '*.ninja', '.ninja_*',
+    '*.a', '*.o', '*.pak', '*.exe', 'ReiLua', 'luac_host',
+    'embedded_*.h', 'embedded_*_data.c', 'embedded_*_report.json', 'embedded_*_report.html',
+    'embedded_*_data', 'embedded_*_blobs', 'embedded_*_cache',
+)
+
+# Script module run by each section
+SECTIONS = {
+    'logo': 'embed_logo',
+    'font': 'embed_font',
+    'lua': 'embed_lua',
+    'assets': 'embed_assets',
+    'empty-assets': 'create_empty_assets',
+}
+
+def compile_patterns(patterns):
+    """Matcher for fnmatch patterns, which match the name of a path, or the path itself when they have a '/'"""
+    patterns = [pattern.rstrip('/') for pattern in patterns]
+    def regex(selected):
+        return re.compile('|'.join(fnmatch.translate(pattern) for pattern in selected) or '(?!)')
+    by_name = regex([pattern for pattern in patterns if '/' not in pattern])
+    by_path = regex([pattern for pattern in patterns if '/' in pattern])
+    return lambda path: bool(by_name.match(path.rsplit('/', 1)[-1]) or by_path.match(path))
+
+def scan(root, includes=('*',), excludes=()):
+    """Walk root once. Returns (included files, folders entered), both sorted full paths."""
+    included = compile_patterns(includes)
+    excluded = compile_patterns(DEFAULT_EXCLUDES + tuple(excludes))
+    files = []
+    folders = []
+    pending = ['']
+    while pending:
+        relative = pending.pop()
+        folder = os.path.join(root, relative) if relative else root
+        folders.append(folder)
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                path = f'{relative}/{entry.name}' if relative else entry.name
+                if excluded(path):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(path)
+                elif entry.is_file() and included(path):
+                    files.append(os.path.join(root, path))
+    # Same order as a CMake glob, embed_lua.py keeps the order it is given
+    return sorted(files), sorted(folders)
+
+def classify(files):
+    """Split scanned files into (Lua files, assets)"""
+    lua = [path for path in files if path.endswith('.lua')]
+    assets = [path for path in files if not path.endswith('.lua')]
+    return lua, assets
+
+def split_sections(argv):
+    """Split the command line at the section names. Returns (driver arguments, [(section, arguments)])."""
+    driver = []
+    sections = []
+    for arg in argv:
+        if arg.endswith(':') and arg[:-1] in SECTIONS:
+            sections.append((arg[:-1], []))
+        elif sections:
+            sections[-1][1].append(arg)
+        else:
+            driver.append(arg)
+    return driver, sections
+
+def with_root(section, root):
+    """Section arguments naming files relative to root, unless they give their own --root"""
+    if any(arg == '--root' or arg.startswith('--root=') for arg in section):
+        return section
+    return section + ['--root', root]
+
+def section_files(name, args):
+    """Files a section reads besides the scanned ones, for the depfile"""
+    if name == 'logo':
+        return [args.raylib_logo, args.reilua_logo]
+    if name == 'font':
+        return [args.font]
+    if name == 'lua':
+        luac = importlib.import_module('embed_lua').find_luac(args.luac)
+        return [luac] if luac else []
+    if name == 'assets':
+        return list(args.transform_plugin)
+    return []
+
+def section_outputs(name, args):
+    """Files a section writes"""
+    if name == 'assets':
+        outputs = importlib.import_module('embed_assets').generated_sources(args.output, args.backend, args.shards)
+        outputs += [path for path in (args.report, args.plan) if path]
+    elif name == 'empty-assets':
+        outputs = [args.output]
+    else:
+        outputs = [args.output]
+        if args.backend != 'array':
+            outputs.append(data_source_path(args.output))
+        if name == 'lua' and args.report:
+            outputs.append(args.report)
+    return outputs
+
+def balanced_chunks(items, sizes, count):
+    """Spread items over at most count lists of similar total size, largest first into the lightest"""
+    chunks = [[] for _ in range(max(1, min(count, len(items))))]
+    totals = [0] * len(chunks)
+    for item, size in sorted(zip(items, sizes), key=lambda pair: -pair[1]):
+        lightest = totals.index(min(totals))
+        chunks[lightest].append(item)
+        totals[lightest] += size
+    return [chunk for chunk in chunks if chunk]
+
+def _digest_files(paths):
+    """Worker: manifest entries of files, as EmbedCache.digest records them"""
+    entries = {}
+    for path in paths:
+        stat = os.stat(path)
+        entries[os.path.abspath(path)] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                                          'sha256': file_digest(path)}
+    return entries
+
+def _encode_files(output_file, paths, backend, compress_ratio, luac):
+    """Worker: compile, compress and encode files into the cache of output_file the way
+    embed_lua.py and embed_assets.py do it. Returns the manifest entries it added."""
+    cache = EmbedCache(output_file)
+    used_blobs = set()
+    # The scripts print the same warnings when they get to the file
+    with contextlib.redirect_stdout(io.StringIO()):
+        for path in paths:
+            data_file = path
+            if luac:
+                data_file = importlib.import_module('embed_lua').compile_chunk(path, luac, cache) or path
+            elif compress_ratio is not None:
+                data_file, _ = importlib.import_module('embed_assets').prepare_asset(
+                    path, cache, blob_dir_path(output_file), compress_ratio, used_blobs)
+            if backend == 'array':
+                cache.rows_path(data_file)
+    return cache.current
+
+def _run_section(name, argv):
+    """Worker: run a section's script. Returns (exit code, printed output)."""
+    output = io.StringIO()
+    code = 0
+    with contextlib.redirect_stdout(output):
+        try:
+            importlib.import_module(SECTIONS[name]).main(argv)
+        except SystemExit as e:
+            code = e.code if isinstance(e.code, int) else int(e.code is not None)
+    return code, output.getvalue()
+
+def run_jobs(pool, function, jobs):
+    """Results of function(*job) for every job, in order, in the pool when there is one"""
+    if pool is None:
+        return [function(*job) for job in jobs]
+    futures = [pool.submit(function, *job) for job in jobs]
+    return [future.result() for future in futures]
+
+def warm_caches(pool, sections, chunk_count):
+    """Hash, then encode, the inputs of the lua: and assets: sections their caches do not have yet.
+
+    Files with the same content are encoded once, so no two workers write the
+    same cache file. Returns (files hashed, files encoded).
+    """
+    plans = []
+    for name, args in sections:
+        if name == 'lua':
+            luac = importlib.import_module('embed_lua').find_luac(args.luac)
+            plans.append((args.output, args.files, [luac] if luac else [], args.backend, None, luac))
+        elif name == 'assets':
+            # Transforms decide what gets embedded, only the hashes of their inputs are known up front
+            encode = not args.transform
+            compress_ratio = args.compress_ratio if args.compress and encode else None
+            plans.append((args.output, args.assets, [], args.backend if encode else None, compress_ratio, None))
+
+    caches = {output: EmbedCache(output) for output, *_ in plans}
+    stale = {output: [path for path in paths + tools if not caches[output].is_known(path)]
+             for output, paths, tools, *_ in plans}
+    jobs = [(output, chunk) for output, paths in stale.items()
+            for chunk in balanced_chunks(paths, [os.path.getsize(path) for path in paths], chunk_count)]
+    for (output, _), entries in zip(jobs, run_jobs(pool, _digest_files, [(chunk,) for _, chunk in jobs])):
+        caches[output].remember(entries)
+    # The encode workers read the hashes from the saved manifests
+    for output, cache in caches.items():
+        if stale[output]:
+            cache.save(prune=False)
+
+    jobs = []
+    for output, paths, _, backend, compress_ratio, luac in plans:
+        if not (backend == 'array' or compress_ratio is not None or luac):
+            continue
+        cache = caches[output]
+        new = set(stale[output])
+        todo = {}
+        for path in paths:
+            digest = cache.digest(path)
+            if path in new or (backend == 'array' and compress_ratio is None and not luac
+                               and not os.path.exists(os.path.join(cache.dir, digest + '.rows'))):
+                todo.setdefault(digest, path)
+        paths = list(todo.values())
+        jobs += [(output, chunk, backend, compress_ratio, luac)
+                 for chunk in balanced_chunks(paths, [os.path.getsize(path) for path in paths], chunk_count)]
+    for job, entries in zip(jobs, run_jobs(pool, _encode_files, jobs)):
+        cache = EmbedCache(job[0])
+        cache.remember(entries)
+        cache.save(prune=False)
+    return sum(len(paths) for paths in stale.values()), sum(len(job[1]) for job in jobs)
+
+def depfile_path(path):
+    """Path escaped for a Makefile style dependency file"""
+    return path.replace('\\', '/').replace('$', '$$').replace('#', '\\#').replace(' ', '\\ ')
+
+def write_depfile(path, target, dependencies):
+    """Write a dependency file making target depend on dependencies"""
+    from embed_common import open_output
+    with open_output(path) as out:
+        out.write(f'{depfile_path(os.path.abspath(target))}:')
+        for dependency in sorted(set(os.path.abspath(dep) for dep in dependencies)):
+            out.write(f' \\\n  {depfile_path(dependency)}')
+        out.write('\n')
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description='Writes all generated embed headers in one run from a single scan of the build directory.',
+        epilog='Sections: logo:, font:, lua:, assets: and empty-assets:, each followed by the arguments '
+               'of its script without the scanned input files.')
+    parser.add_argument('root', help='directory to scan, the build directory')
+    parser.add_argument('--include', action='append', default=[], metavar='PATTERN',
+                        help='only embed files matching a pattern (repeatable, default: all files)')
+    parser.add_argument('--exclude', action='append', default=[], metavar='PATTERN',
+                        help='leave out files and folders matching a pattern (repeatable)')
+    parser.add_argument('--jobs', type=int, default=None,
+                        help='worker processes, 1 runs everything in this process (default: one per CPU)')
+    parser.add_argument('--stamp', metavar='FILE', help='touch this file after a successful run')
+    parser.add_argument('--depfile', metavar='FILE', help='write a Makefile style dependency file')
+    parser.add_argument('--depfile-outputs', action='store_true',
+                        help='also list the generated files in the dependency file')
+    parser.add_argument('--list', action='store_true', help='print the scanned Lua files and assets and exit')
+    return parser
+
+def main(argv=None):
+    driver_argv, section_argv = split_sections(sys.argv[1:] if argv is None else argv)
+    args = build_parser().parse_args(driver_argv)
+
+    started = time.perf_counter()
+    files, folders = [], []
+    # Logos and the font are given by path, only Lua files and assets are looked for
+    if args.list or any(name in ('lua', 'assets') for name, _ in section_argv):
+        files, folders = scan(args.root, args.include or ['*'], args.exclude)
+    lua_files, asset_files = classify(files)
+    scanned = time.perf_counter() - started
+    if args.list:
+        for path in lua_files:
+            print(f'lua {path}')
+        for path in asset_files:
+            print(f'asset {path}')
+        return
+
+    sections = []
+    inputs = set()
+    for name, section in section_argv:
+        if name == 'lua':
+            if not lua_files:
+                print('Warning: no Lua files found, skipping lua:')
+                continue
+            section = with_root(section, args.root) + lua_files
+            inputs.update(lua_files)
+        elif name == 'assets':
+            if not asset_files:
+                print('No assets found, writing an empty asset header')
+                name = 'empty-assets'
+                section = [build_parser_of('assets').parse_args(section + ['-']).output]
+            else:
+                section = with_root(section, args.root) + asset_files
+                inputs.update(asset_files)
+                parsed = build_parser_of(name).parse_args(section)
+                if parsed.shake and not parsed.lua and lua_files:
+                    section += ['--lua'] + lua_files
+                    inputs.update(lua_files)
+        sections.append((name, section, build_parser_of(name).parse_args(section)))
+
+    workers = args.jobs or os.cpu_count() or 1
+    pool = concurrent.futures.ProcessPoolExecutor(max_workers=workers) if workers > 1 and sections else None
+    try:
+        hashed, encoded = warm_caches(pool, [(name, parsed) for name, _, parsed in sections], workers * 4)
+        results = run_jobs(pool, _run_section, [(name, section) for name, section, _ in sections])
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    code = 0
+    outputs = []
+    dependencies = sorted(inputs) + glob.glob(os.path.join(SCRIPTS_DIR, '*.py'))
+    for (name, _, parsed), (section_code, output) in zip(sections, results):
+        sys.stdout.write(output)
+        code = code or section_code
+        outputs += section_outputs(name, parsed)
+        dependencies += section_files(name, parsed)
+    # Folders the headers are written to also get the build system's own files, watching
+    # them would run the driver every build. New files there need CMake to be run again.
+    output_folders = {os.path.abspath(os.path.dirname(path)) for path in outputs}
+    dependencies += [folder for folder in folders if os.path.abspath(folder) not in output_folders]
+    if args.depfile_outputs:
+        dependencies += outputs
+    if args.depfile and sections:
+        write_depfile(args.depfile, args.stamp or outputs[0], dependencies)
+
+    print(f'Scanned {len(files)} file(s) in {scanned:.2f} s, {len(lua_files)} Lua file(s) and '
+          f'{len(asset_files)} asset(s); {hashed} hashed, {encoded} encoded in parallel, '
+          f'{len(sections)} header(s) in {time.perf_counter() - started:.2f} s')
+    if code:
+        sys.exit(code)
+    if args.stamp:
+        # Written after the headers, so the dependency file's inputs are older
+        with open(args.stamp, 'w'):
+            pass
+
+def build_parser_of(name):
+    """Argument parser of a section's script, naming the section in its messages"""
+    parser = importlib.import_module(SECTIONS[name]).build_parser()
+    parser.prog = f'{os.path.basename(sys.argv[0])} {name}'
+    return parser
+
+if __name__ == '__main__':
+    main()
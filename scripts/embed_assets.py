@@ -1,109 +1,366 @@
 #!/usr/bin/env python3
 """
 Embed asset files (images, sounds, fonts, etc.) into a C header file.
-Usage: python embed_assets.py <output.h> <file1.png> [file2.wav] [file3.ttf] ...
+Usage: python embed_assets.py [--backend array|incbin|embed] [--compress] [--shards N] [--group PATTERN=TAG] [--plan plan.json] <output.h> <file1.png> [file2.wav] [file3.ttf] ... [--shake report|exclude --lua main.lua ...]
 
 Embeds all specified asset files into a C header for inclusion in the executable.
+The asset table is sorted by name and comes with a hash index, so lookups at
+runtime do not scan the whole table.
+With a blob backend the header only declares the data and the bytes are pulled
+in by a companion <output>_data.c file.
+Files with identical contents are stored once and share one array, however
+many names they are embedded under.
+With --transform NAME the assets go through build-time transforms first
+(minified JSON, plain PCM WAV, packed texture atlases, ...), cached by input
+hash and run in parallel, see asset_transforms.py.
+With --shake, assets no string literal passed to an RL.Load* call in the
+Lua files given with --lua refers to are reported or left out, see
+embed_reach.py.
+With --compress each asset is stored as raw DEFLATE when that saves space, and
+LoadFileData_Embedded inflates it on load.
+Asset data starts at a multiple of --align bytes (default 16), or of the bytes
+given by the first matching --align-asset PATTERN=BYTES rule, so it can be read
+in place as floats, matrices or samples. Assets stored uncompressed are marked
+EMBEDDED_ASSET_BORROWABLE; RL.LoadFileDataView and the music, wave and image
+loaders read those without copying them.
+With --shards N the data is spread over N generated <output>_data/shard_NNN.c
+files of at most --shard-size bytes each, which the compiler can build in
+parallel, and the header is left with the declarations and the asset table.
+--list-sources prints the shard files for the given --shard-size.
+
+The header also carries a load plan for RL.GetAssetLoadPlan: the assets grouped
+by directory, or by the tag of the first matching --group PATTERN=TAG rule,
+with their loaded sizes and the total bytes. --plan writes it as JSON too.
+
+Content hashes and encoded data are cached in <output>_cache/ and generated
+files are only rewritten when their bytes change.
+--report writes the size, stored size, generated source bytes and encode
+time of every asset as JSON or HTML; --max-total, --max-asset and --max-time
+fail the build when they go over budget, see embed_report.py.
 """
+import argparse
+import fnmatch
+import json
 import sys
 import os
+import time
 
-def sanitize_name(filename):
-    """Convert filename to valid C identifier"""
-    name = os.path.basename(filename)
-    # Remove or replace all non-alphanumeric characters (except underscore)
-    valid_chars = []
-    for char in name:
-        if char.isalnum() or char == '_':
-            valid_chars.append(char)
-        else:
-            valid_chars.append('_')
-    name = ''.join(valid_chars)
-    # Ensure it doesn't start with a digit
-    if name and name[0].isdigit():
-        name = '_' + name
-    return name
+from asset_transforms import add_transform_arguments, apply_transforms, print_report
+from embed_common import (ALIGNED_PRELUDE, ASSET_BORROWABLE, ASSET_COMPRESSED, DEFAULT_ALIGNMENT,
+                          EMBEDDED_ASSET_STRUCT, MAX_DECOMPRESSED_SIZE, EmbedCache, add_backend_argument,
+                          asset_flags_expr, asset_var_name, blob_dir_path, compress_file, data_source_path,
+                          open_output, relative_name, sort_key, write_blob_source, write_data, write_hash_index,
+                          write_load_plan)
+from embed_reach import add_root_argument, add_shake_arguments, reachable_assets, reachable_lua, report_unreachable
+from embed_report import ReportEntry, add_report_arguments, finish_report, make_report
 
 def get_file_extension(filename):
     """Get the file extension"""
     return os.path.splitext(filename)[1].lower()
 
-def embed_files(output_file, input_files):
-    with open(output_file, 'w') as f:
+DEFAULT_SHARD_SIZE = 4 * 1024 * 1024
+
+def shard_dir_path(output_file):
+    """Directory holding the generated shard sources"""
+    return os.path.splitext(output_file)[0] + '_data'
+
+def shard_source_path(output_file, index):
+    """Translation unit of one shard"""
+    return os.path.join(shard_dir_path(output_file), f'shard_{index:03d}.c')
+
+def plan_shards(sizes, shard_size, shard_count=None):
+    """Assign assets, in table order, to shards. Returns a shard index per asset.
+    
+    Assets are packed in order until a shard would go over shard_size; an asset
+    larger than shard_size gets a shard of its own. With shard_count set, the
+    overflow goes into the last shard so the number of files never changes
+    between configure and build time.
+    """
+    shards = []
+    index = 0
+    used = 0
+    for size in sizes:
+        if used > 0 and used + size > shard_size:
+            index += 1
+            used = 0
+        if shard_count is not None:
+            index = min(index, shard_count - 1)
+        shards.append(index)
+        used += size
+    return shards
+
+def generated_sources(output_file, backend, shard_count):
+    """Paths of the files embed_files writes"""
+    if shard_count:
+        return [output_file] + [shard_source_path(output_file, index) for index in range(shard_count)]
+    if backend != 'array':
+        return [output_file, data_source_path(output_file)]
+    return [output_file]
+
+def unique_files(input_files, cache):
+    """First file of every distinct content, in order"""
+    seen = set()
+    unique = []
+    for input_file in input_files:
+        digest = cache.digest(input_file)
+        if digest not in seen:
+            seen.add(digest)
+            unique.append(input_file)
+    return unique
+
+def count_shards(input_files, shard_size, cache):
+    """Number of shards needed to keep every shard under shard_size"""
+    unique = unique_files(input_files, cache)
+    shards = plan_shards([os.path.getsize(path) for path in unique], shard_size)
+    return shards[-1] + 1 if shards else 1
+
+def parse_alignment(value):
+    """argparse type for an alignment, a power of two"""
+    try:
+        alignment = int(value)
+    except ValueError:
+        alignment = 0
+    if alignment <= 0 or alignment & (alignment - 1):
+        raise argparse.ArgumentTypeError(f'alignment must be a power of two, got {value}')
+    return alignment
+
+def parse_alignment_rule(value):
+    """argparse type for PATTERN=BYTES, returns (pattern, bytes)"""
+    pattern, sep, size = value.rpartition('=')
+    if not sep or not pattern:
+        raise argparse.ArgumentTypeError(f'expected PATTERN=BYTES, got {value}')
+    return pattern, parse_alignment(size)
+
+def asset_alignment(name, alignment, rules):
+    """Alignment of an asset: the first rule whose fnmatch pattern matches its name, else alignment"""
+    for pattern, rule_alignment in rules:
+        if fnmatch.fnmatchcase(name, pattern):
+            return rule_alignment
+    return alignment
+
+def parse_group_rule(value):
+    """argparse type for PATTERN=TAG, returns (pattern, tag)"""
+    pattern, sep, tag = value.rpartition('=')
+    if not sep or not pattern or not tag:
+        raise argparse.ArgumentTypeError(f'expected PATTERN=TAG, got {value}')
+    return pattern, tag
+
+def asset_group(name, rules):
+    """Load plan group of an asset: the tag of the first rule whose fnmatch pattern matches
+    its name, else its directory, '.' for the top level"""
+    for pattern, tag in rules:
+        if fnmatch.fnmatchcase(name, pattern):
+            return tag
+    return os.path.dirname(name) or '.'
+
+def load_plan(assets, rules=()):
+    """Group (name, size) assets for loading. Returns a list of (group, [(name, size), ...]).
+    
+    Tagged groups come first, in the order of their rules, then the directories in
+    the order of their first asset. Assets keep their order within a group.
+    """
+    groups = {tag: [] for _, tag in rules}
+    for name, size in assets:
+        groups.setdefault(asset_group(name, rules), []).append((name, size))
+    return [(group, members) for group, members in groups.items() if members]
+
+def write_plan_json(path, plan):
+    """Write the load plan as JSON, for tools and games reading it outside the executable"""
+    with open_output(path) as out:
+        json.dump({
+            'version': 1,
+            'total_assets': sum(len(members) for _, members in plan),
+            'total_bytes': sum(size for _, members in plan for _, size in members),
+            'groups': [{'name': group, 'bytes': sum(size for _, size in members),
+                        'assets': [{'name': name, 'size': size} for name, size in members]}
+                       for group, members in plan],
+        }, out, indent=2)
+        out.write('\n')
+
+def prepare_asset(input_file, cache, blob_dir, compress_ratio, used_blobs):
+    """Pick the bytes to embed for one asset. Returns (data path, flags).
+    
+    With compression on, the file is deflated into blob_dir and kept only when
+    the result is at most compress_ratio of the original size, so PNG, OGG and
+    other already compressed formats stay raw. Blobs are named by content hash
+    and reused while the input does not change.
+    """
+    raw_size = os.path.getsize(input_file)
+    if compress_ratio is None or raw_size == 0 or raw_size > MAX_DECOMPRESSED_SIZE:
+        return input_file, 0
+    
+    os.makedirs(blob_dir, exist_ok=True)
+    blob_name = f'{cache.digest(input_file)}.deflate'
+    blob = os.path.join(blob_dir, blob_name)
+    used_blobs.add(blob_name)
+    if not os.path.exists(blob):
+        compress_file(input_file, blob + '.tmp')
+        os.replace(blob + '.tmp', blob)
+    if os.path.getsize(blob) <= raw_size * compress_ratio:
+        return blob, ASSET_COMPRESSED
+    return input_file, 0
+
+def embed_files(output_file, assets, backend='array', compress_ratio=None, shard_count=0,
+                shard_size=DEFAULT_SHARD_SIZE, alignment=DEFAULT_ALIGNMENT, alignment_rules=(), cache=None,
+                group_rules=(), plan_file=None):
+    """Write the asset header for (name, path) assets. Returns a ReportEntry per asset."""
+    cache = cache or EmbedCache(output_file)
+    blob_dir = blob_dir_path(output_file)
+    used_blobs = set()
+    blobs = []
+    blob_sizes = []
+    blob_vars = {}
+    entries = []
+    # Sorted by name so the table order does not depend on the command line
+    assets = sorted(assets, key=lambda asset: sort_key(asset[0]))
+    # Shared data gets the strictest alignment any of its names asks for
+    alignments = {}
+    for name, input_file in assets:
+        digest = cache.digest(input_file)
+        alignments[digest] = max(alignments.get(digest, 1), asset_alignment(name, alignment, alignment_rules))
+    with open_output(output_file) as f:
         f.write('#ifndef EMBEDDED_ASSETS_H\n')
         f.write('#define EMBEDDED_ASSETS_H\n\n')
         f.write('/* Auto-generated file - do not edit manually */\n\n')
+        f.write(ALIGNED_PRELUDE)
         
-        # Embed each file as a separate array
-        for idx, input_file in enumerate(input_files):
-            with open(input_file, 'rb') as inf:
-                data = inf.read()
-            
-            var_name = sanitize_name(input_file)
-            # Extract relative path from build directory
-            relative_name = input_file
-            for prefix in ['build/', 'build\\']:
-                if prefix in input_file:
-                    parts = input_file.split(prefix, 1)
-                    if len(parts) > 1:
-                        relative_name = parts[1]
-                        break
-            # Normalize path separators
-            relative_name = relative_name.replace('\\', '/')
-            
-            f.write(f'/* Embedded file: {relative_name} ({len(data)} bytes) */\n')
-            f.write(f'static const unsigned char embedded_asset_{idx}_{var_name}[] = {{\n')
+        # Embed each distinct file content as a separate array
+        for name, input_file in assets:
+            start, started = f.tell(), time.perf_counter()
+            size = os.path.getsize(input_file)
+            digest = cache.digest(input_file)
+            if digest in blob_vars:
+                var_name, stored, flags, original = blob_vars[digest]
+                f.write(f'/* Embedded file: {name} ({size} bytes, same data as {original}) */\n\n')
+                entries.append((name, input_file, var_name, size, stored, flags, original,
+                                f.tell() - start, time.perf_counter() - started))
+                continue
             
-            for i, byte in enumerate(data):
-                if i % 12 == 0:
-                    f.write('    ')
-                f.write(f'0x{byte:02x}')
-                if i < len(data) - 1:
-                    f.write(',')
-                    if (i + 1) % 12 == 0:
-                        f.write('\n')
-                    else:
-                        f.write(' ')
+            var_name = asset_var_name(name)
+            data_file, flags = prepare_asset(input_file, cache, blob_dir, compress_ratio, used_blobs)
+            if not flags & ASSET_COMPRESSED:
+                flags |= ASSET_BORROWABLE
             
-            f.write('\n};\n')
-            f.write(f'static const unsigned int embedded_asset_{idx}_{var_name}_len = {len(data)};\n\n')
+            f.write(f'/* Embedded file: {name} ({size} bytes) */\n')
+            stored = write_data(f, var_name, data_file, backend, blobs, cache=cache, inline=not shard_count,
+                                alignment=alignments[digest])
+            blob_sizes.append(size)
+            blob_vars[digest] = (var_name, stored, flags, name)
+            entries.append((name, input_file, var_name, size, stored, flags, None,
+                            f.tell() - start, time.perf_counter() - started))
         
         # Create the asset table
         f.write('/* Asset table for virtual filesystem */\n')
-        f.write('typedef struct {\n')
-        f.write('    const char* name;\n')
-        f.write('    const unsigned char* data;\n')
-        f.write('    unsigned int size;\n')
-        f.write('} EmbeddedAsset;\n\n')
+        f.write(EMBEDDED_ASSET_STRUCT)
+        f.write('\n')
         
         f.write('static const EmbeddedAsset embedded_assets[] = {\n')
-        for idx, input_file in enumerate(input_files):
-            var_name = sanitize_name(input_file)
-            # Extract relative path from build directory
-            relative_name = input_file
-            for prefix in ['build/', 'build\\']:
-                if prefix in input_file:
-                    parts = input_file.split(prefix, 1)
-                    if len(parts) > 1:
-                        relative_name = parts[1]
-                        break
-            # Normalize path separators
-            relative_name = relative_name.replace('\\', '/')
-            f.write(f'    {{ "{relative_name}", embedded_asset_{idx}_{var_name}, embedded_asset_{idx}_{var_name}_len }},\n')
+        for name, _, var_name, size, stored, flags, *_ in entries:
+            f.write(f'    {{ "{name}", {var_name}, {size}, {var_name}_len, {asset_flags_expr(flags)} }},\n')
         f.write('};\n\n')
         
-        f.write(f'static const int embedded_asset_count = {len(input_files)};\n\n')
+        f.write(f'static const int embedded_asset_count = {len(assets)};\n\n')
+        
+        f.write('/* Hash index for find_embedded_asset */\n')
+        write_hash_index(f, 'embedded_asset', [name for name, _ in assets])
+        
+        f.write('/* Load plan for RL.GetAssetLoadPlan */\n')
+        plan = load_plan([(entry[0], entry[3]) for entry in entries], group_rules)
+        index = {entry[0]: i for i, entry in enumerate(entries)}
+        write_load_plan(f, [(group, [(index[name], size) for name, size in members]) for group, members in plan])
         f.write('#endif /* EMBEDDED_ASSETS_H */\n')
+    
+    written = {}
+    if shard_count:
+        # Bounded by the raw file sizes, which is what --list-sources saw
+        shards = plan_shards(blob_sizes, shard_size, shard_count)
+        shard_blobs = [[] for _ in range(shard_count)]
+        for shard, blob in zip(shards, blobs):
+            shard_blobs[shard].append(blob)
+        os.makedirs(shard_dir_path(output_file), exist_ok=True)
+        sources = set()
+        for index, blobs_in_shard in enumerate(shard_blobs):
+            source = shard_source_path(output_file, index)
+            written.update(write_blob_source(source, blobs_in_shard, backend, cache))
+            sources.add(os.path.basename(source))
+        # Drop shards left over from a larger shard count
+        for name in os.listdir(shard_dir_path(output_file)):
+            if name not in sources:
+                os.remove(os.path.join(shard_dir_path(output_file), name))
+    elif backend != 'array':
+        written = write_blob_source(data_source_path(output_file), blobs, backend, cache)
+    
+    # Drop compressed blobs of inputs that changed or are gone
+    if os.path.isdir(blob_dir):
+        for name in os.listdir(blob_dir):
+            if name not in used_blobs:
+                os.remove(os.path.join(blob_dir, name))
+    cache.save()
+    if plan_file:
+        write_plan_json(plan_file, plan)
+    
+    report = []
+    for name, input_file, var_name, size, stored, _, original, source_bytes, seconds in entries:
+        # Blob data is written once, by the asset that owns it
+        blob_bytes, blob_seconds = written.get(var_name, (0, 0.0)) if not original else (0, 0.0)
+        report.append(ReportEntry(name, input_file, size, stored, original, source_bytes + blob_bytes,
+                                  seconds + blob_seconds))
+    return report
 
-if __name__ == '__main__':
-    if len(sys.argv) < 3:
-        print('Usage: python embed_assets.py <output.h> <asset1> [asset2] ...')
-        print('  Embeds images, sounds, fonts, and other asset files into a C header.')
-        print('  Supported: .png, .jpg, .wav, .ogg, .mp3, .ttf, .otf, etc.')
+def build_parser():
+    """Command line options of the script, also read by embed_all.py"""
+    parser = argparse.ArgumentParser(
+        description='Embeds images, sounds, fonts, and other asset files into a C header.',
+        epilog='Supported: .png, .jpg, .wav, .ogg, .mp3, .ttf, .otf, etc.')
+    parser.add_argument('output', help='generated header (.h)')
+    parser.add_argument('assets', nargs='+', help='asset files to embed')
+    add_backend_argument(parser)
+    parser.add_argument('--compress', action='store_true',
+                        help='store assets as raw DEFLATE when it saves space')
+    parser.add_argument('--compress-ratio', type=float, default=0.9,
+                        help='keep compressed data only if it is at most this fraction of the original (default: 0.9)')
+    parser.add_argument('--align', type=parse_alignment, default=DEFAULT_ALIGNMENT,
+                        help=f'alignment of asset data in bytes, a power of two (default: {DEFAULT_ALIGNMENT})')
+    parser.add_argument('--align-asset', type=parse_alignment_rule, action='append', default=[],
+                        metavar='PATTERN=BYTES',
+                        help='alignment for assets whose name matches an fnmatch pattern (repeatable, first match wins)')
+    parser.add_argument('--group', type=parse_group_rule, action='append', default=[], metavar='PATTERN=TAG',
+                        help='load plan group for assets whose name matches an fnmatch pattern '
+                             '(repeatable, first match wins, default: the asset directory)')
+    parser.add_argument('--plan', metavar='FILE', help='also write the load plan as JSON')
+    parser.add_argument('--shards', type=int, default=0,
+                        help='spread the asset data over this many generated .c files')
+    parser.add_argument('--shard-size', type=int, default=DEFAULT_SHARD_SIZE,
+                        help=f'largest shard in bytes, an asset is never split (default: {DEFAULT_SHARD_SIZE})')
+    parser.add_argument('--list-sources', action='store_true',
+                        help='print the shard files needed for --shard-size and exit')
+    add_transform_arguments(parser)
+    add_shake_arguments(parser)
+    add_root_argument(parser)
+    parser.add_argument('--lua', nargs='+', default=[],
+                        help='Lua files scanned by --shake for asset paths; main.lua is the entry point')
+    add_report_arguments(parser)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    
+    output_file = args.output
+    input_files = args.assets
+    
+    try:
+        names = {f: relative_name(f, args.root) for f in input_files}
+    except ValueError as e:
+        print(f'Error: {e}')
         sys.exit(1)
     
-    output_file = sys.argv[1]
-    input_files = sys.argv[2:]
+    if args.list_sources:
+        ordered = sorted(input_files, key=lambda path: sort_key(names[path]))
+        cache = EmbedCache(output_file)
+        for index in range(count_shards(ordered, args.shard_size, cache)):
+            print(shard_source_path(output_file, index).replace('\\', '/'))
+        cache.save(prune=False)
+        return
     
     # Check all input files exist
     for f in input_files:
@@ -111,8 +368,54 @@ if __name__ == '__main__':
             print(f'Error: File not found: {f}')
             sys.exit(1)
     
-    embed_files(output_file, input_files)
-    print(f'Embedded {len(input_files)} asset file(s) into {output_file}')
-    for f in input_files:
-        size = os.path.getsize(f)
-        print(f'  - {f} ({size} bytes)')
+    started = time.perf_counter()
+    assets = [(names[f], f) for f in input_files]
+    cache = EmbedCache(output_file)
+    if args.transform:
+        try:
+            assets, stats, seconds = apply_transforms(assets, args.transform, cache, args.transform_plugin,
+                                                      args.jobs)
+        except ValueError as e:
+            print(f'Error: {e}')
+            sys.exit(1)
+        print_report(stats, seconds)
+    
+    # After the transforms, so Lua code can name what they produce, e.g. an atlas image
+    if args.shake and not args.lua:
+        print('Warning: --shake needs the game\'s Lua files in --lua, keeping all assets')
+    elif args.shake:
+        try:
+            _, literals = reachable_lua(args.lua, args.keep, args.root)
+        except ValueError as e:
+            print(f'Error: {e}')
+            sys.exit(1)
+        reached = reachable_assets([name for name, _ in assets], literals, args.keep)
+        report_unreachable('asset', [name for name, _ in assets if name not in reached], args.shake == 'exclude')
+        if args.shake == 'exclude':
+            assets = [(name, path) for name, path in assets if name in reached]
+    
+    entries = embed_files(output_file, assets, args.backend,
+                          args.compress_ratio if args.compress else None, args.shards, args.shard_size,
+                          args.align, args.align_asset, cache, args.group, args.plan)
+    seconds = time.perf_counter() - started
+    print(f'Embedded {len(assets)} asset file(s) into {output_file}')
+    saved = 0
+    duplicates = 0
+    for entry in entries:
+        if entry.duplicate_of:
+            print(f'  - {entry.name} ({entry.size} bytes, same data as {entry.duplicate_of})')
+            saved += entry.stored
+            duplicates += 1
+        elif entry.stored != entry.size:
+            print(f'  - {entry.name} ({entry.size} bytes, compressed to {entry.stored})')
+        else:
+            print(f'  - {entry.name} ({entry.size} bytes)')
+    if duplicates:
+        print(f'Deduplicated {duplicates} identical file(s), saved {saved} bytes')
+    
+    report = make_report('embed_assets.py', output_file, entries,
+                         generated_sources(output_file, args.backend, args.shards), seconds)
+    finish_report(args, report, output_file)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,468 @@
+"""
+Shared helpers for the embed_*.py scripts.
+
+Files are converted to C byte arrays by streaming them in fixed-size chunks
+and formatting whole rows at once, so memory use stays bounded no matter how
+large the input is.
+
+Generated files are only replaced when their bytes change, and EmbedCache keeps
+content hashes and encoded rows between runs, so an unchanged input is neither
+re-encoded nor recompiled.
+"""
+import contextlib
+import filecmp
+import hashlib
+import json
+import os
+import shutil
+import time
+import zlib
+
+# How file data reaches the compiler:
+#   array  - hex literals inside the header (works everywhere)
+#   incbin - assembler .incbin in a companion <header>_data.c
+#   embed  - C23 #embed in a companion <header>_data.c
+BACKENDS = ('array', 'incbin', 'embed')
+
+# Bytes read from an input file per iteration. Must be a multiple of BYTES_PER_ROW.
+CHUNK_SIZE = 64 * 1024
+BYTES_PER_ROW = 16
+
+# Layout of one full row: "    0xNN, 0xNN, ... 0xNN,\n"
+_ROW_TEMPLATE = b'    ' + b'0x00, ' * (BYTES_PER_ROW - 1) + b'0x00,\n'
+_ROW_LEN = len(_ROW_TEMPLATE)
+_HEX_HIGH = bytes(b'0123456789abcdef'[b >> 4] for b in range(256))
+_HEX_LOW = bytes(b'0123456789abcdef'[b & 0x0f] for b in range(256))
+
+# EmbeddedAsset.flags bits
+ASSET_COMPRESSED = 1
+ASSET_BORROWABLE = 2
+ASSET_FLAG_NAMES = [(ASSET_COMPRESSED, 'EMBEDDED_ASSET_COMPRESSED'), (ASSET_BORROWABLE, 'EMBEDDED_ASSET_BORROWABLE')]
+
+# Alignment of embedded asset data unless a rule asks for another one
+DEFAULT_ALIGNMENT = 16
+
+EMBEDDED_ASSET_STRUCT = (
+    '#define EMBEDDED_ASSET_COMPRESSED 1 /* data is raw DEFLATE, inflate with DecompressData */\n'
+    '#define EMBEDDED_ASSET_BORROWABLE 2 /* data is the loaded bytes and can be read in place */\n\n'
+    'typedef struct {\n'
+    '    const char* name;\n'
+    '    const unsigned char* data;\n'
+    '    unsigned int size; /* Size of the asset once loaded */\n'
+    '    unsigned int dataSize; /* Bytes stored in data */\n'
+    '    unsigned int flags;\n'
+    '} EmbeddedAsset;\n'
+)
+
+EMBEDDED_ASSET_GROUP_STRUCT = (
+    'typedef struct {\n'
+    '    const char* name;\n'
+    '    int first; /* First index into embedded_asset_plan */\n'
+    '    int count;\n'
+    '    unsigned long long bytes; /* Loaded size of the assets in the group */\n'
+    '} EmbeddedAssetGroup;\n'
+)
+
+# raylib's DecompressData cannot inflate more than MAX_DECOMPRESSION_SIZE (64 MB)
+MAX_DECOMPRESSED_SIZE = 64 * 1024 * 1024
+
+def sanitize_name(filename):
+    """Convert filename to valid C identifier"""
+    name = os.path.basename(filename)
+    # Replace all non-alphanumeric characters (except underscore)
+    name = ''.join(char if (char.isascii() and char.isalnum()) or char == '_' else '_' for char in name)
+    # Ensure it doesn't start with a digit
+    if name and name[0].isdigit():
+        name = '_' + name
+    return name
+
+def relative_name(path, root=None):
+    """Path relative to root, or to the build directory without one, with forward slashes.
+    
+    Raises ValueError for a path outside root, whose name could not match what the game loads.
+    """
+    if root:
+        try:
+            name = os.path.relpath(os.path.abspath(path), os.path.abspath(root))
+        except ValueError:
+            name = os.pardir
+        if name == os.pardir or name.startswith(os.pardir + os.sep) or os.path.isabs(name):
+            raise ValueError(f'{path} is not inside {root}')
+        return name.replace('\\', '/')
+    name = path
+    for prefix in ['build/', 'build\\']:
+        if prefix in path:
+            parts = path.split(prefix, 1)
+            if len(parts) > 1:
+                name = parts[1]
+                break
+    return name.replace('\\', '/')
+
+def asset_var_name(name):
+    """C identifier for an asset that only depends on its name.
+    
+    Stays the same when other files are added or removed, and the name hash
+    keeps names that sanitize to the same identifier apart.
+    """
+    return f'embedded_asset_{sanitize_name(name.replace("/", "_"))}_{name_hash(name):08x}'
+
+@contextlib.contextmanager
+def open_output(path, mode='w'):
+    """Open a generated file for writing, replacing it only when its bytes change.
+    
+    An unchanged file keeps its timestamp, so nothing that includes or compiles
+    it is rebuilt.
+    """
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, mode) as f:
+            yield f
+    except BaseException:
+        # Opening the temporary file may be what failed, that error is the one to see
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+    if os.path.exists(path) and filecmp.cmp(tmp_path, path, shallow=False):
+        os.remove(tmp_path)
+    else:
+        os.replace(tmp_path, path)
+
+def file_digest(file_path):
+    """SHA-256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class EmbedCache:
+    """Content hashes and encoded rows from earlier runs of a script.
+    
+    Lives in <output>_cache/ next to the generated header. manifest.json maps
+    each input to its size, mtime and SHA-256, so unchanged files are not even
+    re-hashed, and <sha256>.rows holds the encoded initializer rows of a file.
+    Scripts can keep other derived files there through derived_path.
+    """
+    def __init__(self, output_file):
+        self.dir = os.path.splitext(output_file)[0] + '_cache'
+        self.manifest_path = os.path.join(self.dir, 'manifest.json')
+        self.previous = {}
+        self.current = {}
+        self.derived = set()
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path) as f:
+                    self.previous = json.load(f)
+            except ValueError:
+                self.previous = {}
+    
+    def digest(self, file_path):
+        """SHA-256 of a file, reused from the manifest while size and mtime match"""
+        key = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        entry = self.previous.get(key)
+        if not entry or entry['size'] != stat.st_size or entry['mtime_ns'] != stat.st_mtime_ns:
+            entry = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': file_digest(file_path)}
+        self.current[key] = entry
+        return entry['sha256']
+    
+    def is_known(self, file_path):
+        """True while the manifest entry of a file matches its size and mtime, so digest does not read it"""
+        entry = self.previous.get(os.path.abspath(file_path))
+        stat = os.stat(file_path)
+        return bool(entry) and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns
+    
+    def remember(self, entries):
+        """Take manifest entries worked out by another process, like the embed_all.py workers"""
+        self.previous.update(entries)
+        self.current.update(entries)
+    
+    def rows_path(self, file_path):
+        """Cached initializer rows for a file, encoded only when its content is new"""
+        path = os.path.join(self.dir, self.digest(file_path) + '.rows')
+        if not os.path.exists(path):
+            os.makedirs(self.dir, exist_ok=True)
+            with open(path + '.tmp', 'w') as out:
+                write_rows(out, file_path)
+            os.replace(path + '.tmp', path)
+        return path
+    
+    def derived_path(self, name):
+        """Path of a file or folder derived from inputs, kept until a run no longer asks for it"""
+        os.makedirs(self.dir, exist_ok=True)
+        self.derived.add(name)
+        return os.path.join(self.dir, name)
+    
+    def save(self, prune=True):
+        """Write the manifest and drop cached files no current input refers to.
+        
+        With prune=False earlier entries and files are kept, for runs that only
+        looked at some of the inputs.
+        """
+        os.makedirs(self.dir, exist_ok=True)
+        if not prune:
+            with open_output(self.manifest_path) as f:
+                json.dump({**self.previous, **self.current}, f, indent=1, sort_keys=True)
+            return
+        with open_output(self.manifest_path) as f:
+            json.dump(self.current, f, indent=1, sort_keys=True)
+        used = {entry['sha256'] + '.rows' for entry in self.current.values()} | self.derived
+        used.add(os.path.basename(self.manifest_path))
+        for name in os.listdir(self.dir):
+            if name not in used:
+                path = os.path.join(self.dir, name)
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+
+def format_rows(chunk):
+    """Format bytes as C initializer rows. Only the last row may be partial."""
+    full_rows = len(chunk) // BYTES_PER_ROW
+    out = bytearray(_ROW_TEMPLATE * full_rows)
+    if full_rows:
+        body = chunk[:full_rows * BYTES_PER_ROW]
+        high = body.translate(_HEX_HIGH)
+        low = body.translate(_HEX_LOW)
+        # Fill one column of every row per slice assignment
+        for col in range(BYTES_PER_ROW):
+            pos = 4 + col * 6 + 2
+            out[pos::_ROW_LEN] = high[col::BYTES_PER_ROW]
+            out[pos + 1::_ROW_LEN] = low[col::BYTES_PER_ROW]
+    tail = chunk[full_rows * BYTES_PER_ROW:]
+    if tail:
+        out += b'    ' + b' '.join(b'0x%02x,' % b for b in tail) + b'\n'
+    return out.decode('ascii')
+
+def write_rows(out, file_path):
+    """Stream a file into out as C initializer rows. Returns the byte count."""
+    size = 0
+    with open(file_path, 'rb') as inf:
+        while True:
+            chunk = inf.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            out.write(format_rows(chunk))
+            size += len(chunk)
+    if size == 0:
+        # Empty initializers are not valid C
+        out.write('    0x00\n')
+    return size
+
+def write_array_body(out, file_path, cache=None):
+    """Write a file's initializer rows, from the cache when one is given"""
+    if cache is None:
+        return write_rows(out, file_path)
+    with open(cache.rows_path(file_path)) as rows:
+        shutil.copyfileobj(rows, out)
+    return os.path.getsize(file_path)
+
+ALIGNED_PRELUDE = """#ifndef EMBED_ALIGNED
+    #if defined( _MSC_VER )
+        #define EMBED_ALIGNED( n ) __declspec( align( n ) )
+    #else
+        #define EMBED_ALIGNED( n ) __attribute__(( aligned( n ) ))
+    #endif
+#endif
+
+"""
+
+def array_declarator(var_name, alignment=None):
+    """Type and name of a byte array definition, with EMBED_ALIGNED when alignment is set"""
+    if alignment:
+        return f'EMBED_ALIGNED( {alignment} ) const unsigned char {var_name}[]'
+    return f'const unsigned char {var_name}[]'
+
+def write_byte_array(out, var_name, file_path, size_suffix='_len', cache=None, alignment=None):
+    """Write a file into out as a static C byte array. Returns the byte count."""
+    out.write(f'static {array_declarator(var_name, alignment)} = {{\n')
+    size = write_array_body(out, file_path, cache)
+    out.write('};\n')
+    out.write(f'static const unsigned int {var_name}{size_suffix} = {size};\n\n')
+    return size
+
+def name_hash(name):
+    """32-bit FNV-1a hash of a name, matches embedded_name_hash() in lua_core.c"""
+    value = 2166136261
+    for byte in name.encode('utf-8'):
+        value = ((value ^ byte) * 16777619) & 0xffffffff
+    return value
+
+def sort_key(name):
+    """Sort key giving the same order as strcmp"""
+    return name.encode('utf-8')
+
+def _write_int_rows(out, values, fmt):
+    """Write integers as initializer rows of 8"""
+    if not values:
+        out.write('    0\n')
+    for i in range(0, len(values), 8):
+        out.write('    ' + ' '.join(fmt % v + ',' for v in values[i:i + 8]) + '\n')
+
+def write_hash_index(out, prefix, names):
+    """Write name hashes and an open addressing slot table for a name table.
+    
+    {prefix}_hashes[i] is the hash of names[i]. {prefix}_slots has a power of
+    two size at least twice the entry count, and holds table indices placed by
+    linear probing from hash & (size - 1). Empty slots are -1.
+    """
+    hashes = [name_hash(name) for name in names]
+    slot_count = 1
+    while slot_count < len(names) * 2:
+        slot_count *= 2
+    slots = [-1] * slot_count
+    for idx, value in enumerate(hashes):
+        slot = value & (slot_count - 1)
+        while slots[slot] != -1:
+            slot = (slot + 1) & (slot_count - 1)
+        slots[slot] = idx
+    
+    out.write(f'#define {prefix.upper()}_SLOT_COUNT {slot_count}\n\n')
+    out.write(f'static const unsigned int {prefix}_hashes[] = {{\n')
+    _write_int_rows(out, hashes, '0x%08xu')
+    out.write('};\n\n')
+    out.write(f'static const int {prefix}_slots[] = {{\n')
+    _write_int_rows(out, slots, '%d')
+    out.write('};\n\n')
+
+def write_load_plan(out, groups):
+    """Write the load plan of the asset table: embedded_asset_plan lists table indices
+    group by group, embedded_asset_groups the name, plan range and loaded bytes of
+    each group, and EMBEDDED_ASSET_TOTAL_BYTES the loaded size of all assets.
+    
+    groups is a list of (group name, [(table index, loaded size), ...]).
+    """
+    out.write(EMBEDDED_ASSET_GROUP_STRUCT)
+    out.write('\n')
+    out.write('static const int embedded_asset_plan[] = {\n')
+    _write_int_rows(out, [index for _, assets in groups for index, _ in assets], '%d')
+    out.write('};\n\n')
+    out.write('static const EmbeddedAssetGroup embedded_asset_groups[] = {\n')
+    if not groups:
+        out.write('    { "", 0, 0, 0 }\n')
+    first = 0
+    for name, assets in groups:
+        out.write(f'    {{ "{name}", {first}, {len(assets)}, {sum(size for _, size in assets)}ull }},\n')
+        first += len(assets)
+    out.write('};\n\n')
+    out.write(f'static const int embedded_asset_group_count = {len(groups)};\n\n')
+    total = sum(size for _, assets in groups for _, size in assets)
+    out.write(f'#define EMBEDDED_ASSET_TOTAL_BYTES {total}ull\n\n')
+
+def compress_file(file_path, dest_path, level=9):
+    """Raw DEFLATE a file into dest_path in chunks. Returns the compressed size."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    size = 0
+    with open(file_path, 'rb') as inf, open(dest_path, 'wb') as out:
+        while True:
+            chunk = inf.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            data = compressor.compress(chunk)
+            out.write(data)
+            size += len(data)
+        data = compressor.flush()
+        out.write(data)
+        size += len(data)
+    return size
+
+def asset_flags_expr(flags):
+    """C expression for an EmbeddedAsset.flags value"""
+    return ' | '.join(name for bit, name in ASSET_FLAG_NAMES if flags & bit) or '0'
+
+def blob_dir_path(output_file):
+    """Directory for generated blob files that belong to a header"""
+    return os.path.splitext(output_file)[0] + '_blobs'
+
+def add_backend_argument(parser):
+    """Add the shared --backend option to an argparse parser"""
+    parser.add_argument('--backend', choices=BACKENDS, default='array',
+                        help='how file data is passed to the compiler (default: array)')
+
+def data_source_path(output_file):
+    """Companion .c file that holds blob data for a generated header"""
+    return os.path.splitext(output_file)[0] + '_data.c'
+
+def write_data(out, var_name, file_path, backend, blobs, size_suffix='_len', cache=None, inline=True,
+               alignment=None):
+    """Write one file's data for the chosen backend. Returns the byte count.
+    
+    Blob backends, and the array backend with inline=False, only declare the
+    symbol in the header and queue the file in blobs for write_blob_source.
+    With alignment set the data starts at a multiple of that many bytes; the
+    array backend then needs ALIGNED_PRELUDE in the header.
+    """
+    if backend == 'array' and inline:
+        return write_byte_array(out, var_name, file_path, size_suffix, cache, alignment)
+    size = os.path.getsize(file_path)
+    out.write(f'extern const unsigned char {var_name}[];\n')
+    out.write(f'static const unsigned int {var_name}{size_suffix} = {size};\n\n')
+    blobs.append((var_name, file_path, alignment))
+    return size
+
+_INCBIN_PRELUDE = """#if defined( __APPLE__ )
+    #define EMBED_SECTION ".const_data\\n"
+#elif defined( _WIN32 )
+    #define EMBED_SECTION ".section .rdata,\\"dr\\"\\n"
+#else
+    #define EMBED_SECTION ".section .rodata\\n"
+#endif
+
+#define EMBED_STR2( x ) #x
+#define EMBED_STR( x ) EMBED_STR2( x )
+#ifdef __USER_LABEL_PREFIX__
+    #define EMBED_SYM( name ) EMBED_STR( __USER_LABEL_PREFIX__ ) #name
+#else
+    #define EMBED_SYM( name ) #name
+#endif
+
+"""
+
+def write_blob_source(output_file, blobs, backend, cache=None):
+    """Write a .c file defining the queued blobs.
+    
+    The SHA-256 of every input is written into the file, so it changes, and
+    gets recompiled, whenever the data it pulls in changes.
+    Returns {variable: (source bytes, seconds)} for the build report.
+    """
+    written = {}
+    with open_output(output_file) as f:
+        f.write('/* Auto-generated file - do not edit manually */\n')
+        for var_name, file_path, _ in blobs:
+            digest = cache.digest(file_path) if cache else file_digest(file_path)
+            f.write(f'/* {var_name}: sha256 {digest} */\n')
+        f.write('\n')
+        if not blobs:
+            # ISO C does not allow an empty translation unit
+            f.write('typedef int embedded_empty_source;\n')
+            return written
+        if backend != 'incbin' and any(alignment for _, _, alignment in blobs):
+            f.write(ALIGNED_PRELUDE)
+        if backend == 'array':
+            for var_name, file_path, alignment in blobs:
+                start, started = f.tell(), time.perf_counter()
+                f.write(f'{array_declarator(var_name, alignment)} = {{\n')
+                write_array_body(f, file_path, cache)
+                f.write('};\n\n')
+                written[var_name] = (f.tell() - start, time.perf_counter() - started)
+        elif backend == 'incbin':
+            f.write(_INCBIN_PRELUDE)
+            f.write('__asm__(\n    EMBED_SECTION\n')
+            for var_name, file_path, alignment in blobs:
+                start, started = f.tell(), time.perf_counter()
+                path = os.path.abspath(file_path).replace('\\', '/')
+                f.write(f'    ".global " EMBED_SYM( {var_name} ) "\\n"\n')
+                f.write(f'    ".balign {alignment or 16}\\n"\n')
+                f.write(f'    EMBED_SYM( {var_name} ) ":\\n"\n')
+                f.write(f'    ".incbin \\"{path}\\"\\n"\n')
+                written[var_name] = (f.tell() - start, time.perf_counter() - started)
+            f.write(');\n')
+        elif backend == 'embed':
+            for var_name, file_path, alignment in blobs:
+                start, started = f.tell(), time.perf_counter()
+                path = os.path.abspath(file_path).replace('\\', '/')
+                f.write(f'{array_declarator(var_name, alignment)} = {{\n')
+                f.write(f'#embed "{path}" if_empty( 0 )\n')
+                f.write('};\n\n')
+                written[var_name] = (f.tell() - start, time.perf_counter() - started)
+    return written
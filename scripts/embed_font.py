@@ -1,54 +1,48 @@
 #!/usr/bin/env python3
 """
 Embed font file into C header.
-Usage: python embed_font.py <output.h> <font.ttf>
+Usage: python embed_font.py [--backend array|incbin|embed] <output.h> <font.ttf>
 """
 
+import argparse
 import sys
 import os
 
-def embed_file(file_path, var_name):
-    """Convert a file to a C byte array"""
-    with open(file_path, 'rb') as f:
-        data = f.read()
-    
-    output = f"/* {os.path.basename(file_path)} */\n"
-    output += f"static const unsigned char {var_name}[] = {{\n"
-    
-    # Write bytes in rows of 16
-    for i in range(0, len(data), 16):
-        chunk = data[i:i+16]
-        hex_values = ', '.join(f'0x{b:02x}' for b in chunk)
-        output += f"    {hex_values},\n"
-    
-    output += "};\n"
-    output += f"static const unsigned int {var_name}_size = {len(data)};\n\n"
-    
-    return output
+from embed_common import add_backend_argument, data_source_path, open_output, write_blob_source, write_data
 
-def main():
-    if len(sys.argv) != 3:
-        print("Usage: python embed_font.py <output.h> <font.ttf>")
-        sys.exit(1)
+def embed_file(out, file_path, var_name, backend, blobs):
+    """Write a file's data into out for the chosen backend"""
+    out.write(f"/* {os.path.basename(file_path)} */\n")
+    write_data(out, var_name, file_path, backend, blobs, size_suffix='_size')
+
+def build_parser():
+    """Command line options of the script, also read by embed_all.py"""
+    parser = argparse.ArgumentParser(description="Embeds the default font into a C header.")
+    parser.add_argument("output", help="generated header (.h)")
+    parser.add_argument("font", help="font file (.ttf)")
+    add_backend_argument(parser)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
     
-    output_file = sys.argv[1]
-    font_file = sys.argv[2]
+    output_file = args.output
+    font_file = args.font
     
     # Check if file exists
     if not os.path.exists(font_file):
         print(f"Error: {font_file} not found!")
         sys.exit(1)
     
-    # Generate header content
-    header_content = "/* Auto-generated embedded font file */\n"
-    header_content += "#pragma once\n\n"
-    
-    # Embed font file
-    header_content += embed_file(font_file, "embedded_font_data")
+    # Write header, streaming the font file into it
+    blobs = []
+    with open_output(output_file) as f:
+        f.write("/* Auto-generated embedded font file */\n")
+        f.write("#pragma once\n\n")
+        embed_file(f, font_file, "embedded_font_data", args.backend, blobs)
     
-    # Write to output file
-    with open(output_file, 'w') as f:
-        f.write(header_content)
+    if args.backend != 'array':
+        write_blob_source(data_source_path(output_file), blobs, args.backend)
     
     print(f"Generated {output_file}")
     print(f"  - Embedded {font_file} ({os.path.getsize(font_file)} bytes)")
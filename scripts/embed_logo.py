@@ -1,39 +1,80 @@
 #!/usr/bin/env python3
 """
 Embed logo image files into C header for splash screens.
-Usage: python embed_logo.py <output.h> <raylib_logo.png> <reilua_logo.png>
+Usage: python embed_logo.py [--backend array|incbin|embed] [--decode [--premultiply]] <output.h> <raylib_logo.png> <reilua_logo.png>
+
+With --decode the PNGs are decoded here and embedded as raw RGBA pixels with
+their width, height and pixel format, so splash.c builds the Image directly
+and nothing is decoded at startup. The header defines EMBEDDED_LOGO_DECODED,
+and EMBEDDED_LOGO_PREMULTIPLIED when --premultiply is given.
 """
 
+import argparse
 import sys
 import os
 
-def embed_file(file_path, var_name):
-    """Convert a file to a C byte array"""
-    with open(file_path, 'rb') as f:
-        data = f.read()
-    
-    output = f"/* {os.path.basename(file_path)} */\n"
-    output += f"static const unsigned char {var_name}[] = {{\n"
-    
-    # Write bytes in rows of 16
-    for i in range(0, len(data), 16):
-        chunk = data[i:i+16]
-        hex_values = ', '.join(f'0x{b:02x}' for b in chunk)
-        output += f"    {hex_values},\n"
-    
-    output += "};\n"
-    output += f"static const unsigned int {var_name}_size = {len(data)};\n\n"
-    
-    return output
+from embed_common import (ALIGNED_PRELUDE, DEFAULT_ALIGNMENT, add_backend_argument, blob_dir_path, data_source_path,
+                          open_output, write_blob_source, write_data)
+from png_codec import PngError, read_png
+
+# PIXELFORMAT_UNCOMPRESSED_R8G8B8A8 in raylib.h
+PIXELFORMAT_R8G8B8A8 = 7
 
-def main():
-    if len(sys.argv) != 4:
-        print("Usage: python embed_logo.py <output.h> <raylib_logo.png> <reilua_logo.png>")
+def embed_file(out, file_path, var_name, backend, blobs):
+    """Write a file's data into out for the chosen backend"""
+    out.write(f"/* {os.path.basename(file_path)} */\n")
+    write_data(out, var_name, file_path, backend, blobs, size_suffix='_size')
+
+def premultiply(rgba):
+    """Multiply the color channels of RGBA pixels by their alpha, rounding to nearest"""
+    out = bytearray(rgba)
+    for i in range(0, len(out), 4):
+        alpha = out[i + 3]
+        if alpha != 255:
+            out[i] = (out[i] * alpha + 127) // 255
+            out[i + 1] = (out[i + 1] * alpha + 127) // 255
+            out[i + 2] = (out[i + 2] * alpha + 127) // 255
+    return bytes(out)
+
+def embed_decoded(out, file_path, var_name, backend, blobs, blob_dir, premultiplied):
+    """Decode a PNG and write its RGBA pixels into out with their size and format. Returns the pixel byte count."""
+    width, height, rgba = read_png(file_path)
+    if premultiplied:
+        rgba = premultiply(rgba)
+    # The pixels go through a file so every backend embeds them the same way
+    pixel_file = os.path.join(blob_dir, f"{var_name}.rgba")
+    with open_output(pixel_file, 'wb') as f:
+        f.write(rgba)
+    out.write(f"/* {os.path.basename(file_path)}, decoded to {width}x{height} RGBA */\n")
+    out.write(f"static const int {var_name}_width = {width};\n")
+    out.write(f"static const int {var_name}_height = {height};\n")
+    out.write(f"static const int {var_name}_format = {PIXELFORMAT_R8G8B8A8};\n")
+    write_data(out, var_name, pixel_file, backend, blobs, size_suffix='_size', alignment=DEFAULT_ALIGNMENT)
+    return len(rgba)
+
+def build_parser():
+    """Command line options of the script, also read by embed_all.py"""
+    parser = argparse.ArgumentParser(description="Embeds the splash screen logos into a C header.")
+    parser.add_argument("output", help="generated header (.h)")
+    parser.add_argument("raylib_logo", help="raylib logo (.png)")
+    parser.add_argument("reilua_logo", help="ReiLua logo (.png)")
+    add_backend_argument(parser)
+    parser.add_argument("--decode", action="store_true",
+                        help="embed decoded RGBA pixels instead of the PNG files")
+    parser.add_argument("--premultiply", action="store_true",
+                        help="with --decode, multiply colors by alpha for BLEND_ALPHA_PREMULTIPLY")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    
+    if args.premultiply and not args.decode:
+        print("Error: --premultiply needs --decode")
         sys.exit(1)
     
-    output_file = sys.argv[1]
-    raylib_logo = sys.argv[2]
-    reilua_logo = sys.argv[3]
+    output_file = args.output
+    raylib_logo = args.raylib_logo
+    reilua_logo = args.reilua_logo
     
     # Check if files exist
     if not os.path.exists(raylib_logo):
@@ -44,21 +85,40 @@ def main():
         print(f"Error: {reilua_logo} not found!")
         sys.exit(1)
     
-    # Generate header content
-    header_content = "/* Auto-generated embedded logo files */\n"
-    header_content += "#pragma once\n\n"
-    
-    # Embed both logo files
-    header_content += embed_file(raylib_logo, "embedded_raylib_logo")
-    header_content += embed_file(reilua_logo, "embedded_reilua_logo")
+    # Write header, streaming both logo files into it
+    blobs = []
+    logos = ((raylib_logo, "embedded_raylib_logo"), (reilua_logo, "embedded_reilua_logo"))
+    sizes = []
+    with open_output(output_file) as f:
+        f.write("/* Auto-generated embedded logo files */\n")
+        f.write("#pragma once\n\n")
+        if args.decode:
+            f.write(ALIGNED_PRELUDE)
+            f.write("#define EMBEDDED_LOGO_DECODED 1\n")
+            if args.premultiply:
+                f.write("#define EMBEDDED_LOGO_PREMULTIPLIED 1\n")
+            f.write("\n")
+            blob_dir = blob_dir_path(output_file)
+            os.makedirs(blob_dir, exist_ok=True)
+            for file_path, var_name in logos:
+                try:
+                    sizes.append(embed_decoded(f, file_path, var_name, args.backend, blobs, blob_dir,
+                                               args.premultiply))
+                except PngError as e:
+                    print(f"Error: {file_path}: {e}")
+                    sys.exit(1)
+        else:
+            for file_path, var_name in logos:
+                embed_file(f, file_path, var_name, args.backend, blobs)
+                sizes.append(os.path.getsize(file_path))
     
-    # Write to output file
-    with open(output_file, 'w') as f:
-        f.write(header_content)
+    if args.backend != 'array':
+        write_blob_source(data_source_path(output_file), blobs, args.backend)
     
     print(f"Generated {output_file}")
-    print(f"  - Embedded {raylib_logo} ({os.path.getsize(raylib_logo)} bytes)")
-    print(f"  - Embedded {reilua_logo} ({os.path.getsize(reilua_logo)} bytes)")
+    kind = "bytes of RGBA pixels" if args.decode else "bytes"
+    for (file_path, _), size in zip(logos, sizes):
+        print(f"  - Embedded {file_path} ({size} {kind})")
 
 if __name__ == "__main__":
     main()
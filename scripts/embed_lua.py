@@ -1,58 +1,113 @@
 #!/usr/bin/env python3
 """
 Embed multiple Lua files into a C header file for inclusion in the executable.
-Usage: python embed_lua.py <output.h> <file1.lua> [file2.lua] [file3.lua] ...
+Usage: python embed_lua.py [--backend array|incbin|embed] [--luac PATH] [--shake report|exclude] <output.h> <file1.lua> [file2.lua] [file3.lua] ...
 
 Embeds all specified Lua files into a C header with a virtual filesystem.
 The first file is treated as main.lua (entry point).
+With a blob backend the source bytes live in a companion <output>_data.c file.
+Encoded files are cached in <output>_cache/ and generated files are only
+rewritten when their bytes change.
+With --luac every file is compiled to stripped bytecode (luac -s) and the
+chunks are embedded instead of the source, so startup skips parsing. A file
+falls back to source when luac is missing or fails on it. luaL_loadbuffer
+accepts both, the luac used must match the Lua version ReiLua links against.
+With --shake, files main.lua cannot reach through require() are reported or
+left out; --keep patterns cover modules loaded by computed names.
+A module index maps every name require() accepts for a file ("lib.gamestate",
+"lib/gamestate", "lib/gamestate.lua") to its table entry.
+--report and the --max-* budgets work as for embed_assets.py, see
+embed_report.py.
 """
+import argparse
+import hashlib
+import shutil
+import subprocess
 import sys
 import os
+import time
 
-def sanitize_name(filename):
-    """Convert filename to valid C identifier"""
-    name = os.path.basename(filename)
-    name = name.replace('.', '_').replace('-', '_').replace('/', '_').replace('\\', '_')
-    return name
+from embed_common import (EmbedCache, add_backend_argument, data_source_path, open_output,
+                          relative_name, sanitize_name, sort_key, write_blob_source,
+                          write_data, write_hash_index)
+from embed_reach import add_root_argument, add_shake_arguments, find_main, reachable_lua, report_unreachable
+from embed_report import ReportEntry, add_report_arguments, finish_report, make_report
 
-def embed_files(output_file, input_files):
-    with open(output_file, 'w') as f:
+def module_stem(name):
+    """File name without the .lua extension"""
+    return name[:-4] if len(name) > 4 and name.endswith('.lua') else name
+
+def module_index(names):
+    """Map require names to file table indices, resolved the way the loader used to.
+    
+    The old loader first tried the name with dots turned into slashes, then the
+    name as given, and took the first file whose path or path without .lua
+    matched. Returns (require name, file index) pairs sorted by name.
+    """
+    first_match = {}
+    for idx, name in enumerate(names):
+        first_match.setdefault(name, idx)
+        first_match.setdefault(module_stem(name), idx)
+    
+    index = {}
+    for name in names:
+        stem = module_stem(name)
+        for key in (stem.replace('/', '.'), stem, name):
+            file_idx = first_match.get(key.replace('.', '/'), first_match.get(key))
+            if file_idx is not None:
+                index[key] = file_idx
+    return sorted(index.items(), key=lambda item: sort_key(item[0]))
+
+def find_luac(luac):
+    """Path of a runnable luac, or None"""
+    if not luac:
+        return None
+    if os.path.isfile(luac) and os.access(luac, os.X_OK):
+        return luac
+    return shutil.which(luac)
+
+def compile_chunk(input_file, luac, cache):
+    """Compile a Lua file to stripped bytecode. Returns the chunk path, or None on failure.
+    
+    Chunks are cached by the hashes of the source and of luac itself.
+    """
+    key = hashlib.sha256((cache.digest(input_file) + cache.digest(luac)).encode()).hexdigest()
+    chunk = cache.derived_path(f'{key}.luac')
+    if not os.path.exists(chunk):
+        result = subprocess.run([luac, '-s', '-o', chunk + '.tmp', input_file],
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f'Warning: luac failed, embedding source of {input_file}: {result.stderr.strip()}')
+            return None
+        os.replace(chunk + '.tmp', chunk)
+    return chunk
+
+def embed_files(output_file, input_files, backend='array', luac=None, root=None):
+    """Write the Lua header. Returns (number of files embedded as bytecode, a ReportEntry per file)."""
+    names = [relative_name(path, root) for path in input_files]
+    cache = EmbedCache(output_file)
+    blobs = []
+    compiled = 0
+    entries = []
+    with open_output(output_file) as f:
         f.write('#ifndef EMBEDDED_MAIN_H\n')
         f.write('#define EMBEDDED_MAIN_H\n\n')
         f.write('/* Auto-generated file - do not edit manually */\n\n')
         
         # Embed each file as a separate array
         for idx, input_file in enumerate(input_files):
-            with open(input_file, 'rb') as inf:
-                data = inf.read()
-            
+            start, started = f.tell(), time.perf_counter()
             var_name = sanitize_name(input_file)
-            # Get relative path for better module loading
-            # Try to extract path relative to common directories
-            relative_name = input_file
-            for prefix in ['build/', 'build\\']:
-                if prefix in input_file:
-                    parts = input_file.split(prefix, 1)
-                    if len(parts) > 1:
-                        relative_name = parts[1]
-                        break
-            
-            f.write(f'/* Embedded file: {relative_name} */\n')
-            f.write(f'static const unsigned char embedded_lua_{idx}_{var_name}[] = {{\n')
-            
-            for i, byte in enumerate(data):
-                if i % 12 == 0:
-                    f.write('    ')
-                f.write(f'0x{byte:02x}')
-                if i < len(data) - 1:
-                    f.write(',')
-                    if (i + 1) % 12 == 0:
-                        f.write('\n')
-                    else:
-                        f.write(' ')
-            
-            f.write('\n};\n')
-            f.write(f'static const unsigned int embedded_lua_{idx}_{var_name}_len = {len(data)};\n\n')
+            chunk = compile_chunk(input_file, luac, cache) if luac else None
+            if chunk:
+                f.write(f'/* Embedded file: {names[idx]} (bytecode) */\n')
+                compiled += 1
+            else:
+                f.write(f'/* Embedded file: {names[idx]} */\n')
+            stored = write_data(f, f'embedded_lua_{idx}_{var_name}', chunk or input_file, backend, blobs,
+                                cache=cache)
+            entries.append(ReportEntry(names[idx], input_file, os.path.getsize(input_file), stored,
+                                       None, f.tell() - start, time.perf_counter() - started))
         
         # Create the file table
         f.write('/* File table for virtual filesystem */\n')
@@ -66,26 +121,27 @@ def embed_files(output_file, input_files):
         for idx, input_file in enumerate(input_files):
             var_name = sanitize_name(input_file)
             # Store relative path for proper require() support
-            relative_name = input_file
-            for prefix in ['build/', 'build\\']:
-                if prefix in input_file:
-                    parts = input_file.split(prefix, 1)
-                    if len(parts) > 1:
-                        relative_name = parts[1]
-                        break
-            # Normalize path separators
-            relative_name = relative_name.replace('\\', '/')
-            f.write(f'    {{ "{relative_name}", embedded_lua_{idx}_{var_name}, embedded_lua_{idx}_{var_name}_len }},\n')
+            f.write(f'    {{ "{names[idx]}", embedded_lua_{idx}_{var_name}, embedded_lua_{idx}_{var_name}_len }},\n')
         f.write('};\n\n')
         
         f.write(f'static const int embedded_lua_file_count = {len(input_files)};\n\n')
         
+        # Module index for embedded_lua_loader
+        modules = module_index(names)
+        f.write('/* Module index: require name -> embedded_lua_files index */\n')
+        f.write('typedef struct {\n')
+        f.write('    const char* name;\n')
+        f.write('    int file;\n')
+        f.write('} EmbeddedLuaModule;\n\n')
+        
+        f.write('static const EmbeddedLuaModule embedded_lua_modules[] = {\n')
+        for name, file_idx in modules:
+            f.write(f'    {{ "{name}", {file_idx} }},\n')
+        f.write('};\n\n')
+        write_hash_index(f, 'embedded_lua_module', [name for name, _ in modules])
+        
         # Main entry point (first file with 'main.lua' in name, or first file)
-        main_idx = 0
-        for idx, input_file in enumerate(input_files):
-            if 'main.lua' in input_file.lower():
-                main_idx = idx
-                break
+        main_idx = find_main(input_files)
         
         var_name = sanitize_name(input_files[main_idx])
         f.write('/* Main entry point */\n')
@@ -93,15 +149,33 @@ def embed_files(output_file, input_files):
         f.write(f'#define embedded_main_lua_len embedded_lua_{main_idx}_{var_name}_len\n\n')
         
         f.write('#endif /* EMBEDDED_MAIN_H */\n')
+    
+    if backend != 'array':
+        written = write_blob_source(data_source_path(output_file), blobs, backend, cache)
+        for idx, (entry, (var_name, _, _)) in enumerate(zip(entries, blobs)):
+            source_bytes, seconds = written[var_name]
+            entries[idx] = entry._replace(source_bytes=entry.source_bytes + source_bytes,
+                                          seconds=entry.seconds + seconds)
+    cache.save()
+    return compiled, entries
 
-if __name__ == '__main__':
-    if len(sys.argv) < 3:
-        print('Usage: python embed_lua.py <output.h> <file1.lua> [file2.lua] ...')
-        print('  The first Lua file is treated as the main entry point.')
-        sys.exit(1)
+def build_parser():
+    """Command line options of the script, also read by embed_all.py"""
+    parser = argparse.ArgumentParser(description='Embeds Lua files into a C header.')
+    parser.add_argument('output', help='generated header (.h)')
+    parser.add_argument('files', nargs='+', help='Lua files; main.lua is the entry point')
+    add_backend_argument(parser)
+    parser.add_argument('--luac', help='luac used to embed stripped bytecode instead of source')
+    add_shake_arguments(parser)
+    add_root_argument(parser)
+    add_report_arguments(parser)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
     
-    output_file = sys.argv[1]
-    input_files = sys.argv[2:]
+    output_file = args.output
+    input_files = args.files
     
     # Check all input files exist
     for f in input_files:
@@ -109,8 +183,35 @@ if __name__ == '__main__':
             print(f'Error: File not found: {f}')
             sys.exit(1)
     
-    embed_files(output_file, input_files)
+    # A file named wrongly could not be found by require(), or be left out by --shake
+    try:
+        names = {f: relative_name(f, args.root) for f in input_files}
+    except ValueError as e:
+        print(f'Error: {e}')
+        sys.exit(1)
+    
+    started = time.perf_counter()
+    if args.shake:
+        reached, _ = reachable_lua(input_files, args.keep, args.root)
+        unreachable = [names[f] for f in input_files if f not in reached]
+        report_unreachable('Lua file', unreachable, args.shake == 'exclude')
+        if args.shake == 'exclude':
+            input_files = [f for f in input_files if f in reached]
+    
+    luac = find_luac(args.luac)
+    if args.luac and not luac:
+        print(f'Warning: luac not found at {args.luac}, embedding Lua source')
+    
+    compiled, entries = embed_files(output_file, input_files, args.backend, luac, args.root)
+    seconds = time.perf_counter() - started
     print(f'Embedded {len(input_files)} file(s) into {output_file}')
+    if luac:
+        print(f'  {compiled} of them as bytecode compiled by {luac}')
     for f in input_files:
         print(f'  - {f}')
+    
+    generated = [output_file] if args.backend == 'array' else [output_file, data_source_path(output_file)]
+    finish_report(args, make_report('embed_lua.py', output_file, entries, generated, seconds), output_file)
 
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Find the Lua modules and assets a game can reach from main.lua.
+Usage: python embed_reach.py [--keep PATTERN] [--root DIR] <file1.lua> [file2.lua] ... [--assets file1.png ...]
+
+Starts at main.lua and statically follows require("...") calls. String
+literals passed to RL.Load* functions are collected as asset paths. Anything
+loaded through a computed name cannot be seen, so --keep takes fnmatch
+patterns for files (or module names) that are always kept and scanned.
+Files are named relative to --root, the folder the game runs from, as
+require() and RL.Load* name them; without it, relative to a build/ folder.
+embed_lua.py and embed_assets.py use this for --shake; run on its own it
+only prints what is unreachable.
+"""
+import argparse
+import fnmatch
+import re
+import sys
+
+from embed_common import relative_name
+
+SHAKE_MODES = ('report', 'exclude')
+
+_REQUIRE_RE = re.compile(r'\brequire\s*\(?\s*(["\'])(.+?)\1')
+_LOAD_CALL_RE = re.compile(r'\bRL\s*\.\s*Load\w*\s*\(')
+_STRING_RE = re.compile(r'"((?:[^"\\\n]|\\.)*)"|\'((?:[^\'\\\n]|\\.)*)\'')
+
+def find_main(input_files):
+    """Index of the entry point: first file with 'main.lua' in its path, or the first file"""
+    for idx, input_file in enumerate(input_files):
+        if 'main.lua' in input_file.lower():
+            return idx
+    return 0
+
+def module_names(name):
+    """Names require() may use for a file, e.g. lib/util.lua -> lib/util.lua, lib/util, lib.util"""
+    stem = name[:-4] if len(name) > 4 and name.endswith('.lua') else name
+    return {name, stem, stem.replace('/', '.')}
+
+def load_call_strings(text, start):
+    """String literals in the argument list of a call whose '(' ends at start"""
+    depth = 1
+    pos = start
+    strings = []
+    while pos < len(text) and depth > 0:
+        char = text[pos]
+        if char in '"\'':
+            match = _STRING_RE.match(text, pos)
+            if not match:
+                break
+            strings.append(match.group(1) if match.group(1) is not None else match.group(2))
+            pos = match.end()
+            continue
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        pos += 1
+    return strings
+
+def scan_lua(file_path):
+    """Returns (required module names, asset path literals) of a Lua file"""
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        text = f.read()
+    requires = {match.group(2) for match in _REQUIRE_RE.finditer(text)}
+    assets = set()
+    for match in _LOAD_CALL_RE.finditer(text):
+        assets.update(load_call_strings(text, match.end()))
+    return requires, assets
+
+def is_kept(name, keep):
+    """True when a file or one of its module names matches a --keep pattern"""
+    return any(fnmatch.fnmatchcase(candidate, pattern)
+               for candidate in module_names(name) for pattern in keep)
+
+def reachable_lua(lua_files, keep=(), root=None):
+    """Walk requires from main.lua and kept files. Returns (reachable files, asset literals).
+    
+    Raises ValueError for a file outside root, rather than leaving out a module that is required.
+    """
+    if not lua_files:
+        return set(), set()
+    names = {path: relative_name(path, root) for path in lua_files}
+    modules = {}
+    for path in lua_files:
+        for module in module_names(names[path]):
+            modules.setdefault(module, path)
+
+    pending = [lua_files[find_main(lua_files)]]
+    pending += [path for path in lua_files if is_kept(names[path], keep)]
+    reached = set()
+    literals = set()
+    while pending:
+        path = pending.pop()
+        if path in reached:
+            continue
+        reached.add(path)
+        requires, assets = scan_lua(path)
+        literals |= assets
+        for module in requires:
+            target = modules.get(module, modules.get(module.replace('.', '/')))
+            if target:
+                pending.append(target)
+    return reached, literals
+
+def normalize_literal(literal):
+    """Asset literal without leading ./, ../ and / so it can match the end of a name"""
+    path = literal.replace('\\', '/')
+    while True:
+        for prefix in ('./', '../', '/'):
+            if path.startswith(prefix):
+                path = path[len(prefix):]
+                break
+        else:
+            return path
+
+def reachable_assets(names, literals, keep=()):
+    """Asset names matched by a literal, either the whole path, its tail or a folder above it"""
+    paths = {normalize_literal(literal) for literal in literals}
+    paths.discard('')
+    reached = set()
+    for name in names:
+        if is_kept(name, keep) or any(
+                name == path or name.endswith('/' + path)
+                or name.startswith(path + '/') or f'/{path}/' in name for path in paths):
+            reached.add(name)
+    return reached
+
+def report_unreachable(kind, unreachable, excluded):
+    """Print the names the reachability pass left out"""
+    if not unreachable:
+        return
+    action = 'Excluded' if excluded else 'Unreachable'
+    print(f'{action} {len(unreachable)} {kind}(s), not found from main.lua:')
+    for name in unreachable:
+        print(f'  - {name}')
+
+def add_shake_arguments(parser):
+    """Add the --shake and --keep options the embed scripts share"""
+    parser.add_argument('--shake', choices=SHAKE_MODES,
+                        help='report or exclude files not reachable from main.lua')
+    parser.add_argument('--keep', action='append', default=[], metavar='PATTERN',
+                        help='fnmatch pattern of a file or module that is always reachable (repeatable)')
+
+def add_root_argument(parser):
+    """Add the --root option naming files relative to the folder the game runs from"""
+    parser.add_argument('--root', metavar='DIR',
+                        help='name files relative to this folder, the build directory (default: after a build/ folder)')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Lists Lua files and assets not reachable from main.lua.')
+    parser.add_argument('files', nargs='+', help='Lua files; main.lua is the entry point')
+    parser.add_argument('--assets', nargs='+', default=[], help='asset files to check')
+    parser.add_argument('--keep', action='append', default=[], metavar='PATTERN',
+                        help='fnmatch pattern of a file or module that is always reachable (repeatable)')
+    add_root_argument(parser)
+    args = parser.parse_args()
+
+    try:
+        reached, literals = reachable_lua(args.files, args.keep, args.root)
+        names = {path: relative_name(path, args.root) for path in args.assets}
+        lua_names = {path: relative_name(path, args.root) for path in args.files}
+    except ValueError as e:
+        print(f'Error: {e}')
+        sys.exit(1)
+    report_unreachable('Lua file', [lua_names[path] for path in args.files if path not in reached], False)
+    if args.assets:
+        assets = reachable_assets(names.values(), literals, args.keep)
+        report_unreachable('asset', [name for name in names.values() if name not in assets], False)
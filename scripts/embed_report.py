@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Build reports and size budgets for embed_lua.py and embed_assets.py.
+Usage: python embed_report.py [--baseline old.json] <report.json>   (prints a report, or what changed)
+
+With --report FILE the embed scripts write every embedded file with its raw
+and stored size, compression ratio, generated C source bytes and encode time,
+the groups of files sharing one copy of their data, and the generated files.
+A .html report is a page to read in a browser, anything else is JSON.
+
+--max-total, --max-asset and --max-time fail the script, and with it the
+CMake build, when the embedded data, the largest embedded file or the time
+spent encoding go over budget. The generated header is removed then, so the
+next build checks again instead of finding it up to date.
+"""
+import argparse
+import collections
+import html
+import json
+import os
+import sys
+
+from embed_common import open_output
+
+REPORT_VERSION = 1
+
+# size:         bytes of the file as given, after build-time transforms
+# stored:       bytes embedded for it, after compression or compiling to bytecode
+# duplicate_of: name of the file whose data it shares, or None
+# source_bytes: bytes of generated C source written for it
+ReportEntry = collections.namedtuple('ReportEntry', 'name path size stored duplicate_of source_bytes seconds')
+
+_SIZE_UNITS = {'': 1, 'B': 1, 'K': 1024, 'KB': 1024, 'M': 1024 ** 2, 'MB': 1024 ** 2, 'G': 1024 ** 3, 'GB': 1024 ** 3}
+
+def parse_size(value):
+    """argparse type for a byte count with an optional K, M or G suffix (powers of 1024)"""
+    text = value.strip().upper()
+    digits = text.rstrip('KMGB')
+    unit = text[len(digits):]
+    try:
+        size = float(digits)
+    except ValueError:
+        size = -1
+    if unit not in _SIZE_UNITS or size < 0:
+        raise argparse.ArgumentTypeError(f'expected a size such as 512K or 64M, got {value}')
+    return int(size * _SIZE_UNITS[unit])
+
+def format_size(size):
+    """Short human readable byte count"""
+    for unit in ('bytes', 'KB', 'MB'):
+        if abs(size) < 1024 or unit == 'MB':
+            return f'{size} {unit}' if unit == 'bytes' else f'{size:.1f} {unit}'
+        size /= 1024
+
+def add_report_arguments(parser):
+    """Add the --report and budget options"""
+    parser.add_argument('--report', metavar='FILE',
+                        help='write a build report, HTML for a .html file, JSON otherwise')
+    parser.add_argument('--max-total', type=parse_size, metavar='SIZE',
+                        help='fail when the embedded data is larger, e.g. 64M')
+    parser.add_argument('--max-asset', type=parse_size, metavar='SIZE',
+                        help='fail when a single embedded file is larger, e.g. 8M')
+    parser.add_argument('--max-time', type=float, metavar='SECONDS',
+                        help='fail when encoding takes longer')
+
+def make_report(tool, output_file, entries, generated, seconds):
+    """Report dict for ReportEntry entries and the paths of the generated files"""
+    files = []
+    groups = collections.OrderedDict()
+    for entry in entries:
+        files.append({
+            'name': entry.name,
+            'path': entry.path,
+            'size': entry.size,
+            'stored': entry.stored,
+            'ratio': round(entry.stored / entry.size, 4) if entry.size else 1.0,
+            'source_bytes': entry.source_bytes,
+            'seconds': round(entry.seconds, 6),
+            'duplicate_of': entry.duplicate_of,
+        })
+        if entry.duplicate_of:
+            groups.setdefault(entry.duplicate_of, [entry.duplicate_of]).append(entry.name)
+    stored = {entry.name: entry.stored for entry in entries}
+    duplicates = [{'names': names, 'stored': stored[names[0]], 'saved': stored[names[0]] * (len(names) - 1)}
+                  for names in groups.values()]
+    generated_files = [{'path': path.replace('\\', '/'), 'bytes': os.path.getsize(path)}
+                       for path in generated if os.path.exists(path)]
+    unique = [entry for entry in entries if not entry.duplicate_of]
+    return {
+        'version': REPORT_VERSION,
+        'tool': tool,
+        'output': output_file.replace('\\', '/'),
+        'totals': {
+            'files': len(entries),
+            'size': sum(entry.size for entry in entries),
+            'stored': sum(entry.stored for entry in unique),
+            'largest': max((entry.stored for entry in unique), default=0),
+            'saved_by_duplicates': sum(group['saved'] for group in duplicates),
+            'source_bytes': sum(item['bytes'] for item in generated_files),
+            'seconds': round(seconds, 6),
+        },
+        'files': files,
+        'duplicates': duplicates,
+        'generated': generated_files,
+    }
+
+def check_budgets(report, max_total=None, max_asset=None, max_time=None):
+    """Budgets the report goes over, as messages"""
+    totals = report['totals']
+    problems = []
+    if max_total is not None and totals['stored'] > max_total:
+        problems.append(f'embedded data is {format_size(totals["stored"])}, '
+                        f'over the budget of {format_size(max_total)}')
+    if max_asset is not None:
+        for item in report['files']:
+            if not item['duplicate_of'] and item['stored'] > max_asset:
+                problems.append(f'{item["name"]} is {format_size(item["stored"])}, '
+                                f'over the per-file budget of {format_size(max_asset)}')
+    if max_time is not None and totals['seconds'] > max_time:
+        problems.append(f'encoding took {totals["seconds"]:.2f} s, over the budget of {max_time:.2f} s')
+    return problems
+
+_HTML_STYLE = """body { font-family: sans-serif; margin: 2em; }
+table { border-collapse: collapse; margin-bottom: 2em; }
+th, td { border: 1px solid #ccc; padding: 0.2em 0.6em; text-align: right; }
+th:first-child, td:first-child { text-align: left; }
+"""
+
+def _html_table(out, headers, rows):
+    out.write('<table>\n<tr>' + ''.join(f'<th>{html.escape(header)}</th>' for header in headers) + '</tr>\n')
+    for row in rows:
+        out.write('<tr>' + ''.join(f'<td>{html.escape(str(cell))}</td>' for cell in row) + '</tr>\n')
+    out.write('</table>\n')
+
+def write_html(out, report):
+    """Write the report as a standalone HTML page, largest files first"""
+    totals = report['totals']
+    title = f'{report["tool"]}: {report["output"]}'
+    out.write(f'<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n<title>{html.escape(title)}</title>\n')
+    out.write(f'<style>\n{_HTML_STYLE}</style>\n</head>\n<body>\n<h1>{html.escape(title)}</h1>\n')
+    _html_table(out, ('Files', 'Size', 'Embedded', 'Largest', 'Saved by duplicates', 'Generated source', 'Time'),
+                [(totals['files'], format_size(totals['size']), format_size(totals['stored']),
+                  format_size(totals['largest']), format_size(totals['saved_by_duplicates']),
+                  format_size(totals['source_bytes']), f'{totals["seconds"]:.3f} s')])
+    out.write('<h2>Files</h2>\n')
+    files = sorted(report['files'], key=lambda item: (item['duplicate_of'] is not None, -item['stored']))
+    _html_table(out, ('Name', 'Size', 'Stored', 'Ratio', 'Source bytes', 'Time (ms)', 'Same data as'),
+                [(item['name'], item['size'], item['stored'], f'{item["ratio"]:.3f}', item['source_bytes'],
+                  f'{item["seconds"] * 1000:.1f}', item['duplicate_of'] or '') for item in files])
+    if report['duplicates']:
+        out.write('<h2>Duplicates</h2>\n')
+        _html_table(out, ('Names', 'Stored', 'Saved'),
+                    [(', '.join(group['names']), group['stored'], group['saved']) for group in report['duplicates']])
+    out.write('<h2>Generated files</h2>\n')
+    _html_table(out, ('Path', 'Bytes'), [(item['path'], item['bytes']) for item in report['generated']])
+    out.write('</body>\n</html>\n')
+
+def write_report(path, report):
+    """Write the report as HTML or JSON, chosen by the file extension"""
+    with open_output(path) as out:
+        if path.lower().endswith(('.html', '.htm')):
+            write_html(out, report)
+        else:
+            json.dump(report, out, indent=2)
+            out.write('\n')
+
+def finish_report(args, report, output_file):
+    """Write --report and enforce the budgets. Exits with an error when one is exceeded."""
+    if args.report:
+        write_report(args.report, report)
+        print(f'Wrote build report {args.report}')
+    problems = check_budgets(report, args.max_total, args.max_asset, args.max_time)
+    for problem in problems:
+        print(f'Error: {problem}')
+    if problems:
+        # Without its header the build step stays out of date and runs the check again
+        if os.path.exists(output_file):
+            os.remove(output_file)
+        sys.exit(1)
+
+def print_summary(report, baseline=None):
+    """Print the totals of a report, with the change from baseline when given"""
+    def change(now, before):
+        return f' ({now - before:+d})' if before is not None and now != before else ''
+
+    totals = report['totals']
+    old = baseline['totals'] if baseline else {}
+    print(f'{report["tool"]}: {report["output"]}')
+    for key, label in (('files', 'files'), ('stored', 'embedded bytes'), ('source_bytes', 'generated bytes')):
+        print(f'  {label}: {totals[key]}{change(totals[key], old.get(key))}')
+    print(f'  seconds: {totals["seconds"]:.3f}' + (f' (was {old["seconds"]:.3f})' if 'seconds' in old else ''))
+    if baseline is None:
+        return
+    before = {item['name']: item for item in baseline['files']}
+    after = {item['name']: item for item in report['files']}
+    for name in sorted(set(before) | set(after)):
+        if name not in before:
+            print(f'  + {name} ({after[name]["stored"]} bytes)')
+        elif name not in after:
+            print(f'  - {name} ({before[name]["stored"]} bytes)')
+        elif after[name]['stored'] != before[name]['stored']:
+            print(f'  ~ {name} ({before[name]["stored"]} -> {after[name]["stored"]} bytes)')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Prints a JSON build report written by the embed scripts.')
+    parser.add_argument('report', help='report written with --report (.json)')
+    parser.add_argument('--baseline', metavar='FILE', help='earlier report to compare against')
+    args = parser.parse_args()
+
+    try:
+        with open(args.report, encoding='utf-8') as f:
+            report = json.load(f)
+        baseline = None
+        if args.baseline:
+            with open(args.baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f'Error: {e}')
+        sys.exit(1)
+    print_summary(report, baseline)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Pack asset files into a .pak archive that ReiLua maps at runtime.
+Usage: python pack_assets.py [--compress] [--align N] [--root DIR] <assets.pak> <file1.png> [file2.wav] ...
+
+An alternative to embed_assets.py: the assets stay outside the executable, so
+changing content does not need a rebuild, and only the pages that are read
+are loaded. assets.pak next to main.lua or the executable is mounted at
+startup, more archives (patches, DLC) with RL.MountPak. Names are the same as
+embed_assets.py uses, so Lua code does not change. Files with identical
+contents are stored once. The format is described in read_pak.py.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import zlib
+
+from embed_common import (CHUNK_SIZE, MAX_DECOMPRESSED_SIZE, compress_file, file_digest, open_output,
+                          relative_name, sort_key)
+from read_pak import (PAK_ALIGNMENT, PAK_ENTRY, PAK_ENTRY_BORROWABLE, PAK_ENTRY_COMPRESSED, PAK_HEADER, PAK_MAGIC,
+                      PAK_VERSION)
+
+def asset_name(path, root):
+    """Name an asset is loaded by"""
+    return relative_name(path, root)
+
+def copy_blob(out, file_path):
+    """Append a file to out. Returns its CRC-32."""
+    crc = 0
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            out.write(chunk)
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+def pad(out, alignment):
+    """Zero fill up to the next multiple of alignment"""
+    out.write(b'\0' * (-out.tell() % alignment))
+
+def pack_files(output_file, input_files, compress_ratio=None, alignment=PAK_ALIGNMENT, root=None):
+    """Write the archive. Returns (name, size, stored size, duplicate of) per asset."""
+    named = sorted(((asset_name(path, root), path) for path in input_files),
+                   key=lambda item: sort_key(item[0]))
+    for (name, _), (next_name, _) in zip(named, named[1:]):
+        if name == next_name:
+            raise ValueError(f'two files are named {name}')
+
+    blobs = {}
+    entries = []
+    names = bytearray()
+    with tempfile.TemporaryDirectory() as tmp, open_output(output_file, 'wb') as out:
+        out.write(b'\0' * PAK_HEADER.size)
+        for name, path in named:
+            size = os.path.getsize(path)
+            digest = file_digest(path)
+            original = None
+            if digest in blobs:
+                offset, data_size, flags, crc, original = blobs[digest]
+            else:
+                data_file, flags = path, PAK_ENTRY_BORROWABLE
+                if compress_ratio is not None and 0 < size <= MAX_DECOMPRESSED_SIZE:
+                    blob = os.path.join(tmp, 'blob.deflate')
+                    if compress_file(path, blob) <= size * compress_ratio:
+                        data_file, flags = blob, PAK_ENTRY_COMPRESSED
+                pad(out, alignment)
+                offset = out.tell()
+                crc = copy_blob(out, data_file)
+                data_size = out.tell() - offset
+                blobs[digest] = (offset, data_size, flags, crc, name)
+            encoded = name.encode('utf-8')
+            entries.append((offset, data_size, size, len(names), len(encoded), flags, crc, name, original))
+            names += encoded + b'\0'
+
+        names_offset = out.tell()
+        out.write(names)
+        pad(out, 8)
+        index_offset = out.tell()
+        for entry in entries:
+            out.write(PAK_ENTRY.pack(*entry[:7]))
+        out.seek(0)
+        out.write(PAK_HEADER.pack(PAK_MAGIC, PAK_VERSION, len(entries), alignment, index_offset, names_offset))
+
+    return [(name, size, data_size, original)
+            for _, data_size, size, _, _, _, _, name, original in entries]
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Packs asset files into a .pak archive.')
+    parser.add_argument('output', help='generated archive (.pak)')
+    parser.add_argument('assets', nargs='+', help='asset files to pack')
+    parser.add_argument('--compress', action='store_true',
+                        help='store assets as raw DEFLATE when it saves space')
+    parser.add_argument('--compress-ratio', type=float, default=0.9,
+                        help='keep compressed data only if it is at most this fraction of the original (default: 0.9)')
+    parser.add_argument('--align', type=int, default=PAK_ALIGNMENT,
+                        help=f'alignment of every asset in bytes, a power of two (default: {PAK_ALIGNMENT})')
+    parser.add_argument('--root', help='name assets relative to this folder instead of the build folder')
+    args = parser.parse_args()
+
+    if args.align <= 0 or args.align & (args.align - 1):
+        print(f'Error: --align must be a power of two, got {args.align}')
+        sys.exit(1)
+    for f in args.assets:
+        if not os.path.exists(f):
+            print(f'Error: File not found: {f}')
+            sys.exit(1)
+
+    try:
+        entries = pack_files(args.output, args.assets, args.compress_ratio if args.compress else None,
+                             args.align, args.root)
+    except ValueError as e:
+        print(f'Error: {e}')
+        sys.exit(1)
+    print(f'Packed {len(entries)} asset file(s) into {args.output}')
+    saved = 0
+    for name, size, stored, original in entries:
+        if original:
+            print(f'  - {name} ({size} bytes, same data as {original})')
+            saved += stored
+        elif stored != size:
+            print(f'  - {name} ({size} bytes, compressed to {stored})')
+        else:
+            print(f'  - {name} ({size} bytes)')
+    if saved:
+        print(f'Deduplicated identical files, saved {saved} bytes')
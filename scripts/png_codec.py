@@ -0,0 +1,229 @@
+"""
+Minimal PNG reader and writer using only zlib from the standard library.
+
+read_png decodes every color type and bit depth of the PNG specification,
+interlaced or not, into 8-bit RGBA. write_png writes 8-bit RGBA. Used by the
+build scripts that need pixels at build time (atlas packing, pre-decoded
+splash logos), so no imaging package has to be installed.
+"""
+import struct
+import zlib
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# Samples per pixel of each color type
+_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+_DEPTHS = {0: (1, 2, 4, 8, 16), 2: (8, 16), 3: (1, 2, 4, 8), 4: (8, 16), 6: (8, 16)}
+
+# Adam7 passes: x start, y start, x step, y step
+_ADAM7 = ((0, 0, 8, 8), (4, 0, 8, 8), (0, 4, 4, 8), (2, 0, 4, 4), (0, 2, 2, 4), (1, 0, 2, 2), (0, 1, 1, 2))
+
+class PngError(Exception):
+    """Raised for data that is not a PNG this module can decode"""
+
+def read_chunks(data):
+    """Yield (type, body) of every chunk, checking CRCs"""
+    if data[:8] != PNG_SIGNATURE:
+        raise PngError('not a PNG file')
+    pos = 8
+    while pos + 12 <= len(data):
+        length, kind = struct.unpack_from('>I4s', data, pos)
+        body = data[pos + 8:pos + 8 + length]
+        if len(body) != length:
+            raise PngError(f'truncated {kind.decode("latin-1")} chunk')
+        crc, = struct.unpack_from('>I', data, pos + 8 + length)
+        if zlib.crc32(kind + body) != crc:
+            raise PngError(f'CRC mismatch in {kind.decode("latin-1")} chunk')
+        yield kind, body
+        if kind == b'IEND':
+            return
+        pos += 12 + length
+    raise PngError('missing IEND chunk')
+
+def _unfilter(raw, pos, width, height, bits_per_pixel):
+    """Undo the scanline filters of one (sub)image. Returns (rows, position after them)."""
+    stride = (width * bits_per_pixel + 7) // 8
+    bpp = max(1, bits_per_pixel // 8)
+    prev = bytearray(stride)
+    rows = []
+    for _ in range(height):
+        if pos + 1 + stride > len(raw):
+            raise PngError('image data too short')
+        kind = raw[pos]
+        line = bytearray(raw[pos + 1:pos + 1 + stride])
+        pos += 1 + stride
+        if kind == 1:
+            for i in range(bpp, stride):
+                line[i] = (line[i] + line[i - bpp]) & 0xff
+        elif kind == 2:
+            line = bytearray((a + b) & 0xff for a, b in zip(line, prev))
+        elif kind == 3:
+            for i in range(stride):
+                left = line[i - bpp] if i >= bpp else 0
+                line[i] = (line[i] + ((left + prev[i]) >> 1)) & 0xff
+        elif kind == 4:
+            for i in range(stride):
+                a = line[i - bpp] if i >= bpp else 0
+                b = prev[i]
+                c = prev[i - bpp] if i >= bpp else 0
+                p = a + b - c
+                pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+                if pa <= pb and pa <= pc:
+                    predictor = a
+                elif pb <= pc:
+                    predictor = b
+                else:
+                    predictor = c
+                line[i] = (line[i] + predictor) & 0xff
+        elif kind != 0:
+            raise PngError(f'unknown filter type {kind}')
+        rows.append(line)
+        prev = line
+    return rows, pos
+
+def _raw_samples(row, depth, count):
+    """First count samples of a row at their full bit depth"""
+    if depth == 8:
+        return row[:count]
+    if depth == 16:
+        return [row[2 * i] << 8 | row[2 * i + 1] for i in range(count)]
+    per_byte = 8 // depth
+    mask = (1 << depth) - 1
+    return [(row[i // per_byte] >> (8 - depth * (i % per_byte + 1))) & mask for i in range(count)]
+
+def _samples(row, depth, count):
+    """First count samples of a row scaled to 8 bits"""
+    if depth == 8:
+        return row[:count]
+    if depth == 16:
+        return row[0:count * 2:2]
+    scale = 255 // ((1 << depth) - 1)
+    return bytes(value * scale for value in _raw_samples(row, depth, count))
+
+def _to_rgba(rows, width, color_type, depth, palette, transparency):
+    """Convert unfiltered rows to 8-bit RGBA"""
+    channels = _CHANNELS[color_type]
+    key = None
+    if transparency is not None and color_type in (0, 2):
+        # tRNS names one color, at full sample depth, that is fully transparent
+        key = tuple(struct.unpack(f'>{channels}H', transparency[:2 * channels]))
+    out = bytearray(width * len(rows) * 4)
+    for y, row in enumerate(rows):
+        pixels = bytearray(width * 4)
+        if color_type == 3:
+            for x, index in enumerate(_raw_samples(row, depth, width)):
+                if index * 3 + 3 > len(palette):
+                    raise PngError(f'palette index {index} out of range')
+                pixels[x * 4:x * 4 + 3] = palette[index * 3:index * 3 + 3]
+                pixels[x * 4 + 3] = transparency[index] if index < len(transparency) else 255
+        else:
+            samples = _samples(row, depth, width * channels)
+            if color_type in (0, 4):
+                gray = samples[0::channels]
+                pixels[0::4] = gray
+                pixels[1::4] = gray
+                pixels[2::4] = gray
+                pixels[3::4] = samples[1::2] if color_type == 4 else b'\xff' * width
+            else:
+                pixels[0::4] = samples[0::channels]
+                pixels[1::4] = samples[1::channels]
+                pixels[2::4] = samples[2::channels]
+                pixels[3::4] = samples[3::4] if color_type == 6 else b'\xff' * width
+            if key is not None:
+                raw = _raw_samples(row, depth, width * channels)
+                for x in range(width):
+                    if tuple(raw[x * channels:(x + 1) * channels]) == key:
+                        pixels[x * 4 + 3] = 0
+        out[y * width * 4:(y + 1) * width * 4] = pixels
+    return out
+
+def decode_png(data):
+    """Decode PNG bytes. Returns (width, height, RGBA bytes)."""
+    header = None
+    palette = b''
+    transparency = None
+    idat = []
+    for kind, body in read_chunks(data):
+        if kind == b'IHDR':
+            header = struct.unpack('>IIBBBBB', body)
+        elif kind == b'PLTE':
+            palette = body
+        elif kind == b'tRNS':
+            transparency = body
+        elif kind == b'IDAT':
+            idat.append(body)
+    if header is None:
+        raise PngError('missing IHDR chunk')
+    width, height, depth, color_type, compression, filter_method, interlace = header
+    if color_type not in _CHANNELS or depth not in _DEPTHS[color_type]:
+        raise PngError(f'invalid color type {color_type} with bit depth {depth}')
+    if compression != 0 or filter_method != 0 or interlace not in (0, 1):
+        raise PngError('unsupported compression, filter or interlace method')
+    if color_type == 3:
+        if not palette:
+            raise PngError('palette image without PLTE chunk')
+        transparency = transparency or b''
+    try:
+        raw = zlib.decompress(b''.join(idat))
+    except zlib.error as e:
+        raise PngError(f'bad image data: {e}') from e
+
+    bits_per_pixel = _CHANNELS[color_type] * depth
+    if not interlace:
+        rows, _ = _unfilter(raw, 0, width, height, bits_per_pixel)
+        return width, height, bytes(_to_rgba(rows, width, color_type, depth, palette, transparency))
+
+    out = bytearray(width * height * 4)
+    pos = 0
+    for x0, y0, dx, dy in _ADAM7:
+        pass_width = (width - x0 + dx - 1) // dx
+        pass_height = (height - y0 + dy - 1) // dy
+        if pass_width <= 0 or pass_height <= 0:
+            continue
+        rows, pos = _unfilter(raw, pos, pass_width, pass_height, bits_per_pixel)
+        pixels = _to_rgba(rows, pass_width, color_type, depth, palette, transparency)
+        for py in range(pass_height):
+            y = y0 + py * dy
+            for px in range(pass_width):
+                src = (py * pass_width + px) * 4
+                dst = (y * width + x0 + px * dx) * 4
+                out[dst:dst + 4] = pixels[src:src + 4]
+    return width, height, bytes(out)
+
+def read_png(path):
+    """Decode a PNG file. Returns (width, height, RGBA bytes)."""
+    with open(path, 'rb') as f:
+        return decode_png(f.read())
+
+def _chunk(kind, body):
+    return struct.pack('>I', len(body)) + kind + body + struct.pack('>I', zlib.crc32(kind + body))
+
+def _filter_cost(line):
+    """Sum of the filtered bytes read as signed values, the usual heuristic for picking a filter"""
+    return sum(value if value < 128 else 256 - value for value in line)
+
+def encode_png(width, height, rgba, level=9):
+    """8-bit RGBA PNG bytes. Each row uses whichever of the None, Sub and Up filters costs least."""
+    stride = width * 4
+    raw = bytearray()
+    prev = bytes(stride)
+    for y in range(height):
+        row = rgba[y * stride:(y + 1) * stride]
+        candidates = (
+            (0, bytes(row)),
+            (1, bytes(row[:4]) + bytes((row[i] - row[i - 4]) & 0xff for i in range(4, stride))),
+            (2, bytes((a - b) & 0xff for a, b in zip(row, prev))),
+        )
+        kind, line = min(candidates, key=lambda candidate: _filter_cost(candidate[1]))
+        raw.append(kind)
+        raw += line
+        prev = row
+    return (PNG_SIGNATURE
+            + _chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0))
+            + _chunk(b'IDAT', zlib.compress(bytes(raw), level))
+            + _chunk(b'IEND', b''))
+
+def write_png(path, width, height, rgba, level=9):
+    """Write 8-bit RGBA pixels as a PNG file"""
+    with open(path, 'wb') as f:
+        f.write(encode_png(width, height, rgba, level))
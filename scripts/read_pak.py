@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Read, verify and extract .pak archives written by pack_assets.py.
+Usage: python read_pak.py [--verify] [--extract DIR] <assets.pak>
+
+Layout, all numbers little endian (see include/pak.h):
+  header   magic "RPAK", version, entry count, alignment, index offset, names offset
+  data     every stored blob, each starting at a multiple of the alignment
+  names    NUL terminated UTF-8 asset names
+  index    one entry per asset sorted by name bytes: offset, stored size, loaded
+           size, name offset, name length, flags, CRC-32 of the stored bytes
+Assets with identical contents share one blob. Flags: 1 compressed (raw
+DEFLATE), 2 borrowable (stored bytes are the loaded bytes, read in place).
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+PAK_MAGIC = b'RPAK'
+PAK_VERSION = 1
+PAK_ALIGNMENT = 16
+PAK_ENTRY_COMPRESSED = 1
+PAK_ENTRY_BORROWABLE = 2
+PAK_HEADER = struct.Struct('<4sIIIQQ')
+PAK_ENTRY = struct.Struct('<QQQIIII')
+
+class PakError(Exception):
+    """Raised for a file that is not a valid .pak archive"""
+
+def read_pak(data):
+    """Parse the header and index of a .pak held in a bytes-like object.
+
+    Returns (header dict, entries) with entries as dicts sorted like the index.
+    Checks the same things PakOpen does at runtime.
+    """
+    if len(data) < PAK_HEADER.size:
+        raise PakError('file too small for a header')
+    magic, version, count, alignment, index_offset, names_offset = PAK_HEADER.unpack_from(data, 0)
+    if magic != PAK_MAGIC:
+        raise PakError(f'bad magic {magic!r}')
+    if version != PAK_VERSION:
+        raise PakError(f'unsupported version {version}')
+    if alignment == 0 or alignment & (alignment - 1):
+        raise PakError(f'alignment {alignment} is not a power of two')
+    if index_offset % 8 or not names_offset <= index_offset <= len(data) \
+            or (len(data) - index_offset) // PAK_ENTRY.size < count:
+        raise PakError('index outside the file')
+
+    names = bytes(data[names_offset:index_offset])
+    entries = []
+    for i in range(count):
+        offset, data_size, size, name_offset, name_length, flags, crc = \
+            PAK_ENTRY.unpack_from(data, index_offset + i * PAK_ENTRY.size)
+        if offset > len(data) or data_size > len(data) - offset:
+            raise PakError(f'entry {i} data outside the file')
+        if name_offset + name_length >= len(names) or names[name_offset + name_length] != 0:
+            raise PakError(f'entry {i} name outside the names table')
+        name = names[name_offset:name_offset + name_length]
+        if entries and entries[-1]['name'].encode('utf-8') >= name:
+            raise PakError(f'index not sorted at entry {i}')
+        entries.append({'name': name.decode('utf-8'), 'offset': offset, 'data_size': data_size,
+                        'size': size, 'flags': flags, 'crc32': crc})
+    header = {'version': version, 'count': count, 'alignment': alignment,
+              'index_offset': index_offset, 'names_offset': names_offset}
+    return header, entries
+
+def entry_bytes(data, entry):
+    """Loaded bytes of an entry, inflated when it is stored compressed"""
+    stored = data[entry['offset']:entry['offset'] + entry['data_size']]
+    if entry['flags'] & PAK_ENTRY_COMPRESSED:
+        return zlib.decompress(stored, -15)
+    return bytes(stored)
+
+def verify_pak(data, header, entries):
+    """Check alignment, checksums and loaded sizes. Returns a list of problems."""
+    problems = []
+    for entry in entries:
+        name = entry['name']
+        if entry['offset'] % header['alignment']:
+            problems.append(f'{name}: offset {entry["offset"]} not aligned to {header["alignment"]}')
+        stored = data[entry['offset']:entry['offset'] + entry['data_size']]
+        if entry['flags'] & PAK_ENTRY_COMPRESSED and entry['flags'] & PAK_ENTRY_BORROWABLE:
+            problems.append(f'{name}: compressed data marked borrowable')
+        if zlib.crc32(stored) != entry['crc32']:
+            problems.append(f'{name}: CRC-32 mismatch')
+            continue
+        try:
+            size = len(entry_bytes(data, entry))
+        except zlib.error as e:
+            problems.append(f'{name}: cannot inflate: {e}')
+            continue
+        if size != entry['size']:
+            problems.append(f'{name}: {size} bytes once loaded, index says {entry["size"]}')
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description='Lists, verifies and extracts .pak archives.')
+    parser.add_argument('pak', help='.pak file')
+    parser.add_argument('--verify', action='store_true', help='check checksums, sizes and alignment')
+    parser.add_argument('--extract', metavar='DIR', help='write every asset below DIR')
+    args = parser.parse_args()
+
+    if os.path.getsize(args.pak) == 0:
+        print(f'Error: {args.pak}: empty file')
+        sys.exit(1)
+    with open(args.pak, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        try:
+            header, entries = read_pak(data)
+        except PakError as e:
+            print(f'Error: {args.pak}: {e}')
+            sys.exit(1)
+
+        print(f'{args.pak}: {header["count"]} asset(s), version {header["version"]}, '
+              f'{header["alignment"]} byte alignment')
+        for entry in entries:
+            compressed = f', compressed to {entry["data_size"]}' if entry['flags'] & PAK_ENTRY_COMPRESSED else ''
+            print(f'  - {entry["name"]} ({entry["size"]} bytes{compressed})')
+
+        if args.verify:
+            problems = verify_pak(data, header, entries)
+            for problem in problems:
+                print(f'Error: {problem}')
+            if problems:
+                sys.exit(1)
+            print('OK')
+
+        if args.extract:
+            for entry in entries:
+                parts = entry['name'].split('/')
+                if any(part in ('', '.', '..') for part in parts):
+                    print(f'Warning: skipping unsafe name {entry["name"]}')
+                    continue
+                path = os.path.join(args.extract, *parts)
+                os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+                with open(path, 'wb') as out:
+                    out.write(entry_bytes(data, entry))
+            print(f'Extracted {len(entries)} asset(s) to {args.extract}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Golden output tests of the Markdown renderer of docs/generate.py.
+Usage: python -m unittest discover scripts/tests
+
+Every docs_render/<case>.md is rendered and compared with docs_render/<case>.html.
+readme_images.md is rendered as the README manual page, api_item.md is an API.md item
+whose description is rendered as on a reference page. After an intended change to the
+renderer, run with UPDATE_GOLDEN=1 to write the new output and review its diff.
+"""
+import importlib.util
+import os
+import unittest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+CASES_DIR = os.path.join(TESTS_DIR, 'docs_render')
+ROOT_DIR = os.path.join(TESTS_DIR, '..', '..')
+
+def load_generator():
+    """docs/generate.py as a module, without running it"""
+    spec = importlib.util.spec_from_file_location('generate', os.path.join(ROOT_DIR, 'docs', 'generate.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+generate = load_generator()
+
+def read(name):
+    with open(os.path.join(CASES_DIR, name), encoding='utf-8', newline='') as f:
+        return f.read()
+
+class DocsRenderTest(unittest.TestCase):
+    def check(self, case, html):
+        path = os.path.join(CASES_DIR, case + '.html')
+        if os.environ.get('UPDATE_GOLDEN'):
+            with open(path, 'w', encoding='utf-8', newline='') as f:
+                f.write(html + '\n')
+        self.assertEqual(html + '\n', read(case + '.html'))
+
+    def test_code_fences(self):
+        self.check('code_fences', generate.md2html(read('code_fences.md')))
+
+    def test_lists(self):
+        self.check('lists', generate.md2html(read('lists.md')))
+
+    def test_inline(self):
+        self.check('inline', generate.md2html(read('inline.md')))
+
+    def test_readme_images(self):
+        self.check('readme_images', generate.render_manual_page((None, read('readme_images.md'))))
+
+    def test_api_item(self):
+        sections = generate.parse_api_text(read('api_item.md'))
+        item = sections[0]['items'][0]
+        self.assertEqual(item['definition'], 'RL.BeginAssetLoading( int totalAssets, int|nil totalBytes )')
+        self.check('api_item', generate.md2html(item['description']))
+
+if __name__ == '__main__':
+    unittest.main()
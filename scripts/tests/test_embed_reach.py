@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests of the --shake reachability pass on a build directory not named build.
+Usage: python -m unittest discover scripts/tests
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import embed_all
+import embed_lua
+from embed_reach import reachable_assets, reachable_lua
+
+def write(path, text=''):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(text)
+    return path
+
+class ReachTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = os.path.join(tmp.name, 'out-release')
+        self.main = write(os.path.join(self.root, 'main.lua'),
+                          'local gs = require("lib.gs")\nlocal tex = RL.LoadTexture("images/hero.png")\n')
+        self.lib = write(os.path.join(self.root, 'lib', 'gs.lua'), 'return {}\n')
+        self.unused = write(os.path.join(self.root, 'lib', 'unused.lua'), 'return {}\n')
+        self.hero = write(os.path.join(self.root, 'images', 'hero.png'))
+        self.other = write(os.path.join(self.root, 'images', 'other.png'))
+        self.outside = write(os.path.join(tmp.name, 'elsewhere', 'main.lua'))
+
+    def test_required_module_is_reachable(self):
+        reached, literals = reachable_lua([self.main, self.lib, self.unused], root=self.root)
+        self.assertEqual(reached, {self.main, self.lib})
+        self.assertEqual(reachable_assets(['images/hero.png', 'images/other.png'], literals), {'images/hero.png'})
+
+    def test_file_outside_root_is_an_error(self):
+        with self.assertRaises(ValueError):
+            reachable_lua([self.main, self.lib, self.outside], root=self.root)
+
+    def test_embed_scripts_stop_instead_of_excluding(self):
+        header = os.path.join(self.root, 'embedded_main.h')
+        with contextlib.redirect_stdout(io.StringIO()), self.assertRaises(SystemExit):
+            embed_lua.main([header, self.main, self.lib, self.outside, '--shake', 'exclude', '--root', self.root])
+        self.assertFalse(os.path.exists(header))
+
+    def test_embed_all_names_files_below_root(self):
+        lua_header = os.path.join(self.root, 'embedded_main.h')
+        asset_header = os.path.join(self.root, 'embedded_assets.h')
+        with contextlib.redirect_stdout(io.StringIO()):
+            embed_all.main(['--jobs', '1', self.root, 'lua:', lua_header, '--shake', 'exclude',
+                            'assets:', asset_header, '--shake', 'exclude'])
+        with open(lua_header) as f:
+            lua = f.read()
+        with open(asset_header) as f:
+            assets = f.read()
+        self.assertIn('"lib/gs.lua"', lua)
+        self.assertIn('{ "lib.gs", ', lua)
+        self.assertNotIn('unused.lua', lua)
+        self.assertIn('"images/hero.png"', assets)
+        self.assertNotIn('other.png', assets)
+
+if __name__ == '__main__':
+    unittest.main()
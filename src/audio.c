@@ -3,6 +3,17 @@
 #include "audio.h"
 #include "lua_core.h"
 
+/* LoadWave that decodes uncompressed embedded assets in place instead of copying them first. */
+static Wave loadWave( const char* fileName ) {
+	int dataSize = 0;
+	const unsigned char* data = BorrowFileData_Embedded( fileName, &dataSize );
+
+	if ( data != NULL ) {
+		return LoadWaveFromMemory( GetFileExtension( fileName ), data, dataSize );
+	}
+	return LoadWave( fileName );
+}
+
 /*
 ## Audio - Audio device management functions
 */
@@ -81,8 +92,10 @@ Load sound from file
 - Success return Sound
 */
 int laudioLoadSound( lua_State* L ) {
-	if ( FileExists( luaL_checkstring( L, 1 ) ) ) {
-		uluaPushSound( L, LoadSound( lua_tostring( L, 1 ) ) );
+	if ( FileExists_Embedded( luaL_checkstring( L, 1 ) ) ) {
+		Wave wave = loadWave( lua_tostring( L, 1 ) );
+		uluaPushSound( L, LoadSoundFromWave( wave ) );
+		UnloadWave( wave );
 
 		return 1;
 	}
@@ -101,8 +114,8 @@ Load wave data from file
 - Success return Wave
 */
 int laudioLoadWave( lua_State* L ) {
-	if ( FileExists( luaL_checkstring( L, 1 ) ) ) {
-		uluaPushWave( L, LoadWave( lua_tostring( L, 1 ) ) );
+	if ( FileExists_Embedded( luaL_checkstring( L, 1 ) ) ) {
+		uluaPushWave( L, loadWave( lua_tostring( L, 1 ) ) );
 
 		return 1;
 	}
@@ -477,16 +490,36 @@ int laudioWaveCrop( lua_State* L ) {
 /*
 > music = RL.LoadMusicStream( string fileName )
 
-Load music stream from file
+Load music stream from file. Embedded assets and assets in mounted .pak files are streamed in place when stored uncompressed, compressed ones are inflated into memory first
 
 - Success return Music
 */
 int laudioLoadMusicStream( lua_State* L ) {
-	if ( FileExists( luaL_checkstring( L, 1 ) ) ) {
-		uluaPushMusic( L, LoadMusicStream( lua_tostring( L, 1 ) ) );
+	const char* fileName = luaL_checkstring( L, 1 );
+	int dataSize = 0;
+	const unsigned char* data = BorrowFileData_Embedded( fileName, &dataSize );
+
+	/* Streams straight from the embedded or mapped bytes, they stay valid as long as the music */
+	if ( data != NULL ) {
+		uluaPushMusic( L, LoadMusicStreamFromMemory( GetFileExtension( fileName ), data, dataSize ) );
 
 		return 1;
 	}
+	if ( FileExists( fileName ) ) {
+		uluaPushMusic( L, LoadMusicStream( fileName ) );
+
+		return 1;
+	}
+	/* Compressed assets are inflated into a buffer the music keeps until it is unloaded */
+	if ( FileExists_Embedded( fileName ) ) {
+		unsigned char* owned = LoadFileData_Embedded( fileName, &dataSize );
+
+		if ( owned != NULL ) {
+			uluaPushMusicWithData( L, LoadMusicStreamFromMemory( GetFileExtension( fileName ), owned, dataSize ), owned );
+
+			return 1;
+		}
+	}
 	TraceLog( state->logLevelInvalid, "Invalid file '%s'", lua_tostring( L, 1 ) );
 	lua_pushnil( L );
 
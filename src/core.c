@@ -10,7 +10,10 @@ extern int g_loadedAssets;
 extern char g_currentAssetName[256];
 extern bool g_showLoadingScreen;
 extern float g_loadingProgress;
+extern long long g_totalAssetBytes;
+extern long long g_loadedAssetBytes;
 extern void drawLoadingScreen();
+extern void updateAssetLoadingProgress();
 
 static size_t getBufferElementSize( Buffer* buffer ) {
 	switch ( buffer->type ) {
@@ -93,7 +96,10 @@ static void setBufferData( lua_State* L, Buffer* buffer, int index, size_t offse
 }
 
 void unloadBuffer( Buffer* buffer ) {
-	free( buffer->data );
+	/* Views point into embedded or mapped asset data */
+	if ( !buffer->borrowed ) {
+		free( buffer->data );
+	}
 
 	TraceLog( LOG_INFO, "BUFFER: Unloaded buffer with %u bytes of data", buffer->size );
 }
@@ -1738,6 +1744,46 @@ int lcoreLoadFileData( lua_State* L ) {
 	return 1;
 }
 
+/*
+> buffer = RL.LoadFileDataView( string fileName, int|nil type )
+
+Load a read only view of an embedded asset or an asset in a mounted .pak without copying it. Only assets stored uncompressed can be viewed. Buffer type is BUFFER_UNSIGNED_CHAR by default, other types need the asset data aligned to the element size. The view cannot be written to and unloading it frees nothing
+
+- Failure return nil
+- Success return Buffer
+*/
+int lcoreLoadFileDataView( lua_State* L ) {
+	const char* fileName = luaL_checkstring( L, 1 );
+
+	Buffer buffer = {
+		.type = BUFFER_UNSIGNED_CHAR,
+		.borrowed = true
+	};
+	if ( !lua_isnil( L, 2 ) && !lua_isnone( L, 2 ) ) {
+		buffer.type = luaL_checkinteger( L, 2 );
+	}
+	int dataSize = 0;
+	const unsigned char* data = BorrowFileData_Embedded( fileName, &dataSize );
+	size_t elementSize = getBufferElementSize( &buffer );
+
+	if ( data == NULL ) {
+		TraceLog( state->logLevelInvalid, "No uncompressed embedded asset '%s' to view", fileName );
+		lua_pushnil( L );
+		return 1;
+	}
+	if ( (uintptr_t)data % elementSize != 0 || dataSize % elementSize != 0 ) {
+		TraceLog( state->logLevelInvalid, "Asset '%s' is not aligned to buffer element size %d", fileName, (int)elementSize );
+		lua_pushnil( L );
+		return 1;
+	}
+	buffer.data = (void*)data;
+	buffer.size = dataSize;
+
+	uluaPushBuffer( L, buffer );
+
+	return 1;
+}
+
 /*
 > success = RL.SaveFileData( string fileName, buffer Buffer )
 
@@ -1823,12 +1869,27 @@ int lcoreGetBasePath( lua_State* L ) {
 /*
 > fileExists = RL.FileExists( string fileName )
 
-Check if file exists
+Check if file exists. Also true for embedded assets and assets in mounted .pak files
 
 - Success return bool
 */
 int lcoreFileExists( lua_State* L ) {
-	lua_pushboolean( L, FileExists( luaL_checkstring( L, 1 ) ) );
+	lua_pushboolean( L, FileExists_Embedded( luaL_checkstring( L, 1 ) ) );
+
+	return 1;
+}
+
+/*
+> success = RL.MountPak( string fileName )
+
+Mount a .pak archive made with scripts/pack_assets.py. Its assets are found by file loading functions
+and RL.FileExists like embedded assets, and take precedence over earlier mounted archives and embedded assets.
+assets.pak next to main.lua or the executable is mounted at startup
+
+- Success return bool
+*/
+int lcoreMountPak( lua_State* L ) {
+	lua_pushboolean( L, MountPak( luaL_checkstring( L, 1 ) ) );
 
 	return 1;
 }
@@ -1964,36 +2025,50 @@ int lcoreGetApplicationDirectory( lua_State* L ) {
 }
 
 /*
-> RL.BeginAssetLoading( int totalAssets )
+> RL.BeginAssetLoading( int totalAssets, int|nil totalBytes )
 
-Initialize asset loading progress tracking
+Initialize asset loading progress tracking. With totalBytes, for example totalBytes of RL.GetAssetLoadPlan, the progress bar follows the bytes files are read with instead of the asset count, so it keeps moving while a large file loads
 
 - totalAssets: Total number of assets to load
+- totalBytes: Total bytes of the assets to load
 */
 int lcoreBeginAssetLoading( lua_State* L ) {
 	g_totalAssets = luaL_checkinteger( L, 1 );
 	g_loadedAssets = 0;
+	g_totalAssetBytes = 0;
+	g_loadedAssetBytes = 0;
 	g_showLoadingScreen = true;
 	g_loadingProgress = 0.0f;
 	g_currentAssetName[0] = '\0';
 
+	if ( !lua_isnil( L, 2 ) && !lua_isnone( L, 2 ) ) {
+		g_totalAssetBytes = luaL_checkinteger( L, 2 );
+	}
+	if ( 0 < g_totalAssetBytes ) {
+		TrackAssetFileReads();
+	}
+
 	return 0;
 }
 
 /*
-> RL.UpdateAssetLoading( string assetName )
+> RL.UpdateAssetLoading( string assetName, int|nil bytes )
 
-Update loading progress for current asset
+Update loading progress for current asset. Files read while the loading screen is shown are counted by themselves, bytes is for assets loaded some other way, for example generated ones
 
 - assetName: Name of the asset currently being loaded
+- bytes: Bytes to add to the loaded bytes
 */
 int lcoreUpdateAssetLoading( lua_State* L ) {
 	const char* assetName = luaL_checkstring( L, 1 );
 	strncpy( g_currentAssetName, assetName, sizeof(g_currentAssetName) - 1 );
 	g_currentAssetName[sizeof(g_currentAssetName) - 1] = '\0';
 
+	if ( !lua_isnil( L, 2 ) && !lua_isnone( L, 2 ) ) {
+		g_loadedAssetBytes += luaL_checkinteger( L, 2 );
+	}
 	g_loadedAssets++;
-	g_loadingProgress = (float)g_loadedAssets / (float)g_totalAssets;
+	updateAssetLoadingProgress();
 
 	if ( g_showLoadingScreen ) {
 		drawLoadingScreen();
@@ -2011,11 +2086,162 @@ int lcoreEndAssetLoading( lua_State* L ) {
 	g_showLoadingScreen = false;
 	g_totalAssets = 0;
 	g_loadedAssets = 0;
+	g_totalAssetBytes = 0;
+	g_loadedAssetBytes = 0;
 	g_currentAssetName[0] = '\0';
 
 	return 0;
 }
 
+typedef struct {
+	const char* name;
+	unsigned int size;
+	int order;
+	int batch;
+} PlanAsset;
+
+/* Largest first, plan order between equal sizes */
+static int comparePlanAssetSize( const void* a, const void* b ) {
+	const PlanAsset* assetA = (const PlanAsset*)a;
+	const PlanAsset* assetB = (const PlanAsset*)b;
+
+	if ( assetA->size != assetB->size ) {
+		return assetA->size < assetB->size ? 1 : -1;
+	}
+	return assetA->order - assetB->order;
+}
+
+static int comparePlanAssetOrder( const void* a, const void* b ) {
+	return ( (const PlanAsset*)a )->order - ( (const PlanAsset*)b )->order;
+}
+
+/* Spread the assets over enough batches of about batchBytes each. Every asset goes, largest
+   first, to the batch with the fewest bytes so far. Pushes the batches table */
+static void pushAssetLoadBatches( lua_State* L, PlanAsset* assets, int count, long long totalBytes, long long batchBytes ) {
+	/* Rounded up without totalBytes + batchBytes, which can overflow for a huge batchBytes */
+	long long batches = 0 < totalBytes ? ( totalBytes - 1 ) / batchBytes + 1 : 1;
+	int batchCount = count < batches ? count : (int)batches;
+
+	if ( batchCount < 1 ) {
+		batchCount = 1;
+	}
+	long long* batchSizes = calloc( batchCount, sizeof( long long ) );
+	int* batchCounts = calloc( batchCount, sizeof( int ) );
+
+	qsort( assets, count, sizeof( PlanAsset ), comparePlanAssetSize );
+	for ( int i = 0; i < count; i++ ) {
+		int lightest = 0;
+
+		for ( int b = 1; b < batchCount; b++ ) {
+			if ( batchSizes[b] < batchSizes[ lightest ]
+				|| ( batchSizes[b] == batchSizes[ lightest ] && batchCounts[b] < batchCounts[ lightest ] ) ) {
+				lightest = b;
+			}
+		}
+		assets[i].batch = lightest;
+		batchSizes[ lightest ] += assets[i].size;
+		batchCounts[ lightest ]++;
+	}
+	/* Assets of a batch are listed in plan order */
+	qsort( assets, count, sizeof( PlanAsset ), comparePlanAssetOrder );
+
+	lua_createtable( L, batchCount, 0 );
+	for ( int b = 0; b < batchCount; b++ ) {
+		lua_createtable( L, 0, 2 );
+		lua_pushinteger( L, batchSizes[b] );
+		lua_setfield( L, -2, "bytes" );
+		lua_createtable( L, batchCounts[b], 0 );
+		for ( int i = 0, n = 0; i < count; i++ ) {
+			if ( assets[i].batch == b ) {
+				lua_pushstring( L, assets[i].name );
+				lua_rawseti( L, -2, ++n );
+			}
+		}
+		lua_setfield( L, -2, "assets" );
+		lua_rawseti( L, -2, b + 1 );
+	}
+	free( batchSizes );
+	free( batchCounts );
+}
+
+/*
+> plan = RL.GetAssetLoadPlan( int|nil batchBytes )
+
+Get the load plan of the embedded assets written by scripts/embed_assets.py. Assets are grouped by directory or --group tag:
+{ totalAssets = int, totalBytes = int, groups = { { name = string, bytes = int, assets = { { name = string, size = int }, ... } }, ... } }.
+With batchBytes the plan also has batches = { { bytes = int, assets = { string, ... } }, ... }, the assets spread over batches of about batchBytes with sizes as even as possible. batchBytes must be positive.
+Sizes are loaded sizes. Without embedded assets the plan is empty
+
+- Success return table
+*/
+int lcoreGetAssetLoadPlan( lua_State* L ) {
+	long long batchBytes = 0;
+
+	if ( !lua_isnil( L, 1 ) && !lua_isnone( L, 1 ) ) {
+		batchBytes = luaL_checkinteger( L, 1 );
+		if ( batchBytes <= 0 ) {
+			return luaL_argerror( L, 1, "batchBytes must be positive" );
+		}
+	}
+	int groupCount = GetAssetPlanGroupCount();
+	int assetCount = 0;
+	long long totalBytes = 0;
+
+	for ( int g = 0; g < groupCount; g++ ) {
+		int count = 0;
+		long long bytes = 0;
+
+		GetAssetPlanGroup( g, &count, &bytes );
+		assetCount += count;
+		totalBytes += bytes;
+	}
+	PlanAsset* assets = malloc( ( assetCount + 1 ) * sizeof( PlanAsset ) );
+
+	lua_createtable( L, 0, 4 );
+	lua_pushinteger( L, assetCount );
+	lua_setfield( L, -2, "totalAssets" );
+	lua_pushinteger( L, totalBytes );
+	lua_setfield( L, -2, "totalBytes" );
+
+	lua_createtable( L, groupCount, 0 );
+	for ( int g = 0, order = 0; g < groupCount; g++ ) {
+		int count = 0;
+		long long bytes = 0;
+		const char* name = GetAssetPlanGroup( g, &count, &bytes );
+
+		lua_createtable( L, 0, 3 );
+		lua_pushstring( L, name );
+		lua_setfield( L, -2, "name" );
+		lua_pushinteger( L, bytes );
+		lua_setfield( L, -2, "bytes" );
+		lua_createtable( L, count, 0 );
+		for ( int i = 0; i < count; i++ ) {
+			unsigned int size = 0;
+			const char* assetName = GetAssetPlanEntry( g, i, &size );
+
+			assets[ order ] = (PlanAsset){ assetName, size, order, 0 };
+			order++;
+			lua_createtable( L, 0, 2 );
+			lua_pushstring( L, assetName );
+			lua_setfield( L, -2, "name" );
+			lua_pushinteger( L, size );
+			lua_setfield( L, -2, "size" );
+			lua_rawseti( L, -2, i + 1 );
+		}
+		lua_setfield( L, -2, "assets" );
+		lua_rawseti( L, -2, g + 1 );
+	}
+	lua_setfield( L, -2, "groups" );
+
+	if ( batchBytes ) {
+		pushAssetLoadBatches( L, assets, assetCount, totalBytes, batchBytes );
+		lua_setfield( L, -2, "batches" );
+	}
+	free( assets );
+
+	return 1;
+}
+
 /*
 > success = RL.MakeDirectory( string dirPath )
 
@@ -3856,6 +4082,10 @@ int lcoreCopyBufferData( lua_State* L ) {
 	int posSrc = luaL_checkinteger( L, 4 );
 	int size = luaL_checkinteger( L, 5 );
 
+	if ( dst->borrowed ) {
+		TraceLog( state->logLevelInvalid, "CopyBufferData. dst is a read only view" );
+		return 0;
+	}
 	void* dstP = dst->data + posDst * getBufferElementSize( dst );
 	void* srcP = src->data + posSrc * getBufferElementSize( src );
 
@@ -3885,6 +4115,10 @@ int lcoreSetBufferData( lua_State* L ) {
 
 	int len = uluaGetTableLen( L, 3 );
 
+	if ( buffer->borrowed ) {
+		TraceLog( state->logLevelInvalid, "SetBufferData. buffer is a read only view" );
+		return 0;
+	}
 	// printf( "buffer->size %d len %d position %d element size %d\n", buffer->size, len, position, getBufferElementSize( buffer ) );
 	// printf( "Kissa %d %d\n", buffer->size / getBufferElementSize( buffer ), position + len - 1 );
 
@@ -3908,6 +4142,11 @@ Swap buffer endianness from big endian to little endian and vice versa
 int lcoreSwapBufferEndianness( lua_State* L ) {
 	Buffer* buffer = uluaGetBuffer( L, 1 );
 
+	if ( buffer->borrowed ) {
+		TraceLog( state->logLevelInvalid, "SwapBufferEndianness. buffer is a read only view" );
+		return 0;
+	}
+
 	size_t elementSize = getBufferElementSize( buffer );
 	size_t bufLen = buffer->size / elementSize;
 
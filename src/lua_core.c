@@ -14,6 +14,9 @@
 #include "lgl.h"
 #include "reasings.h"
 #include "bitwiseOp.h"
+#include "pak.h"
+
+#include <limits.h>
 
 #ifdef EMBED_MAIN
 	#include "embedded_main.h"
@@ -29,6 +32,9 @@ int g_loadedAssets = 0;
 char g_currentAssetName[256] = { '\0' };
 bool g_showLoadingScreen = false;
 float g_loadingProgress = 0.0f;
+/* Byte based progress, used when RL.BeginAssetLoading gets the total bytes */
+long long g_totalAssetBytes = 0;
+long long g_loadedAssetBytes = 0;
 
 #ifdef PLATFORM_DESKTOP
 	#include "platforms/core_desktop_glfw.c"
@@ -88,7 +94,17 @@ void drawLoadingScreen() {
 		}
 	}
 	
-	if ( g_totalAssets > 0 ) {
+	if ( g_totalAssetBytes > 0 ) {
+		char progressText[64];
+		/* Megabytes with one decimal, kilobytes for small totals */
+		bool megabytes = 1024 * 1024 <= g_totalAssetBytes;
+		double unit = megabytes ? 1024.0 * 1024.0 : 1024.0;
+		snprintf( progressText, sizeof(progressText), "%d/%d - %.1f/%.1f %s", g_loadedAssets, g_totalAssets,
+			g_loadedAssetBytes / unit, g_totalAssetBytes / unit, megabytes ? "MB" : "KB" );
+		int progressWidth = MeasureText( progressText, 16 );
+		DrawText( progressText, centerX - progressWidth / 2, barY + barHeight + 12, 16, WHITE );
+	}
+	else if ( g_totalAssets > 0 ) {
 		char progressText[32];
 		sprintf( progressText, "%d/%d", g_loadedAssets, g_totalAssets );
 		int progressWidth = MeasureText( progressText, 16 );
@@ -118,89 +134,393 @@ void drawLoadingScreen() {
 	EndDrawing();
 }
 
+/* Set g_loadingProgress from the loaded bytes, or from the loaded asset count without a byte total */
+void updateAssetLoadingProgress() {
+	if ( g_totalAssetBytes > 0 ) {
+		g_loadingProgress = (float)( (double)g_loadedAssetBytes / (double)g_totalAssetBytes );
+	}
+	else {
+		g_loadingProgress = 0 < g_totalAssets ? (float)g_loadedAssets / (float)g_totalAssets : 0.0f;
+	}
+	if ( 1.0f < g_loadingProgress ) {
+		g_loadingProgress = 1.0f;
+	}
+}
+
+/* Redraws while a large file is read are limited to this rate so they do not slow the reading down */
+#define ASSET_LOADING_REDRAW_INTERVAL ( 1.0 / 30.0 )
+/* Files are read and copied in chunks of this size while byte progress is shown */
+#define ASSET_LOADING_CHUNK_SIZE ( 1024 * 1024 )
+
+/* True while the loading screen counts the bytes files are read with */
+static bool tracking_asset_bytes() {
+	return g_showLoadingScreen && g_totalAssetBytes > 0;
+}
+
+/* Count bytes read from fileName for the loading screen and redraw it now and then */
+static void track_asset_bytes( const char* fileName, long long bytes ) {
+	static double lastDraw = 0.0;
+
+	if ( !tracking_asset_bytes() ) {
+		return;
+	}
+	if ( fileName != NULL && strcmp( g_currentAssetName, fileName ) != 0 ) {
+		strncpy( g_currentAssetName, fileName, sizeof(g_currentAssetName) - 1 );
+		g_currentAssetName[sizeof(g_currentAssetName) - 1] = '\0';
+	}
+	g_loadedAssetBytes += bytes;
+	updateAssetLoadingProgress();
+
+	double now = GetTime();
+	if ( ASSET_LOADING_REDRAW_INTERVAL <= now - lastDraw ) {
+		lastDraw = now;
+		drawLoadingScreen();
+	}
+}
+
+/* Read a file from disk in chunks, counting every chunk for the loading screen. NULL when the
+   file cannot be read this way, the caller then falls back to LoadFileData */
+static unsigned char* load_file_tracked( const char* fileName, int* dataSize ) {
+	FILE* file = fopen( fileName, "rb" );
+
+	if ( file == NULL ) {
+		return NULL;
+	}
+	long size = fseek( file, 0, SEEK_END ) == 0 ? ftell( file ) : -1;
+	unsigned char* data = 0 < size && size <= INT_MAX ? (unsigned char*)malloc( size ) : NULL;
+
+	if ( data == NULL || fseek( file, 0, SEEK_SET ) != 0 ) {
+		free( data );
+		fclose( file );
+		return NULL;
+	}
+	for ( long done = 0; done < size; ) {
+		size_t chunk = size - done < ASSET_LOADING_CHUNK_SIZE ? (size_t)( size - done ) : ASSET_LOADING_CHUNK_SIZE;
+
+		if ( fread( data + done, 1, chunk, file ) != chunk ) {
+			/* The fallback read counts the file again */
+			g_loadedAssetBytes -= done;
+			free( data );
+			fclose( file );
+			return NULL;
+		}
+		done += chunk;
+		track_asset_bytes( fileName, chunk );
+	}
+	fclose( file );
+	*dataSize = (int)size;
+	TraceLog( LOG_INFO, "FILEIO: [%s] File loaded successfully", fileName );
+
+	return data;
+}
+
+#if defined( EMBED_MAIN ) || defined( EMBED_ASSETS )
+/* FNV-1a hash of an embedded file name. Must match name_hash() in scripts/embed_common.py */
+static unsigned int embedded_name_hash( const char* name ) {
+	unsigned int hash = 2166136261u;
+
+	for ( const unsigned char* p = (const unsigned char*)name; *p; p++ ) {
+		hash ^= *p;
+		hash *= 16777619u;
+	}
+	return hash;
+}
+#endif
+
 #ifdef EMBED_MAIN
+/* Find embedded Lua file index for a require name using the generated module index. -1 if not found */
+static int find_embedded_lua_module( const char* name ) {
+	unsigned int hash = embedded_name_hash( name );
+	unsigned int mask = EMBEDDED_LUA_MODULE_SLOT_COUNT - 1;
+
+	for ( unsigned int slot = hash & mask; embedded_lua_module_slots[ slot ] != -1; slot = ( slot + 1 ) & mask ) {
+		int i = embedded_lua_module_slots[ slot ];
+
+		if ( embedded_lua_module_hashes[i] == hash && strcmp( embedded_lua_modules[i].name, name ) == 0 ) {
+			return embedded_lua_modules[i].file;
+		}
+	}
+	return -1;
+}
+
 /* Custom loader for embedded Lua files */
 static int embedded_lua_loader( lua_State* L ) {
 	const char* name = lua_tostring( L, 1 );
 	if ( name == NULL ) return 0;
-	
-	/* Convert module name dots to slashes (e.g., "lib.gamestate" -> "lib/gamestate") */
-	char converted_name[512];
-	strncpy( converted_name, name, sizeof(converted_name) - 1 );
-	converted_name[sizeof(converted_name) - 1] = '\0';
-	for ( char* p = converted_name; *p; p++ ) {
-		if ( *p == '.' ) *p = '/';
-	}
-	
-	/* Try both converted name and original name */
-	const char* names_to_try[] = { converted_name, name };
-	
-	for ( int n = 0; n < 2; n++ ) {
-		const char* try_name = names_to_try[n];
-		
-		for ( int i = 0; i < embedded_lua_file_count; i++ ) {
-			const EmbeddedLuaFile* file = &embedded_lua_files[i];
-			
-			const char* basename = file->name;
-			size_t name_len = strlen( try_name );
-			size_t base_len = strlen( basename );
-			
-			/* Match exactly, or match without .lua extension */
-			if ( strcmp( basename, try_name ) == 0 || 
-			     ( base_len > 4 && strcmp( basename + base_len - 4, ".lua" ) == 0 && 
-			       strncmp( basename, try_name, base_len - 4 ) == 0 && name_len == base_len - 4 ) ) {
-				
-				if ( luaL_loadbuffer( L, (const char*)file->data, file->size, file->name ) == 0 ) {
-					return 1;
-				}
-				else {
-					lua_pushfstring( L, "\n\tembedded loader error: %s", lua_tostring( L, -1 ) );
-					return 1;
-				}
-			}
+
+	/* Index has "lib.gamestate", "lib/gamestate" and "lib/gamestate.lua" forms resolved at build time */
+	int index = find_embedded_lua_module( name );
+
+	/* Names mixing dots and slashes are not indexed, retry with dots converted to slashes */
+	if ( index == -1 && strchr( name, '.' ) != NULL ) {
+		char converted_name[512];
+		strncpy( converted_name, name, sizeof(converted_name) - 1 );
+		converted_name[sizeof(converted_name) - 1] = '\0';
+		for ( char* p = converted_name; *p; p++ ) {
+			if ( *p == '.' ) *p = '/';
 		}
+		index = find_embedded_lua_module( converted_name );
+	}
+
+	if ( index == -1 ) {
+		lua_pushfstring( L, "\n\tno embedded file '%s'", name );
+		return 1;
+	}
+	const EmbeddedLuaFile* file = &embedded_lua_files[ index ];
+
+	/* Data is Lua source or, with EMBED_LUA_BYTECODE, a luac chunk. luaL_loadbuffer takes both */
+	if ( luaL_loadbuffer( L, (const char*)file->data, file->size, file->name ) != 0 ) {
+		lua_pushfstring( L, "\n\tembedded loader error: %s", lua_tostring( L, -1 ) );
 	}
-	
-	lua_pushfstring( L, "\n\tno embedded file '%s'", name );
 	return 1;
 }
 #endif
 
 #ifdef EMBED_ASSETS
-/* Helper function to find embedded asset by name */
+/* Helper function to find embedded asset by name using the generated hash index */
 static const EmbeddedAsset* find_embedded_asset( const char* name ) {
 	if ( name == NULL ) return NULL;
-	
-	for ( int i = 0; i < embedded_asset_count; i++ ) {
-		if ( strcmp( embedded_assets[i].name, name ) == 0 ) {
+
+	unsigned int hash = embedded_name_hash( name );
+	unsigned int mask = EMBEDDED_ASSET_SLOT_COUNT - 1;
+
+	for ( unsigned int slot = hash & mask; embedded_asset_slots[ slot ] != -1; slot = ( slot + 1 ) & mask ) {
+		int i = embedded_asset_slots[ slot ];
+
+		if ( embedded_asset_hashes[i] == hash && strcmp( embedded_assets[i].name, name ) == 0 ) {
 			return &embedded_assets[i];
 		}
 	}
 	return NULL;
 }
 
-/* Override LoadFileData to check embedded assets first */
+#endif
+
+/* Raw DEFLATE decoder of raylib (external/sinfl.h), the one behind DecompressData.
+   Returns the number of bytes written to out, at most cap */
+extern int sinflate( void* out, int cap, const void* in, int size );
+
+/* Mounted .pak archives, searched newest first */
+#define MAX_MOUNTED_PAKS 8
+static Pak mountedPaks[ MAX_MOUNTED_PAKS ];
+static int mountedPakCount = 0;
+static bool fileCallbacksSet = false;
+
+/* Bytes of an asset served from the executable or a mounted .pak */
+typedef struct {
+	const unsigned char* data;
+	unsigned int dataSize;
+	unsigned int size;
+	unsigned int flags;
+} AssetView;
+
+static bool find_asset( const char* fileName, AssetView* asset ) {
+	if ( fileName == NULL ) return false;
+
+	for ( int i = mountedPakCount - 1; 0 <= i; i-- ) {
+		const PakEntry* entry = PakFind( &mountedPaks[i], fileName );
+
+		if ( entry != NULL && entry->size <= INT_MAX && entry->dataSize <= INT_MAX ) {
+			*asset = (AssetView){ PakEntryData( &mountedPaks[i], entry ), entry->dataSize, entry->size, entry->flags };
+			return true;
+		}
+	}
+#ifdef EMBED_ASSETS
+	const EmbeddedAsset* embedded = find_embedded_asset( fileName );
+
+	if ( embedded != NULL ) {
+		*asset = (AssetView){ embedded->data, embedded->dataSize, embedded->size, embedded->flags };
+		return true;
+	}
+#endif
+	return false;
+}
+
+/* Copy or inflate an asset into a buffer freed with UnloadFileData. Readers that do not need
+   to own the bytes use BorrowFileData_Embedded instead */
+static unsigned char* load_asset_data( const char* fileName, const AssetView* asset, int* dataSize ) {
+	if ( asset->flags & PAK_ENTRY_COMPRESSED ) {
+		/* Inflates once into a buffer of the stored size. DecompressData would reserve 64 MB first */
+		unsigned char* data = (unsigned char*)RL_MALLOC( asset->size > 0 ? asset->size : 1 );
+		if ( data == NULL ) {
+			return NULL;
+		}
+		*dataSize = sinflate( data, asset->size, asset->data, asset->dataSize );
+		if ( *dataSize != (int)asset->size ) {
+			TraceLog( LOG_WARNING, "Embedded asset '%s' inflated to %d bytes, expected %u", fileName, *dataSize, asset->size );
+			RL_FREE( data );
+			*dataSize = 0;
+			return NULL;
+		}
+		track_asset_bytes( fileName, *dataSize );
+		return data;
+	}
+	*dataSize = asset->size;
+	/* malloc( 0 ) may return NULL, which would read as a failed load of an empty file */
+	unsigned char* data = (unsigned char*)malloc( asset->size > 0 ? asset->size : 1 );
+	if ( data != NULL ) {
+		/* Copied in chunks so the loading screen moves while a large asset is paged in */
+		for ( unsigned int copied = 0; copied < asset->size; ) {
+			unsigned int chunk = tracking_asset_bytes() && ASSET_LOADING_CHUNK_SIZE < asset->size - copied
+				? ASSET_LOADING_CHUNK_SIZE : asset->size - copied;
+
+			memcpy( data + copied, asset->data + copied, chunk );
+			copied += chunk;
+			track_asset_bytes( fileName, chunk );
+		}
+	}
+	return data;
+}
+
+/* Override LoadFileData to check mounted .pak files and embedded assets first */
 unsigned char* LoadFileData_Embedded( const char* fileName, int* dataSize ) {
-	const EmbeddedAsset* asset = find_embedded_asset( fileName );
-	if ( asset != NULL ) {
-		*dataSize = asset->size;
-		unsigned char* data = (unsigned char*)malloc( asset->size );
+	AssetView asset;
+
+	if ( find_asset( fileName, &asset ) ) {
+		return load_asset_data( fileName, &asset, dataSize );
+	}
+	if ( tracking_asset_bytes() ) {
+		unsigned char* data = load_file_tracked( fileName, dataSize );
+
 		if ( data != NULL ) {
-			memcpy( data, asset->data, asset->size );
+			return data;
 		}
-		return data;
 	}
-	return LoadFileData( fileName, dataSize );
+	/* raylib would call back into this function, read from disk without the callback */
+	SetLoadFileDataCallback( NULL );
+	unsigned char* data = LoadFileData( fileName, dataSize );
+	if ( fileCallbacksSet ) {
+		SetLoadFileDataCallback( LoadFileData_Embedded );
+	}
+	if ( data != NULL ) {
+		track_asset_bytes( fileName, *dataSize );
+	}
+	return data;
+}
+
+/* Bytes of an asset stored uncompressed, read in place without copying. Valid until the .pak
+   holding it is unmounted. NULL if the asset is not found or has to be inflated. */
+const unsigned char* BorrowFileData_Embedded( const char* fileName, int* dataSize ) {
+	AssetView asset;
+
+	if ( find_asset( fileName, &asset ) && ( asset.flags & PAK_ENTRY_BORROWABLE ) ) {
+		*dataSize = asset.size;
+		track_asset_bytes( fileName, asset.size );
+		return asset.data;
+	}
+	return NULL;
+}
+
+/* Override LoadFileText to check mounted .pak files and embedded assets first */
+char* LoadFileText_Embedded( const char* fileName ) {
+	AssetView asset;
+
+	if ( find_asset( fileName, &asset ) ) {
+		int dataSize = 0;
+		unsigned char* data = load_asset_data( fileName, &asset, &dataSize );
+		char* text = data != NULL ? (char*)realloc( data, dataSize + 1 ) : NULL;
+
+		if ( text == NULL ) {
+			free( data );
+			return NULL;
+		}
+		text[ dataSize ] = '\0';
+		return text;
+	}
+	SetLoadFileTextCallback( NULL );
+	char* text = LoadFileText( fileName );
+	if ( fileCallbacksSet ) {
+		SetLoadFileTextCallback( LoadFileText_Embedded );
+	}
+	if ( text != NULL ) {
+		track_asset_bytes( fileName, strlen( text ) );
+	}
+	return text;
 }
 
-/* Check if file exists in embedded assets */
+/* Check if file exists in mounted .pak files or embedded assets */
 bool FileExists_Embedded( const char* fileName ) {
-	if ( find_embedded_asset( fileName ) != NULL ) {
+	AssetView asset;
+
+	if ( find_asset( fileName, &asset ) ) {
 		return true;
 	}
 	return FileExists( fileName );
 }
+
+/* Route raylib file loading through the embedded assets and .pak files */
+static void set_file_callbacks() {
+	SetLoadFileDataCallback( LoadFileData_Embedded );
+	SetLoadFileTextCallback( LoadFileText_Embedded );
+	fileCallbacksSet = true;
+}
+
+/* Map a .pak file. Assets in it take precedence over earlier ones and the embedded assets. */
+bool MountPak( const char* fileName ) {
+	if ( MAX_MOUNTED_PAKS <= mountedPakCount ) {
+		TraceLog( LOG_WARNING, "Cannot mount '%s', %d .pak files already mounted", fileName, MAX_MOUNTED_PAKS );
+		return false;
+	}
+	if ( !PakOpen( &mountedPaks[ mountedPakCount ], fileName ) ) {
+		TraceLog( LOG_WARNING, "Cannot mount '%s', not a valid .pak file", fileName );
+		return false;
+	}
+	TraceLog( LOG_INFO, "Mounted '%s' with %u assets", fileName, mountedPaks[ mountedPakCount ].count );
+	mountedPakCount++;
+	set_file_callbacks();
+
+	return true;
+}
+
+void UnmountPaks() {
+	for ( int i = 0; i < mountedPakCount; i++ ) {
+		PakClose( &mountedPaks[i] );
+	}
+	mountedPakCount = 0;
+}
+
+/* Route file loading through LoadFileData_Embedded even without embedded assets or .pak files,
+   so the loading screen can count the bytes read from disk */
+void TrackAssetFileReads() {
+	if ( !fileCallbacksSet ) {
+		set_file_callbacks();
+	}
+}
+
+/* Number of groups in the load plan of the embedded assets */
+int GetAssetPlanGroupCount() {
+#ifdef EMBED_ASSETS
+	return embedded_asset_group_count;
+#else
+	return 0;
+#endif
+}
+
+/* Name of a load plan group, with its asset count and loaded bytes. NULL if out of range */
+const char* GetAssetPlanGroup( int group, int* count, long long* bytes ) {
+#ifdef EMBED_ASSETS
+	if ( 0 <= group && group < embedded_asset_group_count ) {
+		*count = embedded_asset_groups[ group ].count;
+		*bytes = (long long)embedded_asset_groups[ group ].bytes;
+		return embedded_asset_groups[ group ].name;
+	}
 #endif
+	return NULL;
+}
+
+/* Name and loaded size of an asset in a load plan group. NULL if out of range */
+const char* GetAssetPlanEntry( int group, int index, unsigned int* size ) {
+#ifdef EMBED_ASSETS
+	if ( 0 <= group && group < embedded_asset_group_count
+		&& 0 <= index && index < embedded_asset_groups[ group ].count ) {
+		const EmbeddedAsset* asset = &embedded_assets[ embedded_asset_plan[ embedded_asset_groups[ group ].first + index ] ];
+
+		*size = asset->size;
+		return asset->name;
+	}
+#endif
+	return NULL;
+}
 
 /* Custom implementation since LuaJIT doesn't have lua_geti. */
 static void lua_getiCustom( lua_State* L, int index, int i ) {
@@ -1656,6 +1976,18 @@ bool luaCallMain() {
 	DrawText( loadingText, ( GetScreenWidth() - textWidth ) / 2, GetScreenHeight() / 2 - fontSize / 2, fontSize, DARKGRAY );
 	EndDrawing();
 
+	/* assets.pak next to main.lua, or next to the executable, is served like embedded assets */
+	snprintf( path, STRING_LEN, "%sassets.pak", state->basePath );
+	if ( !FileExists( path ) ) {
+		snprintf( path, STRING_LEN, "%sassets.pak", GetApplicationDirectory() );
+	}
+	if ( FileExists( path ) ) {
+		MountPak( path );
+	}
+#ifdef EMBED_ASSETS
+	set_file_callbacks();
+#endif
+
 #ifdef EMBED_MAIN
 	/* Register custom loader for embedded files */
 	lua_getglobal( L, "package" );
@@ -2002,6 +2334,7 @@ void luaRegister() {
 	assingGlobalFunction( "GetPlatform", lcoreGetPlatform );
 		/* Files management functions. */
 	assingGlobalFunction( "LoadFileData", lcoreLoadFileData );
+	assingGlobalFunction( "LoadFileDataView", lcoreLoadFileDataView );
 	assingGlobalFunction( "SaveFileData", lcoreSaveFileData );
 	assingGlobalFunction( "ExportDataAsCode", lcoreExportDataAsCode );
 	assingGlobalFunction( "LoadFileText", lcoreLoadFileText );
@@ -2009,6 +2342,7 @@ void luaRegister() {
 		/* Files system functions. */
 	assingGlobalFunction( "GetBasePath", lcoreGetBasePath );
 	assingGlobalFunction( "FileExists", lcoreFileExists );
+	assingGlobalFunction( "MountPak", lcoreMountPak );
 	assingGlobalFunction( "DirectoryExists", lcoreDirectoryExists );
 	assingGlobalFunction( "IsFileExtension", lcoreIsFileExtension );
 	assingGlobalFunction( "GetFileLength", lcoreGetFileLength );
@@ -2023,6 +2357,7 @@ void luaRegister() {
 	assingGlobalFunction( "BeginAssetLoading", lcoreBeginAssetLoading );
 	assingGlobalFunction( "UpdateAssetLoading", lcoreUpdateAssetLoading );
 	assingGlobalFunction( "EndAssetLoading", lcoreEndAssetLoading );
+	assingGlobalFunction( "GetAssetLoadPlan", lcoreGetAssetLoadPlan );
 	assingGlobalFunction( "MakeDirectory", lcoreMakeDirectory );
 	assingGlobalFunction( "ChangeDirectory", lcoreChangeDirectory );
 	assingGlobalFunction( "IsPathFile", lcoreIsPathFile );
@@ -4539,6 +4874,35 @@ void uluaPushMusic( lua_State* L, Music music ) {
 	luaL_setmetatable( L, "Music" );
 }
 
+/* File data music streams from, by the decoder context of the music. Freed when it is unloaded */
+typedef struct {
+	void* ctxData;
+	unsigned char* data;
+} MusicFileData;
+
+static MusicFileData* musicFileData = NULL;
+static int musicFileDataCount = 0;
+
+/* Push music streaming from data loaded with LoadFileData, which the music now owns */
+void uluaPushMusicWithData( lua_State* L, Music music, unsigned char* data ) {
+	MusicFileData* grown = music.ctxData != NULL
+		? realloc( musicFileData, ( musicFileDataCount + 1 ) * sizeof( MusicFileData ) ) : NULL;
+
+	if ( grown != NULL ) {
+		musicFileData = grown;
+		musicFileData[ musicFileDataCount++ ] = (MusicFileData){ music.ctxData, data };
+	}
+	else {
+		/* Failed to load, nothing streams from the data */
+		if ( music.ctxData != NULL ) {
+			UnloadMusicStream( music );
+			music = (Music){ 0 };
+		}
+		UnloadFileData( data );
+	}
+	uluaPushMusic( L, music );
+}
+
 void uluaPushAudioStream( lua_State* L, AudioStream stream ) {
 	AudioStream* streamP = lua_newuserdata( L, sizeof( AudioStream ) );
 	*streamP = stream;
@@ -4664,9 +5028,19 @@ void uluaUnloadSoundAlias( Sound* alias ) {
 }
 
 void uluaUnloadMusic( Music* music ) {
+	void* ctxData = music->ctxData;
+
 	luaCallUnload( "Music", music );
 	UnloadMusicStream( *music );
 	memset( music, 0, sizeof( Music ) );
+
+	for ( int i = 0; ctxData != NULL && i < musicFileDataCount; i++ ) {
+		if ( musicFileData[i].ctxData == ctxData ) {
+			UnloadFileData( musicFileData[i].data );
+			musicFileData[i] = musicFileData[ --musicFileDataCount ];
+			break;
+		}
+	}
 }
 
 void uluaUnloadAudioStream( AudioStream* stream ) {
@@ -463,7 +463,7 @@ Load model from files (Meshes and materials)
 - Success return Model
 */
 int lmodelsLoadModel( lua_State* L ) {
-	if ( FileExists( luaL_checkstring( L, 1 ) ) ) {
+	if ( FileExists_Embedded( luaL_checkstring( L, 1 ) ) ) {
 		uluaPushModel( L, LoadModel( lua_tostring( L, 1 ) ) );
 
 		return 1;
@@ -2087,7 +2087,7 @@ Load model animations from file
 - Success return ModelAnimations{}
 */
 int lmodelsLoadModelAnimations( lua_State* L ) {
-	if ( FileExists( luaL_checkstring( L, 1 ) ) ) {
+	if ( FileExists_Embedded( luaL_checkstring( L, 1 ) ) ) {
 		int animationCount = 0;
 		ModelAnimation* anims = LoadModelAnimations( lua_tostring( L, 1 ), &animationCount );
 
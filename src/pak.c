@@ -0,0 +1,172 @@
+#include <string.h>
+
+#include "pak.h"
+
+#ifdef _WIN32
+// Forward declarations for Windows file mapping functions, windows.h clashes with raylib
+extern __declspec(dllimport) void* __stdcall CreateFileA( const char* fileName, unsigned long access, unsigned long shareMode, void* security, unsigned long disposition, unsigned long flags, void* templateFile );
+extern __declspec(dllimport) void* __stdcall CreateFileMappingA( void* file, void* security, unsigned long protect, unsigned long sizeHigh, unsigned long sizeLow, const char* name );
+extern __declspec(dllimport) void* __stdcall MapViewOfFile( void* mapping, unsigned long access, unsigned long offsetHigh, unsigned long offsetLow, size_t bytes );
+extern __declspec(dllimport) int __stdcall UnmapViewOfFile( const void* address );
+extern __declspec(dllimport) int __stdcall GetFileSizeEx( void* file, long long* size );
+extern __declspec(dllimport) int __stdcall CloseHandle( void* handle );
+#else
+	#include <fcntl.h>
+	#include <sys/mman.h>
+	#include <sys/stat.h>
+	#include <unistd.h>
+#endif
+
+/* Maps the whole file read only. */
+static bool mapFile( Pak* pak, const char* fileName ) {
+#ifdef _WIN32
+	void* file = CreateFileA( fileName, 0x80000000 /* GENERIC_READ */, 1 /* FILE_SHARE_READ */, NULL, 3 /* OPEN_EXISTING */, 0x80 /* FILE_ATTRIBUTE_NORMAL */, NULL );
+	long long size = 0;
+
+	if ( file == (void*)-1 ) {
+		return false;
+	}
+	if ( !GetFileSizeEx( file, &size ) || size <= 0 ) {
+		CloseHandle( file );
+		return false;
+	}
+	pak->mapping = CreateFileMappingA( file, NULL, 2 /* PAGE_READONLY */, 0, 0, NULL );
+	CloseHandle( file );
+
+	if ( pak->mapping == NULL ) {
+		return false;
+	}
+	pak->base = MapViewOfFile( pak->mapping, 4 /* FILE_MAP_READ */, 0, 0, 0 );
+	pak->size = (size_t)size;
+
+	if ( pak->base == NULL ) {
+		CloseHandle( pak->mapping );
+		pak->mapping = NULL;
+		return false;
+	}
+	return true;
+#else
+	int fd = open( fileName, O_RDONLY );
+	struct stat info;
+
+	if ( fd == -1 ) {
+		return false;
+	}
+	if ( fstat( fd, &info ) != 0 || info.st_size <= 0 ) {
+		close( fd );
+		return false;
+	}
+	void* base = mmap( NULL, info.st_size, PROT_READ, MAP_PRIVATE, fd, 0 );
+	/* The mapping stays valid after closing the descriptor */
+	close( fd );
+
+	if ( base == MAP_FAILED ) {
+		return false;
+	}
+	pak->base = base;
+	pak->size = info.st_size;
+
+	return true;
+#endif
+}
+
+/* Checks that every entry points inside the file and that names are sorted, so lookups can trust the index. */
+static bool validate( Pak* pak ) {
+	PakHeader header;
+
+	if ( pak->size < sizeof( PakHeader ) ) {
+		return false;
+	}
+	memcpy( &header, pak->base, sizeof( PakHeader ) );
+
+	if ( memcmp( header.magic, PAK_MAGIC, 4 ) != 0 || header.version != PAK_VERSION ) {
+		return false;
+	}
+	if ( header.alignment == 0 || ( header.alignment & ( header.alignment - 1 ) ) != 0 ) {
+		return false;
+	}
+	if ( header.indexOffset % 8 != 0 || pak->size < header.indexOffset || header.indexOffset < header.namesOffset
+		|| ( pak->size - header.indexOffset ) / sizeof( PakEntry ) < header.count ) {
+		return false;
+	}
+	pak->entries = (const PakEntry*)( pak->base + header.indexOffset );
+	pak->names = (const char*)( pak->base + header.namesOffset );
+	pak->count = header.count;
+	uint64_t namesSize = header.indexOffset - header.namesOffset;
+
+	for ( uint32_t i = 0; i < pak->count; i++ ) {
+		const PakEntry* entry = &pak->entries[i];
+
+		if ( pak->size < entry->offset || pak->size - entry->offset < entry->dataSize ) {
+			return false;
+		}
+		if ( namesSize <= entry->nameOffset || namesSize - entry->nameOffset <= entry->nameLength
+			|| pak->names[ entry->nameOffset + entry->nameLength ] != '\0' ) {
+			return false;
+		}
+		if ( 0 < i && strcmp( PakEntryName( pak, &pak->entries[ i - 1 ] ), PakEntryName( pak, entry ) ) >= 0 ) {
+			return false;
+		}
+	}
+	return true;
+}
+
+/* Maps a .pak file. Returns false if it cannot be opened or is not a valid archive. */
+bool PakOpen( Pak* pak, const char* fileName ) {
+	memset( pak, 0, sizeof( Pak ) );
+
+	if ( !mapFile( pak, fileName ) ) {
+		memset( pak, 0, sizeof( Pak ) );
+		return false;
+	}
+	if ( !validate( pak ) ) {
+		PakClose( pak );
+		return false;
+	}
+	return true;
+}
+
+void PakClose( Pak* pak ) {
+	if ( pak->base != NULL ) {
+#ifdef _WIN32
+		UnmapViewOfFile( pak->base );
+		CloseHandle( pak->mapping );
+#else
+		munmap( (void*)pak->base, pak->size );
+#endif
+	}
+	memset( pak, 0, sizeof( Pak ) );
+}
+
+/* Binary search over the sorted index. */
+const PakEntry* PakFind( const Pak* pak, const char* name ) {
+	if ( pak->base == NULL || name == NULL ) {
+		return NULL;
+	}
+	uint32_t low = 0;
+	uint32_t high = pak->count;
+
+	while ( low < high ) {
+		uint32_t mid = low + ( high - low ) / 2;
+		int cmp = strcmp( PakEntryName( pak, &pak->entries[ mid ] ), name );
+
+		if ( cmp == 0 ) {
+			return &pak->entries[ mid ];
+		}
+		else if ( cmp < 0 ) {
+			low = mid + 1;
+		}
+		else {
+			high = mid;
+		}
+	}
+	return NULL;
+}
+
+const char* PakEntryName( const Pak* pak, const PakEntry* entry ) {
+	return pak->names + entry->nameOffset;
+}
+
+const unsigned char* PakEntryData( const Pak* pak, const PakEntry* entry ) {
+	return pak->base + entry->offset;
+}
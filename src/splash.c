@@ -39,7 +39,26 @@ static float getSplashAlpha( float timer ) {
 static void loadSplashLogos() {
 	if ( logosLoaded ) return;
 	
-#ifdef EMBED_LOGO
+#if defined( EMBED_LOGO ) && defined( EMBEDDED_LOGO_DECODED )
+	/* Pixels were decoded at build time, upload them as they are */
+	Image raylib_img = {
+		.data = (void*)embedded_raylib_logo,
+		.width = embedded_raylib_logo_width,
+		.height = embedded_raylib_logo_height,
+		.mipmaps = 1,
+		.format = embedded_raylib_logo_format
+	};
+	raylibLogo = LoadTextureFromImage( raylib_img );
+
+	Image reilua_img = {
+		.data = (void*)embedded_reilua_logo,
+		.width = embedded_reilua_logo_width,
+		.height = embedded_reilua_logo_height,
+		.mipmaps = 1,
+		.format = embedded_reilua_logo_format
+	};
+	reiluaLogo = LoadTextureFromImage( reilua_img );
+#elif defined( EMBED_LOGO )
 	/* Load from embedded data */
 	Image raylib_img = LoadImageFromMemory( ".png", embedded_raylib_logo, embedded_raylib_logo_size );
 	raylibLogo = LoadTextureFromImage( raylib_img );
@@ -140,6 +159,11 @@ static void drawMadeWithSplash( float alpha ) {
 	
 	Color tint = WHITE;
 	tint.a = (unsigned char)(255 * alpha);
+#ifdef EMBEDDED_LOGO_PREMULTIPLIED
+	/* Premultiplied pixels fade by scaling every channel */
+	tint = (Color){ tint.a, tint.a, tint.a, tint.a };
+	BeginBlendMode( BLEND_ALPHA_PREMULTIPLY );
+#endif
 	
 	/* Draw Raylib logo */
 	if ( raylibLogo.id > 0 ) {
@@ -155,6 +179,9 @@ static void drawMadeWithSplash( float alpha ) {
 		Rectangle dest = { (float)reiluaX, (float)logoY, (float)reiluaWidth, (float)reiluaHeight };
 		DrawTexturePro( reiluaLogo, source, dest, (Vector2){ 0, 0 }, 0.0f, tint );
 	}
+#ifdef EMBEDDED_LOGO_PREMULTIPLIED
+	EndBlendMode();
+#endif
 }
 
 void splashInit() {
@@ -133,6 +133,7 @@ void stateFree() {
 		lua_close( state->luaState );
 		state->luaState = NULL;
 	}
+	UnmountPaks();
 	/* Unload custom font if it was loaded - must be done before CloseWindow */
 	if ( state->hasWindow && state->customFontLoaded ) {
 		UnloadFont( state->defaultFont );
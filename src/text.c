@@ -184,7 +184,7 @@ Load font from file into GPU memory (VRAM)
 - Success return Font
 */
 int ltextLoadFont( lua_State* L ) {
-	if ( FileExists( luaL_checkstring( L, 1 ) ) ) {
+	if ( FileExists_Embedded( luaL_checkstring( L, 1 ) ) ) {
 		Font font = LoadFont( lua_tostring( L, 1 ) );
 		SetTextureFilter( font.texture, TEXTURE_FILTER_POINT );
 		uluaPushFont( L, font );
@@ -208,7 +208,7 @@ Load font from file with extended parameters, use NULL for codepoints to load th
 int ltextLoadFontEx( lua_State* L ) {
 	int fontSize = luaL_checkinteger( L, 2 );
 
-	if ( FileExists( luaL_checkstring( L, 1 ) ) ) {
+	if ( FileExists_Embedded( luaL_checkstring( L, 1 ) ) ) {
 		Font font;
 		if ( lua_istable( L, 3 ) ) {
 			int codepointCount = uluaGetTableLen( L, 3 );
@@ -5,6 +5,17 @@
 #include "lua_core.h"
 #include "rmath.h"
 
+/* LoadImage that decodes uncompressed embedded assets in place instead of copying them first. */
+static Image loadImage( const char* fileName ) {
+	int dataSize = 0;
+	const unsigned char* data = BorrowFileData_Embedded( fileName, &dataSize );
+
+	if ( data != NULL ) {
+		return LoadImageFromMemory( GetFileExtension( fileName ), data, dataSize );
+	}
+	return LoadImage( fileName );
+}
+
 /*
 ## Textures - Image loading functions
 */
@@ -18,8 +29,8 @@ Load image from file into CPU memory (RAM)
 - Success return Image
 */
 int ltexturesLoadImage( lua_State* L ) {
-	if ( FileExists( luaL_checkstring( L, 1 ) ) ) {
-		uluaPushImage( L, LoadImage( luaL_checkstring( L, 1 ) ) );
+	if ( FileExists_Embedded( luaL_checkstring( L, 1 ) ) ) {
+		uluaPushImage( L, loadImage( luaL_checkstring( L, 1 ) ) );
 
 		return 1;
 	}
@@ -43,7 +54,7 @@ int ltexturesLoadImageRaw( lua_State* L ) {
 	int format = luaL_checkinteger( L, 3 );
 	int headerSize = luaL_checkinteger( L, 4 );
 
-	if ( FileExists( fileName ) ) {
+	if ( FileExists_Embedded( fileName ) ) {
 		uluaPushImage( L, LoadImageRaw( fileName, (int)size.x, (int)size.y, format, headerSize ) );
 
 		return 1;
@@ -65,7 +76,7 @@ Load image sequence from file (frames appended to image.data). All frames are re
 int ltexturesLoadImageAnim( lua_State* L ) {
 	const char* fileName = luaL_checkstring( L, 1 );
 
-	if ( FileExists( fileName ) ) {
+	if ( FileExists_Embedded( fileName ) ) {
 		int frameCount = 0;
 		uluaPushImage( L, LoadImageAnim( fileName, &frameCount ) );
 		lua_pushinteger( L, frameCount );
@@ -1309,8 +1320,15 @@ Load texture from file into GPU memory ( VRAM )
 - Success return Texture
 */
 int ltexturesLoadTexture( lua_State* L ) {
-	if ( FileExists( luaL_checkstring( L, 1 ) ) ) {
-		uluaPushTexture( L, LoadTexture( lua_tostring( L, 1 ) ) );
+	if ( FileExists_Embedded( luaL_checkstring( L, 1 ) ) ) {
+		Image image = loadImage( lua_tostring( L, 1 ) );
+		Texture texture = { 0 };
+
+		if ( image.data != NULL ) {
+			texture = LoadTextureFromImage( image );
+			UnloadImage( image );
+		}
+		uluaPushTexture( L, texture );
 
 		return 1;
 	}
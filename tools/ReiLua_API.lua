@@ -2190,6 +2190,14 @@ function RL.GetPlatform() end
 ---@return any buffer 
 function RL.LoadFileData( fileName ) end
 
+---Load a read only view of an embedded asset or an asset in a mounted .pak without copying it. Only assets stored uncompressed can be viewed. Buffer type is BUFFER_UNSIGNED_CHAR by default, other types need the asset data aligned to the element size. The view cannot be written to and unloading it frees nothing
+---- Failure return nil
+---- Success return Buffer
+---@param fileName string
+---@param type integer|nil
+---@return any buffer 
+function RL.LoadFileDataView( fileName, type ) end
+
 ---Save data to file from byte array (write), returns true on success
 ---- Success return bool
 ---@param fileName string
@@ -2224,12 +2232,20 @@ function RL.SaveFileText( fileName, text ) end
 ---@return any path 
 function RL.GetBasePath() end
 
----Check if file exists
+---Check if file exists. Also true for embedded assets and assets in mounted .pak files
 ---- Success return bool
 ---@param fileName string
 ---@return any fileExists 
 function RL.FileExists( fileName ) end
 
+---Mount a .pak archive made with scripts/pack_assets.py. Its assets are found by file loading functions
+---and RL.FileExists like embedded assets, and take precedence over earlier mounted archives and embedded assets.
+---assets.pak next to main.lua or the executable is mounted at startup
+---- Success return bool
+---@param fileName string
+---@return any success 
+function RL.MountPak( fileName ) end
+
 ---Check if a directory path exists
 ---- Success return bool
 ---@param dirPath string
@@ -5880,7 +5896,7 @@ function  RL.WaveCrop( wave, initSample, finalSample ) end
 
 -- Audio - Music management functions
 
----Load music stream from file
+---Load music stream from file. Embedded assets and assets in mounted .pak files are streamed in place when stored uncompressed, compressed ones are inflated into memory first
 ---- Success return Music
 ---@param fileName string
 ---@return any music 
@@ -9057,17 +9073,29 @@ function RL.GetKeyScancode( key ) end
 ---Initialize asset loading progress tracking and show loading screen.
 ---Call this before loading assets to display a retro 1-bit style loading screen
 ---with progress bar, animated dots, and asset name display.
+---With totalBytes the progress bar follows the bytes files are read with instead of the asset count.
 ---@param totalAssets integer Total number of assets to load
-function RL.BeginAssetLoading( totalAssets ) end
+---@param totalBytes integer|nil Total bytes of the assets to load, e.g. totalBytes of RL.GetAssetLoadPlan
+function RL.BeginAssetLoading( totalAssets, totalBytes ) end
 
 ---Update asset loading progress and display current asset being loaded.
 ---Call this after each asset is loaded to update the progress bar and counter.
 ---The loading screen will show the asset name and update the progress (e.g., "3/10").
+---Files read while the loading screen is shown count their bytes by themselves.
 ---@param assetName string Name of the asset currently being loaded (e.g., "player.png", "music.ogg")
-function RL.UpdateAssetLoading( assetName ) end
+---@param bytes integer|nil Bytes to add for an asset not read from a file
+function RL.UpdateAssetLoading( assetName, bytes ) end
 
 ---Finish asset loading and hide the loading screen.
 ---Call this after all assets have been loaded to dismiss the loading UI
 ---and continue with your game initialization.
 function RL.EndAssetLoading() end
 
+---Get the load plan of the embedded assets: totalAssets, totalBytes and groups,
+---each with name, bytes and assets of { name, size }. Assets are grouped by directory or
+---EMBED_ASSET_GROUPS tag. With batchBytes the plan also has batches, each with bytes and
+---a list of asset names, spread over batches of about batchBytes with sizes as even as possible.
+---@param batchBytes integer|nil Size of the batches to plan, positive
+---@return table plan
+function RL.GetAssetLoadPlan( batchBytes ) end
+
@@ -339,7 +339,7 @@ for _, src in ipairs( sourceFiles ) do
 					luaApiFile:write( "RL."..defineName.."=nil\n" )
 				elseif type( value ) == "table" then
 					-- All tables are colors.
-					apiFile:write( defineName.." = { "
+					apiFile:write( "> "..defineName.." = { "
 						..math.floor( value[1] )..", "..math.floor( value[2] )..", "
 						..math.floor( value[3] )..", "..math.floor( value[4] ).." }\n\n" )
 					luaApiFile:write( "RL."..defineName.."={"